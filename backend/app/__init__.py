@@ -1,4 +1,20 @@
 # App package initialization
-from .main import create_app
+#
+# ``app.app`` (gunicorn's ``app:app``, ``FLASK_APP=app:app``) is created on
+# first access instead of on import, so processes that only need the models
+# and services (management commands, extrato backfill pool workers) can
+# import ``app.*`` without booting the application.
 
-app = create_app()
+
+def __getattr__(name):
+    if name == "create_app":
+        from .main import create_app
+
+        return create_app
+    if name == "app":
+        from .main import create_app
+
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
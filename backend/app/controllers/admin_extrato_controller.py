@@ -77,6 +77,8 @@ def get_transfer_history():
                             "run_at": run.run_at.isoformat(),
                             "status": run.status,
                             "message": run.message or "",
+                            "duration_ms": run.duration_ms,
+                            "batch_id": run.batch_id,
                         }
                         for run in runs
                     ],
@@ -352,40 +354,37 @@ def preview_transfer():
                     }
                 )
 
-            # Query data that would be transferred
-            from app.services.extrato_core import query_data
+            # Count and sum what would be transferred without loading rows
+            from app.services.extrato_sql_totals import SqlTotalsEngine, month_window
 
-            pagamentos, sessoes, comissoes, gastos = query_data(db, mes, ano)
+            start_date, end_date = month_window(mes, ano)
+            summary = SqlTotalsEngine(db, start_date, end_date, "extrato").summary()
+            counts = summary["counts"]
 
-            # Calculate totals
-            total_pagamentos = len(pagamentos)
-            total_sessoes = len(sessoes)
-            total_comissoes = len(comissoes)
-            total_gastos = len(gastos)
-
-            total_receita = sum(float(getattr(p, "valor", 0)) for p in pagamentos)
-            total_comissoes_valor = sum(
-                float(getattr(c, "valor", 0)) for c in comissoes
-            )
-            total_gastos_valor = sum(float(getattr(g, "valor", 0)) for g in gastos)
+            total_receita = summary["receita_cents"] / 100
+            total_comissoes_valor = summary["comissoes_cents"] / 100
+            total_gastos_valor = summary["despesas_cents"] / 100
+            lucro = (
+                summary["receita_cents"]
+                - summary["comissoes_cents"]
+                - summary["despesas_cents"]
+            ) / 100
 
             preview_data = {
                 "mes": mes,
                 "ano": ano,
                 "status": "ready_for_transfer",
                 "counts": {
-                    "pagamentos": total_pagamentos,
-                    "sessoes": total_sessoes,
-                    "comissoes": total_comissoes,
-                    "gastos": total_gastos,
+                    "pagamentos": counts["pagamentos"],
+                    "sessoes": counts["sessoes"],
+                    "comissoes": counts["comissoes"],
+                    "gastos": counts["gastos"],
                 },
                 "totals": {
-                    "receita": float(total_receita),
-                    "comissoes": float(total_comissoes_valor),
-                    "gastos": float(total_gastos_valor),
-                    "lucro": float(
-                        total_receita - total_comissoes_valor - total_gastos_valor
-                    ),
+                    "receita": total_receita,
+                    "comissoes": total_comissoes_valor,
+                    "gastos": total_gastos_valor,
+                    "lucro": lucro,
                 },
             }
 
@@ -0,0 +1,78 @@
+"""
+Admin controller for the background job queue.
+
+Provides admin-only endpoints for:
+- Job counts per type and status, and the most recent jobs
+- A single job's status, attempts, error and result
+"""
+
+import logging
+
+from app.core.job_queue import STATUSES, get_job, job_counts, recent_jobs
+from flask import Blueprint, jsonify, request
+from flask_login import current_user, login_required
+
+logger = logging.getLogger(__name__)
+
+admin_jobs_bp = Blueprint("admin_jobs", __name__, url_prefix="/admin/jobs")
+
+
+def require_admin():
+    """Decorator to check if user is admin."""
+    if (
+        not current_user.is_authenticated
+        or not hasattr(current_user, "role")
+        or current_user.role != "admin"
+    ):
+        return jsonify({"success": False, "message": "Admin access required"}), 403
+    return None
+
+
+@admin_jobs_bp.route("", methods=["GET"])
+@login_required
+def list_jobs():
+    """
+    Job counts and recent jobs.
+
+    Query parameters:
+    - status: Filter recent jobs by status (queued, running, succeeded, failed)
+    - type: Filter recent jobs by job type
+    - limit: Recent jobs to return (default: 50, max: 200)
+    """
+    admin_check = require_admin()
+    if admin_check:
+        return admin_check
+
+    status = request.args.get("status")
+    if status and status not in STATUSES:
+        return jsonify({"success": False, "message": "Invalid status"}), 400
+    limit = max(1, min(request.args.get("limit", 50, type=int) or 50, 200))
+
+    try:
+        return jsonify(
+            {
+                "success": True,
+                "data": {
+                    "counts": job_counts(),
+                    "jobs": recent_jobs(
+                        limit=limit, status=status, job_type=request.args.get("type")
+                    ),
+                },
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving jobs: {str(e)}")
+        return jsonify({"success": False, "message": "Error retrieving jobs"}), 500
+
+
+@admin_jobs_bp.route("/<int:job_id>", methods=["GET"])
+@login_required
+def job_detail(job_id: int):
+    admin_check = require_admin()
+    if admin_check:
+        return admin_check
+
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    return jsonify({"success": True, "data": job})
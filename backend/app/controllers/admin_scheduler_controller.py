@@ -0,0 +1,56 @@
+"""
+Admin controller for the APScheduler leader election.
+
+Provides an admin-only endpoint for:
+- The current scheduler leader and the nodes heartbeating
+- Each scheduled job's trigger, next run (on the leader) and last run
+"""
+
+import logging
+
+from flask import Blueprint, current_app, jsonify
+from flask_login import current_user, login_required
+
+logger = logging.getLogger(__name__)
+
+admin_scheduler_bp = Blueprint(
+    "admin_scheduler", __name__, url_prefix="/admin/scheduler"
+)
+
+
+def require_admin():
+    """Decorator to check if user is admin."""
+    if (
+        not current_user.is_authenticated
+        or not hasattr(current_user, "role")
+        or current_user.role != "admin"
+    ):
+        return jsonify({"success": False, "message": "Admin access required"}), 403
+    return None
+
+
+@admin_scheduler_bp.route("", methods=["GET"])
+@login_required
+def scheduler_overview():
+    """Current leader, live nodes and last run times of the scheduled jobs."""
+    admin_check = require_admin()
+    if admin_check:
+        return admin_check
+
+    leader = current_app.extensions.get("scheduler_leader")
+    if leader is None:
+        return (
+            jsonify({"success": False, "message": "Scheduler not running"}),
+            503,
+        )
+
+    try:
+        from app.core.scheduler_leader import scheduler_status
+
+        return jsonify({"success": True, "data": scheduler_status(leader)})
+    except Exception as e:
+        logger.error(f"Error retrieving scheduler status: {str(e)}")
+        return (
+            jsonify({"success": False, "message": "Error retrieving scheduler status"}),
+            500,
+        )
@@ -463,12 +463,15 @@ def create_backup_service():
     Request body (JSON):
     - month: Month (1-12) - optional, defaults to current month
     - year: Year (YYYY) - optional, defaults to current year
+    - async: Queue the backup as a job instead of waiting for it - optional,
+      defaults to false; poll GET /api/jobs/<job_id> for the outcome
 
     Returns:
         JSON response with success status and message
 
     Status codes:
         200: Success
+        202: Backup job queued (async)
         401: Unauthorized (invalid/missing JWT token)
         400: Bad request (invalid parameters)
         409: Backup already exists
@@ -533,6 +536,22 @@ def create_backup_service():
             },
         )
 
+        if data.get("async") is True:
+            from app.services.background_jobs import enqueue_backup
+
+            job, created = enqueue_backup(year=year, month=month)
+            message = "Backup job queued" if created else "Backup job already queued"
+            return (
+                jsonify(
+                    {
+                        "success": True,
+                        "message": message,
+                        "data": {"job_id": job["id"], "status": job["status"]},
+                    }
+                ),
+                202,
+            )
+
         # Import and call the backup service
         from app.services.backup_service import BackupService
 
@@ -654,6 +673,18 @@ def create_backup_service():
         )
 
 
+@api_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@jwt_required
+def get_job_status(job_id: int):
+    """Status of a background job (JWT-protected, for automation polling)."""
+    from app.core.job_queue import get_job
+
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": True, "data": job})
+
+
 @csrf.exempt
 @limiter.limit("10 per minute")
 @api_bp.route("/extrato/generate_service", methods=["POST"])
@@ -15,6 +15,7 @@ from app.services.user_service import UserService
 from flask import Blueprint, jsonify, request
 from flask_login import login_required
 from app.core.auth_decorators import require_session_authorization
+from app.core.reference_cache import ARTISTS, invalidate_reference
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -81,6 +82,7 @@ def create_artist():
         # Delegate business logic to service
         user_service = _get_user_service()
         artist = user_service.register_artist(name=name.strip(), email=email)
+        invalidate_reference(ARTISTS)
 
         # Return success response
         return (
@@ -161,6 +163,7 @@ def create_artist_form():
         # Delegate to service
         user_service = _get_user_service()
         artist = user_service.register_artist(name=name.strip(), email=email)
+        invalidate_reference(ARTISTS)
 
         # Return JSON response for AJAX calls
         return (
@@ -276,6 +279,7 @@ def update_artist(artist_id: int):
         artist = user_service.update_artist(
             artist_id=artist_id, name=name.strip(), email=email
         )
+        invalidate_reference(ARTISTS)
 
         # Return success response
         return (
@@ -316,6 +320,7 @@ def delete_artist(artist_id: int):
         # Delegate business logic to service
         user_service = _get_user_service()
         deleted = user_service.delete_artist(artist_id)
+        invalidate_reference(ARTISTS)
 
         if not deleted:
             return jsonify({"success": False, "error": "Artist not found"}), 404
@@ -97,8 +97,8 @@ def get_events():
         # Get calendar service and fetch events
         calendar_service = _get_calendar_service()
 
-        # DEBUG: Log user authorization check
-        logger.info(f"DEBUG: Checking authorization for user {current_user.id}")
+        # Log user authorization check
+        logger.debug(f"Checking authorization for user {current_user.id}")
 
         # Diagnostic: Log calendar token query
         logger.debug(
@@ -112,13 +112,11 @@ def get_events():
         )
 
         is_authorized = calendar_service.is_user_authorized(str(current_user.id))
-        logger.info(f"DEBUG: User {current_user.id} authorized: {is_authorized}")
+        logger.debug(f"User {current_user.id} authorized: {is_authorized}")
 
         # Check if user is authorized
         if not is_authorized:
-            logger.warning(
-                f"DEBUG: User {current_user.id} not authorized for Google Calendar"
-            )
+            logger.warning(f"User {current_user.id} not authorized for Google Calendar")
             return (
                 jsonify(
                     {
@@ -130,17 +128,17 @@ def get_events():
                 401,
             )
 
-        # DEBUG: Log date range and API call
-        logger.info(
-            f"DEBUG: Fetching events for user {current_user.id} from {start_date} to {end_date}"
+        # Log date range and API call
+        logger.debug(
+            f"Fetching events for user {current_user.id} from {start_date} to {end_date}"
         )
 
         events = calendar_service.get_user_events(
             user_id=str(current_user.id), start_date=start_date, end_date=end_date
         )
 
-        # DEBUG: Log events retrieved
-        logger.info(f"DEBUG: Retrieved {len(events)} events from Google Calendar")
+        # Log events retrieved
+        logger.debug(f"Retrieved {len(events)} events from Google Calendar")
 
         # Convert events to JSON-serializable format
         events_data = []
@@ -576,9 +574,9 @@ def sync_events():
         start_date = datetime.now()
         end_date = start_date + timedelta(days=30)
 
-        # DEBUG: Log sync operation details
-        logger.info(f"DEBUG: Starting calendar sync for user {current_user.id}")
-        logger.info(f"DEBUG: Date range: {start_date} to {end_date}")
+        # Log sync operation details
+        logger.debug(f"Starting calendar sync for user {current_user.id}")
+        logger.debug(f"Date range: {start_date} to {end_date}")
 
         # Diagnostic: Log calendar sync query
         logger.debug(
@@ -597,10 +595,10 @@ def sync_events():
                 str(current_user.id), start_date, end_date
             )
 
-            # DEBUG: Log detailed event information
-            logger.info(f"DEBUG: Sync retrieved {len(events)} events")
+            # Log detailed event information
+            logger.debug(f"Sync retrieved {len(events)} events")
             for i, event in enumerate(events[:3]):  # Log first 3 events
-                logger.info(f"DEBUG: Event {i+1}: {event.title} - {event.start_time}")
+                logger.debug(f"Event {i+1}: {event.title} - {event.start_time}")
 
             flash(
                 f"Sincronização concluída! {len(events)} eventos encontrados.",
@@ -608,7 +606,7 @@ def sync_events():
             )
         except Exception as e:
             logger.error(f"Error syncing calendar events: {str(e)}")
-            logger.error(f"DEBUG: Full sync error traceback", exc_info=True)
+            logger.error(f"Full sync error traceback", exc_info=True)
             flash("Erro ao sincronizar eventos do Google Calendar", "error")
 
     except Exception as e:
@@ -61,29 +61,30 @@ def client_list():
 @client_bp.route("/sync")
 @login_required
 def sync_clients():
-    """Sync clients from JotForm to local database."""
-    db = SessionLocal()
+    """Queue a JotForm to local database client sync (one at a time)."""
     try:
-        logger.info("Starting JotForm client sync")
-
-        # Setup dependencies
-        client_repo = ClientRepository(db)
-        jotform_service = JotFormService(JOTFORM_API_KEY, JOTFORM_FORM_ID)
-        client_service = ClientService(client_repo, jotform_service)
+        from app.services.background_jobs import enqueue_client_sync
 
-        # Sync clients using batch processing
-        synced_clients = client_service.sync_clients_from_jotform()
+        job, created = enqueue_client_sync()
+        logger.info(
+            "JotForm client sync queued" if created else "JotForm client sync pending",
+            extra={"context": {"job_id": job["id"], "status": job["status"]}},
+        )
 
-        logger.info(f"Successfully synced {len(synced_clients)} clients from JotForm")
-        flash(f"Sincronizados {len(synced_clients)} clientes do JotForm!", "success")
+        # Without worker threads (JOB_QUEUE_WORKERS=0) the job already ran
+        if job["status"] == "succeeded":
+            synced = (job["result"] or {}).get("synced", 0)
+            flash(f"Sincronizados {synced} clientes do JotForm!", "success")
+        elif job["status"] == "failed":
+            flash(f"Erro ao sincronizar clientes: {job['last_error']}", "error")
+        else:
+            flash("Sincronização de clientes do JotForm em andamento.", "info")
         return redirect(url_for("client.client_list"))
 
     except Exception as e:
         logger.error(f"Error syncing clients from JotForm: {str(e)}", exc_info=True)
         flash(f"Erro ao sincronizar clientes: {str(e)}", "error")
         return redirect(url_for("client.client_list"))
-    finally:
-        db.close()
 
 
 @client_bp.route("/api/list")
@@ -2,11 +2,9 @@
 Extrato controller - handles extrato API endpoints and web pages.
 """
 
-import json
 import logging
 
-from app.db.base import Extrato
-from app.db.session import SessionLocal
+from app.core.extrato_cache import extrato_api_response, get_extrato_entry
 from app.services.extrato_generation import (
     generate_extrato as _service_generate_extrato,
 )
@@ -75,69 +73,31 @@ def api_get_extrato():
             400,
         )
 
-    db = SessionLocal()
     try:
-        # Query the extrato for the specified month/year
-        extrato = (
-            db.query(Extrato).filter(Extrato.mes == mes, Extrato.ano == ano).first()
+        # Cached per month until the extrato is regenerated or changed
+        entry = get_extrato_entry(mes, ano)
+    except ValueError as json_error:
+        logger.error(f"Error parsing JSON data from extrato: {str(json_error)}")
+        return (
+            jsonify(
+                {"success": False, "message": "Erro ao processar dados do extrato"}
+            ),
+            500,
         )
+    except Exception as e:
+        logger.error(f"Error in api_get_extrato: {str(e)}")
+        return jsonify({"success": False, "message": f"Erro interno: {str(e)}"}), 500
 
-        if not extrato:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "message": f"Extrato não encontrado para {mes:02d}/{ano}",
-                    }
-                ),
-                404,
-            )
-
-        # Parse JSON data from the extrato - safely extract actual values
-        try:
-            pagamentos_raw = getattr(extrato, "pagamentos", None)
-            sessoes_raw = getattr(extrato, "sessoes", None)
-            comissoes_raw = getattr(extrato, "comissoes", None)
-            gastos_raw = getattr(extrato, "gastos", None)
-            totais_raw = getattr(extrato, "totais", None)
-
-            pagamentos = json.loads(pagamentos_raw) if pagamentos_raw else []
-            sessoes = json.loads(sessoes_raw) if sessoes_raw else []
-            comissoes = json.loads(comissoes_raw) if comissoes_raw else []
-            gastos = json.loads(gastos_raw) if gastos_raw else []
-            totais = json.loads(totais_raw) if totais_raw else {}
-
-        except (json.JSONDecodeError, AttributeError) as json_error:
-            logger.error(f"Error parsing JSON data from extrato: {str(json_error)}")
-            return (
-                jsonify(
-                    {"success": False, "message": "Erro ao processar dados do extrato"}
-                ),
-                500,
-            )
-
+    if entry is None:
         return (
             jsonify(
                 {
-                    "success": True,
-                    "message": f"Extrato encontrado para {mes:02d}/{ano}",
-                    "data": {
-                        "mes": mes,
-                        "ano": ano,
-                        "pagamentos": pagamentos,
-                        "sessoes": sessoes,
-                        "comissoes": comissoes,
-                        "gastos": gastos,
-                        "totais": totais,
-                    },
+                    "success": False,
+                    "message": f"Extrato não encontrado para {mes:02d}/{ano}",
                 }
             ),
-            200,
+            404,
         )
 
-    except Exception as e:
-        logger.error(f"Error in api_get_extrato: {str(e)}")
-        return jsonify({"success": False, "message": f"Erro interno: {str(e)}"}), 500
-
-    finally:
-        db.close()
+    # Strong ETag + private max-age: 304 when the browser already has it
+    return extrato_api_response(entry)
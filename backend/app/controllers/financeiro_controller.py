@@ -21,6 +21,7 @@ from sqlalchemy.exc import (
 )  # Phase 2: For duplicate google_event_id handling
 from werkzeug.wrappers import Response
 from app.core.auth_decorators import require_session_authorization
+from app.core.fragment_cache import snapshot_table_versions
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -161,6 +162,7 @@ def _safe_options(query: Any, *options_args: Any) -> Any:
 
 @financeiro_bp.route("/", methods=["GET"])
 @login_required
+@snapshot_table_versions
 def financeiro_home() -> str:
     """Render financeiro home page with paginated list of payments."""
     db = None
@@ -263,6 +265,7 @@ def financeiro_home() -> str:
             "financeiro.html",
             pagamentos=pagamentos,
             clients=clients,
+            clients_from_db=not _use_jotform,
             artists=artists,
             # Pagination context
             page=page,
@@ -9,6 +9,7 @@ from app.db.session import SessionLocal
 from app.services.extrato_core import get_previous_month
 from flask import Blueprint, jsonify
 from app.core.limiter_config import limiter
+from app.core.logging_config import get_logging_stats
 
 logger = logging.getLogger(__name__)
 
@@ -146,3 +147,18 @@ def extrato_health_check():
     finally:
         if db:
             db.close()
+
+
+@health_bp.route("/logging", methods=["GET"])
+@limiter.exempt
+def logging_health_check():
+    """
+    Report the logging pipeline state and its measured overhead.
+
+    Returns:
+        JSON with mode ("async" queue pipeline or "sync"), queue size, record
+        counters (enqueued, dropped, rate_limited, requests_sampled_out) and
+        average cost per record on the request thread (enqueue_avg_us) and on
+        the listener thread (handle_avg_us).
+    """
+    return jsonify(get_logging_stats()), 200
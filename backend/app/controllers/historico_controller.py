@@ -3,9 +3,17 @@ import os
 from datetime import date, datetime
 
 from app.core.api_utils import api_response
+from app.core.fragment_cache import snapshot_table_versions
+from app.core.request_fanout import FanOut
 from app.db.base import Comissao, Pagamento, Sessao
 from app.db.session import SessionLocal
 from app.repositories.user_repo import UserRepository
+from app.services.client_choices import (
+    CLIENTS_UNAVAILABLE_MESSAGE,
+    jotform_clients_deadline,
+    load_client_choices,
+    use_jotform_clients,
+)
 from app.services.gastos_service import get_gastos_for_month, serialize_gastos
 from app.services.user_service import UserService
 from flask import Blueprint, flash, render_template, request
@@ -23,6 +31,11 @@ logger = logging.getLogger(__name__)
 
 historico_bp = Blueprint("historico", __name__, url_prefix="/historico")
 
+TOTALS_UNAVAILABLE_MESSAGE = (
+    "Não foi possível calcular os totais do mês. "
+    "Tente novamente em alguns instantes."
+)
+
 
 def _safe_redirect(path_or_endpoint: str):
     from flask import redirect, url_for
@@ -261,8 +274,18 @@ def _normalize_mock_datetime(obj: Any, *attrs: str) -> None:
                 continue
 
 
+def _load_artists(db) -> list:
+    # Use service to list artists (reuses business logic)
+    return UserService(UserRepository(db)).list_artists()
+
+
+def _load_gastos_json(db, start_date, end_date) -> list:
+    return serialize_gastos(get_gastos_for_month(db, start_date, end_date))
+
+
 @historico_bp.route("/", methods=["GET"])
 @login_required
+@snapshot_table_versions
 def historico_home():
     # Generate extrato for previous month unless running tests/CI
     try:
@@ -281,34 +304,30 @@ def historico_home():
     db = None
     try:
         db = SessionLocal()
-        # Get current month totals
+        from app.services.extrato_core import current_month_range
         from app.services.extrato_generation import get_current_month_totals
 
-        current_totals = get_current_month_totals(db)
-        # Debug: validate expected keys in totals
-        expected_keys = {
-            "receita_total",
-            "comissoes_total",
-            "despesas_total",
-            "saldo",
-            "por_artista",
-            "por_forma_pagamento",
-            "gastos_por_forma_pagamento",
-            "gastos_por_categoria",
-        }
-        if not isinstance(current_totals, dict):
-            logger.error("current_totals is not a dict: %r", type(current_totals))
-        else:
-            missing = expected_keys - set(current_totals.keys())
-            if missing:
-                logger.error(
-                    "current_totals missing keys: %s", ", ".join(sorted(missing))
-                )
+        start_date, end_date = current_month_range()
+        use_jotform = use_jotform_clients()
 
-        # Check if there are any current month entries
-        from app.services.extrato_core import current_month_range
+        # Independent of the payment page below: totals, expenses and the
+        # modal lists run in parallel, each with its own session
+        fanout = FanOut(session_factory=SessionLocal)
+        totals_task = fanout.submit(
+            get_current_month_totals, session=True, default=None
+        )
+        gastos_task = fanout.submit(
+            _load_gastos_json, start_date, end_date, session=True, default=[]
+        )
+        clients_task = fanout.submit(
+            load_client_choices,
+            use_jotform,
+            session=True,
+            default=None,
+            deadline=jotform_clients_deadline() if use_jotform else None,
+        )
+        artists_task = fanout.submit(_load_artists, session=True, default=[])
 
-        start_date, end_date = current_month_range()
         # Normalize to date objects when filtering Date columns (Pagamento.data, Sessao.data, Gasto.data)
         try:
             start_date_date = (
@@ -573,12 +592,32 @@ def historico_home():
             # Do not break rendering if logging guard fails
             pass
 
-        # Expenses for the current month
-        try:
-            gastos = get_gastos_for_month(db, start_date, end_date)
-            gastos_json = serialize_gastos(gastos)
-        except Exception:
-            gastos_json = []
+        # Results of the parallel work submitted above
+        current_totals = totals_task.result()
+        if current_totals is None:
+            flash(TOTALS_UNAVAILABLE_MESSAGE, "error")
+            current_totals = {}
+        # Debug: validate expected keys in totals
+        expected_keys = {
+            "receita_total",
+            "comissoes_total",
+            "despesas_total",
+            "saldo",
+            "por_artista",
+            "por_forma_pagamento",
+            "gastos_por_forma_pagamento",
+            "gastos_por_categoria",
+        }
+        if not isinstance(current_totals, dict):
+            logger.error("current_totals is not a dict: %r", type(current_totals))
+        elif current_totals:
+            missing = expected_keys - set(current_totals.keys())
+            if missing:
+                logger.error(
+                    "current_totals missing keys: %s", ", ".join(sorted(missing))
+                )
+
+        gastos_json = gastos_task.result()
 
         # Pagination context based on pagamentos only
         total_pages = (
@@ -595,51 +634,11 @@ def historico_home():
         ) or bool(gastos_json)
 
         # Also provide clients and artists for edit modals (reuse templates)
-        # Prefer ALL clients from JotForm, but fall back to DB in TESTING or when env is missing
-        from app.repositories.client_repo import ClientRepository
-        from app.services.client_service import ClientService
-        import os as _import_os
-
-        _testing_flag = _import_os.getenv("TESTING", "").lower() in ("1", "true", "yes")
-        JOTFORM_API_KEY = _import_os.getenv("JOTFORM_API_KEY", "")
-        JOTFORM_FORM_ID = _import_os.getenv("JOTFORM_FORM_ID", "")
-
-        _use_jotform = (
-            (not _testing_flag) and bool(JOTFORM_API_KEY) and bool(JOTFORM_FORM_ID)
-        )
-
-        if _use_jotform:
-            from app.services.jotform_service import JotFormService
-
-            client_repo = ClientRepository(db)
-            jotform_service = JotFormService(JOTFORM_API_KEY, JOTFORM_FORM_ID)
-            client_service = ClientService(client_repo, jotform_service)
-
-            jotform_submissions = client_service.get_jotform_submissions_for_display()
-
+        clients = clients_task.result()
+        if clients is None:
+            flash(CLIENTS_UNAVAILABLE_MESSAGE, "error")
             clients = []
-            for submission in jotform_submissions:
-                client_name = submission.get("client_name", "Sem nome")
-                submission_id = submission.get("id", "")
-                if client_name and client_name != "Sem nome":
-                    clients.append({"id": submission_id, "name": client_name})
-            clients.sort(key=lambda x: x["name"].lower())
-        else:
-            try:
-                from app.db.base import Client as _Client
-
-                clients = db.query(_Client).order_by(_Client.name).all()
-            except Exception:
-                clients = []
-
-        artists = []
-        try:
-            # Use service to list artists (reuses business logic)
-            user_repo = UserRepository(db)
-            user_service = UserService(user_repo)
-            artists = user_service.list_artists()
-        except Exception:
-            artists = []
+        artists = artists_task.result()
 
         # Debug counts for visibility in logs
         try:
@@ -698,6 +697,7 @@ def historico_home():
             comissoes=comissoes,
             sessoes=sessoes,
             clients=clients,
+            clients_from_db=not use_jotform,
             artists=artists,
             current_totals=current_totals,
             has_current_entries=has_current_entries,
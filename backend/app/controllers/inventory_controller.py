@@ -203,7 +203,12 @@ def change_quantity(item_id):
         data = request.get_json()
         delta = data.get("delta", 0)
 
-        updated = service.change_quantity(item_id, delta)
+        try:
+            updated = service.change_quantity(item_id, int(delta))
+        except ValueError as e:
+            if "not found" in str(e):
+                return jsonify({"error": "Item não encontrado"}), 404
+            return jsonify({"error": str(e)}), 400
         if not updated:
             return jsonify({"error": "Item não encontrado"}), 404
 
@@ -226,3 +231,91 @@ def change_quantity(item_id):
         )
     finally:
         db.close()
+
+
+@inventory_bp.route("/quantities", methods=["PATCH"])
+@limiter.limit("30 per minute")
+@csrf.exempt  # JSON API - uses session authentication
+@require_session_authorization
+def adjust_quantities():
+    """Apply several stock deltas in one atomic update.
+
+    Body: ``{"adjustments": [{"id": 1, "delta": -2}, ...]}``. Deltas for the
+    same id are summed. Nothing is applied if any item is missing or would
+    go below zero.
+    """
+    data = request.get_json(silent=True) or {}
+    adjustments = {}
+    try:
+        for entry in data.get("adjustments") or []:
+            item_id = int(entry["id"])
+            adjustments[item_id] = adjustments.get(item_id, 0) + int(entry["delta"])
+    except (KeyError, TypeError, ValueError):
+        return api_response(False, "Ajustes inválidos", None, 400)
+    if not adjustments:
+        return api_response(False, "Nenhum ajuste informado", None, 400)
+
+    db = SessionLocal()
+    try:
+        repository = InventoryRepository(db)
+        service = InventoryService(repository)
+        try:
+            updated = service.adjust_quantities(adjustments)
+        except ValueError as e:
+            status = 404 if "not found" in str(e) else 400
+            return api_response(False, f"Falha no ajuste: {str(e)}", None, status)
+
+        items = [
+            {
+                "id": item.id,
+                "nome": item.nome,
+                "quantidade": item.quantidade,
+                "observacoes": item.observacoes,
+                "created_at": (
+                    item.created_at.isoformat() if item.created_at else None
+                ),
+                "updated_at": (
+                    item.updated_at.isoformat() if item.updated_at else None
+                ),
+            }
+            for item in updated
+        ]
+        return api_response(True, "Estoque atualizado", {"items": items}, 200)
+    finally:
+        db.close()
+
+
+@inventory_bp.route("/<int:item_id>/move", methods=["PATCH"])
+@limiter.limit("60 per minute")
+@csrf.exempt  # JSON API - uses session authentication
+@require_session_authorization
+def move_item(item_id):
+    """Move one item between two neighbours (drag & drop).
+
+    Body: ``{"previous_id": <id or null>, "next_id": <id or null>}`` - the
+    items right above and below the drop position. Only the moved row is
+    updated.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        previous_id = data.get("previous_id")
+        next_id = data.get("next_id")
+        previous_id = int(previous_id) if previous_id is not None else None
+        next_id = int(next_id) if next_id is not None else None
+    except (TypeError, ValueError):
+        return api_response(False, "Posição inválida", None, 400)
+
+    db = SessionLocal()
+    try:
+        repository = InventoryRepository(db)
+        service = InventoryService(repository)
+        try:
+            moved = service.move_item(item_id, previous_id, next_id)
+        except ValueError as e:
+            # Unknown item, or neighbours no longer adjacent (stale page)
+            status = 404 if "not found" in str(e) else 409
+            return api_response(False, f"Falha ao mover: {str(e)}", None, status)
+
+        return api_response(True, "Item movido", {"id": moved.id}, 200)
+    finally:
+        db.close()
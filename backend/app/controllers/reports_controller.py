@@ -14,7 +14,6 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-import matplotlib.pyplot as plt
 from app.db.base import Extrato
 from app.db.session import SessionLocal
 from flask import Blueprint, jsonify, request
@@ -25,6 +24,20 @@ logger = logging.getLogger(__name__)
 reports_bp = Blueprint("reports", __name__, url_prefix="/reports")
 
 
+def _pyplot():
+    """matplotlib.pyplot, imported on the first chart.
+
+    matplotlib (with numpy) takes ~0.5 s to import and adds tens of MB to a
+    worker, so workers that never draw a chart don't pay for it.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")  # Render to PNG buffers, no display on the server
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
 def require_admin():
     """Decorator to check if user is admin."""
     if (
@@ -307,6 +320,8 @@ def generate_comparison_charts(comparison_data: List[Dict[str, Any]]) -> Dict[st
     charts = {}
 
     try:
+        plt = _pyplot()
+
         # Prepare data for plotting
         months = [f"{d['ano']}-{d['mes']:02d}" for d in comparison_data]
         receita = [d["receita_total"] for d in comparison_data]
@@ -5,13 +5,20 @@ Handles web-based CRUD operations for sessions.
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional, Sequence, Union
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 from app.controllers.sessoes_controller import sessoes_bp
 from app.controllers.sessoes_helpers import _get_user_service
 from app.core.validation import SessaoValidator
 from app.db.base import Client, Sessao
 from app.core.csrf_config import csrf
+from app.core.request_fanout import FanOut
+from app.services.client_choices import (
+    CLIENTS_UNAVAILABLE_MESSAGE,
+    jotform_clients_deadline,
+    load_client_choices,
+    use_jotform_clients,
+)
 from flask import flash, redirect, render_template, request, url_for
 from flask_login import login_required
 from sqlalchemy.exc import IntegrityError
@@ -60,6 +67,52 @@ def _render_nova_sessao_form(
     )
 
 
+def _list_artists() -> list:
+    return _get_user_service().list_artists()
+
+
+def _find_calendar_event(event_id: str) -> Tuple[Optional[Any], bool, str]:
+    """Look ``event_id`` up in the user's calendar (30 days back, 90 days span).
+
+    Returns ``(event, is_google_event, event_title_with_suffix)``.
+    """
+    event = None
+    is_google_event = False
+    event_title_with_suffix = ""
+    try:
+        from datetime import timedelta
+
+        from app.services.google_calendar_service import GoogleCalendarService
+        from flask_login import current_user
+
+        calendar_service = GoogleCalendarService()
+
+        if calendar_service.is_user_authorized(str(current_user.id)):
+            start_date = datetime.now() - timedelta(days=30)
+            end_date = start_date + timedelta(days=90)
+
+            events = calendar_service.get_user_events(
+                str(current_user.id), start_date, end_date
+            )
+
+            for candidate in events:
+                if candidate.google_event_id == event_id or candidate.id == event_id:
+                    event = candidate
+                    is_google_event = bool(candidate.google_event_id)
+                    event_title = candidate.title or "Evento sem título"
+                    if is_google_event and "(google agenda)" not in event_title:
+                        event_title_with_suffix = f"{event_title} (google agenda)"
+                    else:
+                        event_title_with_suffix = event_title
+                    break
+
+            if not event:
+                logger.warning("Event with ID %s not found", event_id)
+    except Exception as err:  # pragma: no cover - fallback path
+        logger.error("Error fetching event data: %s", err)
+    return event, is_google_event, event_title_with_suffix
+
+
 @sessoes_bp.route("/", methods=["GET"])
 @login_required
 def sessoes_home() -> Response:
@@ -78,89 +131,37 @@ def nova_sessao() -> Union[str, Response]:
         db = SessionLocal()
 
         if request.method == "GET":
-            # Load clients for dropdown: prefer ALL from JotForm at runtime; fallback to DB in TESTING
-            from app.repositories.client_repo import ClientRepository
-            from app.services.client_service import ClientService
-            import os
-
-            testing_flag = os.getenv("TESTING", "").lower() in ("1", "true", "yes")
-            JOTFORM_API_KEY = os.getenv("JOTFORM_API_KEY", "")
-            JOTFORM_FORM_ID = os.getenv("JOTFORM_FORM_ID", "")
-            use_jotform = (
-                (not testing_flag) and bool(JOTFORM_API_KEY) and bool(JOTFORM_FORM_ID)
+            # The client list (JotForm crawl), the artists and the calendar
+            # lookup are independent: run them in parallel
+            fanout = FanOut(session_factory=SessionLocal)
+            use_jotform = use_jotform_clients()
+            clients_task = fanout.submit(
+                load_client_choices,
+                use_jotform,
+                session=True,
+                default=None,
+                deadline=jotform_clients_deadline() if use_jotform else None,
             )
+            artists_task = fanout.submit(_list_artists, uses_db=True)
 
-            if use_jotform:
-                from app.services.jotform_service import JotFormService
-
-                client_repo = ClientRepository(db)
-                jotform_service = JotFormService(JOTFORM_API_KEY, JOTFORM_FORM_ID)
-                client_service = ClientService(client_repo, jotform_service)
-
-                jotform_submissions = (
-                    client_service.get_jotform_submissions_for_display()
+            event_id = request.args.get("event_id")
+            event_task = None
+            if event_id:
+                event_task = fanout.submit(
+                    _find_calendar_event,
+                    event_id,
+                    uses_db=True,
+                    default=(None, False, ""),
                 )
 
+            clients = clients_task.result()
+            if clients is None:
+                flash(CLIENTS_UNAVAILABLE_MESSAGE, "error")
                 clients = []
-                for submission in jotform_submissions:
-                    client_name = submission.get("client_name", "Sem nome")
-                    submission_id = submission.get("id", "")
-                    if client_name and client_name != "Sem nome":
-                        clients.append({"id": submission_id, "name": client_name})
-                clients.sort(key=lambda x: x["name"].lower())
-            else:
-                clients = db.query(Client).order_by(Client.name).all()
-
-            user_service = _get_user_service()
-            artists = user_service.list_artists()
-
-            event_id = request.args.get("event_id")
-            event = None
-            is_google_event = False
-            event_title_with_suffix = ""
-
-            if event_id:
-                try:
-                    from datetime import timedelta
-
-                    from app.services.google_calendar_service import (
-                        GoogleCalendarService,
-                    )
-                    from flask_login import current_user
-
-                    calendar_service = GoogleCalendarService()
-
-                    if calendar_service.is_user_authorized(str(current_user.id)):
-                        start_date = datetime.now() - timedelta(days=30)
-                        end_date = start_date + timedelta(days=90)
-
-                        events = calendar_service.get_user_events(
-                            str(current_user.id), start_date, end_date
-                        )
-
-                        for candidate in events:
-                            if (
-                                candidate.google_event_id == event_id
-                                or candidate.id == event_id
-                            ):
-                                event = candidate
-                                is_google_event = bool(candidate.google_event_id)
-                                event_title = candidate.title or "Evento sem título"
-                                if (
-                                    is_google_event
-                                    and "(google agenda)" not in event_title
-                                ):
-                                    event_title_with_suffix = (
-                                        f"{event_title} (google agenda)"
-                                    )
-                                else:
-                                    event_title_with_suffix = event_title
-                                break
-
-                        if not event:
-                            logger.warning("Event with ID %s not found", event_id)
-                except Exception as err:  # pragma: no cover - fallback path
-                    logger.error("Error fetching event data: %s", err)
+            artists = artists_task.result()
+            event, is_google_event, event_title_with_suffix = (
+                event_task.result() if event_task else (None, False, "")
+            )
 
             return _render_nova_sessao_form(
                 db,
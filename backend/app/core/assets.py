@@ -0,0 +1,370 @@
+"""
+Static asset bundles - fingerprinted, minified and pre-compressed.
+
+Every page loads the same base scripts (jQuery, util.js, modal.js, ...) plus
+one or a few page scripts, each as a separate request busted by the GIT_SHA.
+``build_bundles`` (``python scripts/build_assets.py``) concatenates the files
+of each bundle in ``BUNDLES``, minifies them and writes:
+
+- ``dist/<name>.<content hash>.<ext>`` plus ``.gz`` and, when the optional
+  ``brotli`` package is installed, ``.br`` variants
+- ``dist/manifest.json`` mapping bundle names to those files
+
+Templates ask for URLs by bundle name:
+
+    {% for src in asset_urls('historico.js') %}
+        <script src="{{ src }}"></script>
+    {% endfor %}
+
+Without a manifest (development, tests) ``asset_urls`` returns the source
+files with the usual ``?v=GIT_SHA``; a bundle whose sources changed after
+the build also falls back to them. ASSET_BUNDLES=0 ignores the manifest.
+
+``/assets/dist/...`` is served by ``serve_bundle``: the pre-compressed
+variant matching ``Accept-Encoding``, cached as ``immutable`` (the name
+changes with the content). JS is minified only when the optional ``rjsmin``
+package is installed; CSS is minified here.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import abort, current_app, request, send_from_directory, url_for
+
+try:  # Optional dependency: .br variants are skipped without it
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+try:  # Optional dependency: JS is bundled unminified without it
+    import rjsmin  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    rjsmin = None
+
+logger = logging.getLogger(__name__)
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_BASE_JS = (
+    "js/jquery.min.js",
+    "js/browser.min.js",
+    "js/breakpoints.min.js",
+    "js/util.js",
+    "js/i18n.js",
+    "js/modal.js",
+    "js/common.js",
+    "js/main.js",
+)
+
+# Bundle name -> source files (relative to the static folder), in load order
+BUNDLES: Dict[str, Tuple[str, ...]] = {
+    "base.css": ("css/main.css", "css/modal.css"),
+    "base.js": _BASE_JS,
+    "agenda.js": ("js/agenda.js",),
+    "cadastro_interno.js": ("js/cadastro_interno.js",),
+    "calculadora.js": ("js/calculadora.js",),
+    "drag_drop.js": ("js/drag_drop.js",),
+    "extrato.js": ("js/extrato.js",),
+    "financeiro.js": ("js/financeiro.js",),
+    "gastos.js": ("js/gastos.js",),
+    "historico.js": (
+        "js/utils/dom-helpers.js",
+        "js/utils/resource-client.js",
+        "js/financeiro.js",
+        "js/sessoes.js",
+        "js/historico.js",
+    ),
+    "inventory.js": ("js/inventory.js",),
+    "search_results.js": ("js/search_results.js",),
+}
+
+# Encodings in order of preference, with the suffix of their files
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+# -- Minification --------------------------------------------------------------
+
+_CSS_TOKENS = re.compile(
+    r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)", re.S
+)
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,])\s*")
+
+
+def minify_css(text: str) -> str:
+    """Drop comments (except ``/*! ... */``) and redundant whitespace.
+
+    Strings are copied verbatim; whitespace is only removed around
+    ``{ } ; ,`` because it is significant elsewhere (``a :hover``).
+    """
+    chunks: List[Tuple[bool, str]] = []  # (verbatim, text)
+    pos = 0
+    for match in _CSS_TOKENS.finditer(text):
+        chunks.append((False, text[pos : match.start()]))
+        string, comment, _ = match.groups()
+        if string:
+            chunks.append((True, string))
+        elif comment:
+            if comment.startswith("/*!"):
+                chunks.append((True, comment + "\n"))
+        else:
+            chunks.append((False, " "))
+        pos = match.end()
+    chunks.append((False, text[pos:]))
+
+    out: List[str] = []
+    code: List[str] = []
+    for verbatim, chunk in chunks:
+        if not verbatim:
+            code.append(chunk)
+            continue
+        out.append(_tidy_css(out, code))
+        code = []
+        out.append(chunk)
+    out.append(_tidy_css(out, code))
+    return "".join(out).strip()
+
+
+def _tidy_css(out: List[str], code: List[str]) -> str:
+    text = re.sub(r"\s+", " ", "".join(code))
+    text = _CSS_PUNCTUATION.sub(r"\1", text).replace(";}", "}")
+    # Kept comments already end with a newline
+    return text.lstrip() if out and out[-1].endswith("*/\n") else text
+
+
+def minify_js(text: str, source: str = "") -> str:
+    if rjsmin is None or source.endswith(".min.js"):
+        return text
+    return rjsmin.jsmin(text, keep_bang_comments=True)
+
+
+# -- Build ---------------------------------------------------------------------
+
+
+def _read_manifest(static_folder: str) -> Dict[str, Any]:
+    path = os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _bundle_bytes(
+    static_folder: str, name: str, sources: Tuple[str, ...], minify: bool
+) -> bytes:
+    is_css = name.endswith(".css")
+    parts = []
+    for source in sources:
+        with open(os.path.join(static_folder, source), "r", encoding="utf-8") as f:
+            text = f.read()
+        if minify:
+            text = minify_css(text) if is_css else minify_js(text, source)
+        parts.append(text.strip())
+    # A lone ";" keeps a file without a trailing semicolon from running into
+    # the next one
+    return ("\n" if is_css else "\n;\n").join(parts).encode("utf-8") + b"\n"
+
+
+def build_bundles(
+    static_folder: str,
+    bundles: Optional[Dict[str, Tuple[str, ...]]] = None,
+    minify: bool = True,
+) -> Dict[str, Any]:
+    """Write every bundle and its compressed variants, then the manifest.
+
+    Files of the previous build are kept (pages rendered before a deploy
+    still reference them); older ones are removed.
+    """
+    bundles = bundles or BUNDLES
+    dist = os.path.join(static_folder, DIST_DIR)
+    os.makedirs(dist, exist_ok=True)
+    previous = _read_manifest(static_folder)
+
+    manifest: Dict[str, Any] = {}
+    for name in sorted(bundles):
+        sources = bundles[name]
+        data = _bundle_bytes(static_folder, name, sources, minify)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = name.rsplit(".", 1)
+        filename = f"{DIST_DIR}/{stem}.{digest}.{ext}"
+        path = os.path.join(static_folder, filename)
+
+        _write(path, data)
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        _write(path + ".gz", gz)
+        br = None
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            _write(path + ".br", br)
+
+        manifest[name] = {
+            "file": filename,
+            "sources": list(sources),
+            "source_mtime": max(
+                os.path.getmtime(os.path.join(static_folder, s)) for s in sources
+            ),
+            "bytes": len(data),
+            "gzip_bytes": len(gz),
+            "br_bytes": len(br) if br is not None else None,
+        }
+
+    _write(
+        os.path.join(dist, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+
+    keep = {
+        os.path.basename(entry["file"])
+        for entry in list(manifest.values()) + list(previous.values())
+    }
+    for filename in os.listdir(dist):
+        base = filename
+        for _, suffix in _ENCODINGS:
+            base = base[: -len(suffix)] if base.endswith(suffix) else base
+        if filename != MANIFEST_NAME and base not in keep:
+            os.remove(os.path.join(dist, filename))
+
+    logger.info(
+        "Asset bundles built",
+        extra={"context": {"bundles": len(manifest), "brotli": brotli is not None}},
+    )
+    return manifest
+
+
+# -- Runtime -------------------------------------------------------------------
+
+
+class AssetBundles:
+    """The manifest as loaded at startup, minus bundles older than their sources."""
+
+    def __init__(
+        self,
+        static_folder: str,
+        enabled: bool = True,
+        bundles: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
+        self.static_folder = static_folder
+        self.sources = bundles or BUNDLES
+        self.bundles: Dict[str, Dict[str, Any]] = {}
+        # dist file name -> encodings available for it, for the files on disk
+        # at startup (this build and the previous one, see build_bundles)
+        self._encodings: Dict[str, Tuple[str, ...]] = {}
+        if static_folder:
+            self._scan_dist()
+        if enabled and static_folder:
+            self._load()
+
+    def _scan_dist(self) -> None:
+        try:
+            names = set(os.listdir(os.path.join(self.static_folder, DIST_DIR)))
+        except OSError:
+            return
+        for name in names:
+            if name == MANIFEST_NAME or name.endswith(".tmp"):
+                continue
+            if any(name.endswith(suffix) for _, suffix in _ENCODINGS):
+                continue
+            self._encodings[name] = tuple(
+                encoding for encoding, suffix in _ENCODINGS if name + suffix in names
+            )
+
+    def _load(self) -> None:
+        for name, entry in _read_manifest(self.static_folder).items():
+            if name not in self.sources or self._stale(entry):
+                logger.warning(
+                    "Asset bundle outdated - serving its sources",
+                    extra={"context": {"bundle": name}},
+                )
+                continue
+            self.bundles[name] = entry
+
+    def _stale(self, entry: Dict[str, Any]) -> bool:
+        try:
+            mtime = max(
+                os.path.getmtime(os.path.join(self.static_folder, s))
+                for s in entry["sources"]
+            )
+            return mtime > entry["source_mtime"] or not os.path.isfile(
+                os.path.join(self.static_folder, entry["file"])
+            )
+        except (OSError, KeyError, ValueError):
+            return True
+
+    def urls(self, name: str) -> List[str]:
+        entry = self.bundles.get(name)
+        if entry is not None:
+            return [url_for("static", filename=entry["file"])]
+        if name not in self.sources:
+            raise KeyError(f"Unknown asset bundle: {name}")
+        version = current_app.config.get("GIT_SHA", "")
+        return [url_for("static", filename=s, v=version) for s in self.sources[name]]
+
+    def encodings(self, filename: str) -> Optional[Tuple[str, ...]]:
+        """Pre-compressed variants of ``filename``, None if it was not built."""
+        return self._encodings.get(filename)
+
+
+def asset_urls(name: str) -> List[str]:
+    """URLs to load bundle ``name``: the built file, or its sources."""
+    return current_app.extensions["asset_bundles"].urls(name)
+
+
+def serve_bundle(filename: str):
+    """A dist file, pre-compressed when the client accepts it."""
+    bundles: AssetBundles = current_app.extensions["asset_bundles"]
+    # Only files of a build: no disk lookups for made-up names, and the
+    # compressed variants are not served directly
+    available = bundles.encodings(filename)
+    if available is None:
+        abort(404)
+
+    encoding = None
+    for candidate in available:
+        if request.accept_encodings.quality(candidate) > 0:
+            encoding = candidate
+            break
+    suffix = dict(_ENCODINGS)[encoding] if encoding else ""
+
+    response = send_from_directory(
+        os.path.join(bundles.static_folder, DIST_DIR),
+        filename + suffix,
+        mimetype=mimetypes.guess_type(filename)[0],
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE
+    return response
+
+
+def register_asset_bundles(app) -> None:
+    """Load the manifest, add ``asset_urls`` to Jinja and the dist route."""
+    enabled = os.getenv("ASSET_BUNDLES", "1").lower() not in ("0", "false", "no")
+    bundles = AssetBundles(app.static_folder, enabled=enabled)
+    app.extensions["asset_bundles"] = bundles
+    app.jinja_env.globals["asset_urls"] = asset_urls
+    if app.static_url_path is not None:
+        app.add_url_rule(
+            f"{app.static_url_path}/{DIST_DIR}/<path:filename>",
+            endpoint="asset_bundle",
+            view_func=serve_bundle,
+        )
+    logger.info(
+        "Asset bundles registered",
+        extra={"context": {"bundles": sorted(bundles.bundles), "enabled": enabled}},
+    )
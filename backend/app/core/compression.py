@@ -0,0 +1,169 @@
+"""
+Response compression for HTML and JSON.
+
+``/search/api``, ``/extrato/api`` and the historico/financeiro pages (with
+their embedded ``gastos_json``) run to hundreds of KB of highly repetitive
+text. ``register_response_compression`` adds an ``after_request`` hook that
+compresses them for clients that send ``Accept-Encoding``:
+
+- ``br`` when the optional ``brotli`` package is installed and the client
+  prefers it, otherwise ``gzip``
+- only types in ``COMPRESSIBLE_TYPES`` and bodies of at least
+  COMPRESSION_MIN_BYTES (default 1024)
+- streamed responses are compressed chunk by chunk (each chunk is flushed,
+  so the client keeps receiving data as it is produced)
+
+Left alone: responses that already have a ``Content-Encoding`` (the
+pre-compressed asset bundles), file responses (``send_file``), partial
+content, HEAD requests and bodiless statuses. Strong ETags become weak, since
+the compressed bytes differ from the ones the tag was computed on.
+
+COMPRESSION_ENABLED=0 disables it; COMPRESSION_LEVEL sets the gzip level
+(default 6).
+"""
+
+import gzip
+import logging
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, request
+
+from app.core.runtime import env_number
+
+try:  # Optional dependency: gzip only without it
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_GZIP_LEVEL = 6
+# Dynamic responses: quality 4 is close to gzip -6 in speed and smaller
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/javascript",
+        "application/json",
+        "application/xml",
+        "image/svg+xml",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+        "text/xml",
+    }
+)
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Best supported encoding for a request's ``Accept-Encoding``."""
+    candidates = ["gzip"] if brotli is None else ["br", "gzip"]
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(data: bytes, encoding: str, level: int = DEFAULT_GZIP_LEVEL) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(
+    chunks: Iterable[bytes], encoding: str, level: int = DEFAULT_GZIP_LEVEL
+) -> Iterator[bytes]:
+    """Compress a streamed body, flushing after every chunk."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, flush = compressor.process, compressor.flush
+        finish = compressor.finish
+    else:
+        # wbits 31: gzip header and trailer around the deflate stream
+        deflate = zlib.compressobj(level, zlib.DEFLATED, 31)
+        compress, finish = deflate.compress, deflate.flush
+
+        def flush() -> bytes:
+            return deflate.flush(zlib.Z_SYNC_FLUSH)
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _skip(response: Response) -> bool:
+    return (
+        request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or "Content-Range" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    )
+
+
+def compress_response(response: Response, min_bytes: int, level: int) -> Response:
+    """Compress ``response`` in place when the request and the body allow it."""
+    if _skip(response):
+        return response
+    # The body depends on Accept-Encoding even when this one stays plain
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, level)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < min_bytes:
+            return response
+        response.set_data(compress_body(data, encoding, level))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_response_compression(app: Flask) -> None:
+    """Compress eligible responses; register before other after_request hooks.
+
+    Flask runs ``after_request`` functions in reverse order, so registering
+    this first makes it see the final body and headers.
+    """
+    if os.getenv("COMPRESSION_ENABLED", "1").lower() in ("0", "false", "no"):
+        logger.info("Response compression disabled")
+        return
+
+    min_bytes = env_number("COMPRESSION_MIN_BYTES", DEFAULT_MIN_BYTES, int)
+    level = env_number("COMPRESSION_LEVEL", DEFAULT_GZIP_LEVEL, int)
+
+    @app.after_request
+    def _compress_response(response):
+        try:
+            return compress_response(response, min_bytes, level)
+        except Exception as e:
+            logger.warning(
+                "Response compression failed - sending uncompressed",
+                extra={"context": {"path": request.path, "error": str(e)}},
+            )
+            return response
@@ -1,19 +1,36 @@
 import json
 import logging
 import os
+import re
 import time
 import urllib.request
-from typing import Any, Dict, Optional, Set
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Set
 
-from flask import g, has_request_context
+from flask import Flask, g, has_request_context
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, raiseload
+
+from app.core.metrics import observe_db_query
 
 logger = logging.getLogger("sql.alerts")
 
 _SLACK_FAILURES: Set[str] = set()
 _SENSITIVE_KEYS = ("password", "token", "secret", "email")
 
+# Strict lazy-load mode for the current context (see strict_lazy_loads)
+_STRICT_LAZY_LOADS: ContextVar[bool] = ContextVar("strict_lazy_loads", default=False)
+
+# Placeholder lists such as "IN (?, ?, ?)" collapse to one shape regardless of
+# how many values were bound
+_PLACEHOLDER_LIST_RE = re.compile(
+    r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)"
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def _get_threshold_ms() -> int:
     try:
@@ -26,6 +43,29 @@ def _alerts_enabled() -> bool:
     return os.getenv("ALERT_SLOW_QUERY_ENABLED", "true").lower() == "true"
 
 
+def _get_int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _get_query_budget() -> int:
+    return _get_int_env("QUERY_BUDGET_PER_REQUEST", 50)
+
+
+def _get_repeat_threshold() -> int:
+    return _get_int_env("QUERY_REPEAT_THRESHOLD", 10)
+
+
+def _query_budget_alerts_enabled() -> bool:
+    return os.getenv("ALERT_QUERY_BUDGET_ENABLED", "true").lower() == "true"
+
+
+def _strict_lazy_loads_from_env() -> bool:
+    return os.getenv("SQL_STRICT_LAZY_LOADS", "").lower() in ("1", "true", "yes")
+
+
 def _safe_truncate(value: Any, limit: int = 500) -> str:
     try:
         text = str(value)
@@ -56,6 +96,45 @@ def _mask_params(params: Any) -> Any:
         return "<unserializable>"
 
 
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated executions can be counted.
+
+    Bound parameters are already placeholders; only whitespace and expanded
+    IN-lists vary between executions of the same query.
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement or "").strip()
+    return _PLACEHOLDER_LIST_RE.sub("(?)", shape)
+
+
+def reset_request_query_stats() -> None:
+    """Start counting queries for the current request."""
+    g.db_query_count = 0
+    g.db_time_ms = 0.0
+    g.db_statement_shapes = Counter()
+
+
+def get_request_query_stats() -> Optional[Dict[str, Any]]:
+    """Return query count, DB time and statement shapes for the current request.
+
+    Returns None outside a request or when tracking was not started.
+    """
+    if not has_request_context() or not hasattr(g, "db_statement_shapes"):
+        return None
+    return {
+        "count": g.db_query_count,
+        "time_ms": g.db_time_ms,
+        "shapes": g.db_statement_shapes,
+    }
+
+
+def _record_request_query(statement: str, duration_ms: float) -> None:
+    if not has_request_context() or not hasattr(g, "db_statement_shapes"):
+        return
+    g.db_query_count += 1
+    g.db_time_ms += duration_ms
+    g.db_statement_shapes[normalize_statement(statement)] += 1
+
+
 def _post_slack(webhook: str, payload: Dict[str, Any]) -> None:
     if not webhook:
         return
@@ -165,12 +244,14 @@ def register_query_timing(
     def _after_cursor_execute(
         conn, cursor, statement, parameters, context, executemany
     ):
-        if not _alerts_enabled():
-            return
         start = getattr(context, "_slow_query_start_time", None)
         if start is None:
             return
         duration_ms = (time.perf_counter() - start) * 1000.0
+        _record_request_query(statement, duration_ms)
+        observe_db_query(statement, duration_ms / 1000.0)
+        if not _alerts_enabled():
+            return
         if duration_ms < _get_threshold_ms():
             return
         context_info = _gather_request_context(resolved_db_info)
@@ -181,3 +262,106 @@ def register_query_timing(
         _emit_alert(duration_ms, statement, raw_params, context_info)
 
     setattr(engine, "_slow_query_alerts_registered", True)
+
+
+def _emit_query_budget_alerts(stats: Dict[str, Any]) -> None:
+    context_info = _gather_request_context()
+    budget = _get_query_budget()
+    if budget > 0 and stats["count"] > budget:
+        logger.warning(
+            "Query budget exceeded",
+            extra={
+                "context": {
+                    "alert_type": "query_budget_exceeded",
+                    "severity": "warning",
+                    "query_count": stats["count"],
+                    "budget": budget,
+                    "db_time_ms": round(stats["time_ms"], 2),
+                    "context": context_info,
+                }
+            },
+        )
+
+    threshold = _get_repeat_threshold()
+    if threshold <= 0:
+        return
+    for shape, count in stats["shapes"].most_common():
+        if count < threshold:
+            break
+        logger.warning(
+            "Repeated query detected (possible N+1)",
+            extra={
+                "context": {
+                    "alert_type": "n_plus_one",
+                    "severity": "warning",
+                    "executions": count,
+                    "threshold": threshold,
+                    "statement": _safe_truncate(shape),
+                    "context": context_info,
+                }
+            },
+        )
+
+
+def register_request_query_tracking(app: Flask) -> None:
+    """Track SQL query count and time per request.
+
+    - Adds a ``Server-Timing`` header with DB time and query count
+    - Logs an alert when a request exceeds QUERY_BUDGET_PER_REQUEST queries
+    - Logs an N+1 alert when one statement shape runs QUERY_REPEAT_THRESHOLD
+      times or more within a request
+    """
+
+    @app.before_request
+    def _start_query_tracking():
+        reset_request_query_stats()
+
+    @app.after_request
+    def _finish_query_tracking(response):
+        stats = get_request_query_stats()
+        if stats is None:
+            return response
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats["time_ms"]:.1f};desc="{stats["count"]} queries"',
+        )
+        if _query_budget_alerts_enabled():
+            try:
+                _emit_query_budget_alerts(stats)
+            except Exception:
+                pass
+        return response
+
+
+def _apply_strict_lazy_loads(orm_execute_state) -> None:
+    if not (_STRICT_LAZY_LOADS.get() or _strict_lazy_loads_from_env()):
+        return
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        # sql_only: relationships already in the identity map stay usable;
+        # only loads that would emit a query raise
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*", sql_only=True)
+        )
+
+
+event.listen(Session, "do_orm_execute", _apply_strict_lazy_loads)
+
+
+@contextmanager
+def strict_lazy_loads() -> Iterator[None]:
+    """Make lazy relationship loads raise inside this block.
+
+    Objects loaded by ORM queries in the block get ``raiseload("*")``, so any
+    relationship that was not eager-loaded raises InvalidRequestError instead
+    of silently issuing one query per row. Intended for tests; set
+    SQL_STRICT_LAZY_LOADS=true to enable it process-wide.
+    """
+    token = _STRICT_LAZY_LOADS.set(True)
+    try:
+        yield
+    finally:
+        _STRICT_LAZY_LOADS.reset(token)
@@ -0,0 +1,135 @@
+"""
+Extrato snapshot cache with HTTP validators.
+
+An extrato row is a monthly snapshot: it only changes when a month is
+regenerated, transferred or reverted, all through the ORM, and every such
+commit bumps the ``extratos`` change counter (``fragment_cache``).
+``get_extrato_entry`` keeps per month the decoded payload, the
+``/extrato/api`` JSON body and its ETag, valid for the counter value it was
+built under: a repeated view costs the counter query instead of loading and
+decoding five JSON columns.
+
+- The API ETag is the SHA-256 of the body, so every gunicorn worker computes
+  the same tag for the same snapshot and ``If-None-Match`` gets a 304 from
+  any of them. Responses are ``private`` with ``max-age`` EXTRATO_HTTP_MAX_AGE
+  (default 300): month switches in ``extrato.js`` reuse the browser cache.
+- ``/extrato/<ano>/<mes>`` gets a weak ETag over the snapshot tag, the user,
+  the session's CSRF token and the deploy (GIT_SHA), checked before rendering;
+  the page is ``private, no-cache`` so it is always revalidated.
+
+EXTRATO_CACHE_ENTRIES bounds the months kept per process (default 24; 0
+disables the in-process cache, the HTTP validators still apply).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from flask import Response, current_app, request, session
+from flask_login import current_user
+from sqlalchemy import select
+
+from app.core.fragment_cache import read_table_versions
+from app.core.runtime import env_number
+from app.core.ttl_cache import TTLCache
+
+DEFAULT_MAX_ENTRIES = 24
+DEFAULT_MAX_AGE = 300
+
+PAGE_CACHE_CONTROL = "private, no-cache"
+
+# Snapshot columns and their value when empty
+_COLUMNS = (
+    ("pagamentos", "[]"),
+    ("sessoes", "[]"),
+    ("comissoes", "[]"),
+    ("gastos", "[]"),
+    ("totais", "{}"),
+)
+
+
+@dataclass(frozen=True)
+class ExtratoEntry:
+    """One month's snapshot, decoded and serialized for ``/extrato/api``."""
+
+    data: Dict[str, Any]
+    body: bytes
+    etag: str
+
+
+# (mes, ano) -> entry, valid for one ``extratos`` counter value
+extrato_cache = TTLCache(
+    max_entries=env_number("EXTRATO_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES, int)
+)
+
+
+def _decode(raw: Any, empty: str) -> Any:
+    try:
+        return json.loads(raw or empty)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid extrato JSON: {e}") from e
+
+
+def load_extrato_entry(mes: int, ano: int) -> Optional[ExtratoEntry]:
+    """Read and serialize one snapshot; ValueError when its JSON is invalid."""
+    from app.db.base import Extrato
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        stmt = select(Extrato).where(Extrato.mes == mes, Extrato.ano == ano)
+        extrato = db.execute(stmt).scalar_one_or_none()
+        if extrato is None:
+            return None
+        data = {"mes": extrato.mes, "ano": extrato.ano}
+        for column, empty in _COLUMNS:
+            data[column] = _decode(getattr(extrato, column), empty)
+
+    payload = {
+        "success": True,
+        "message": f"Extrato encontrado para {mes:02d}/{ano}",
+        "data": data,
+    }
+    body = current_app.json.response(payload).get_data()
+    return ExtratoEntry(data=data, body=body, etag=hashlib.sha256(body).hexdigest())
+
+
+def get_extrato_entry(mes: int, ano: int) -> Optional[ExtratoEntry]:
+    """The month's snapshot, from the cache while its counter is unchanged."""
+    # Counter read before the data: an entry is never older than its version
+    versions = read_table_versions()
+    if versions is None:
+        return load_extrato_entry(mes, ano)
+    # Missing months (None) are not cached
+    return extrato_cache.get(
+        (mes, ano),
+        lambda: load_extrato_entry(mes, ano),
+        version=versions.get("extratos", 0),
+    )
+
+
+def extrato_api_response(entry: ExtratoEntry) -> Response:
+    """``entry``'s JSON with a strong ETag; 304 when the client has it."""
+    max_age = env_number("EXTRATO_HTTP_MAX_AGE", DEFAULT_MAX_AGE, int)
+    response = Response(entry.body, mimetype="application/json")
+    response.set_etag(entry.etag)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    return response.make_conditional(request)
+
+
+def extrato_page_etag(entry: ExtratoEntry) -> Optional[str]:
+    """Weak validator for the rendered page.
+
+    None while the session has no CSRF token yet: rendering creates one, so
+    the page sent now would not match the tag of later requests.
+    """
+    csrf_token = session.get("csrf_token")
+    if not csrf_token:
+        return None
+    parts = (
+        entry.etag,
+        str(getattr(current_user, "id", "")),
+        str(csrf_token),
+        str(current_app.config.get("GIT_SHA", "")),
+    )
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
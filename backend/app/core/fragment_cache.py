@@ -0,0 +1,216 @@
+"""
+Fragment cache for Jinja templates.
+
+The listing pages re-render the same client/artist ``<option>`` lists and
+table rows on every request. A call block renders its body once and reuses
+the HTML until one of the tables it depends on changes:
+
+    {% call cached_fragment('historico:pagamentos', ['pagamentos', 'clients',
+                            'users'], vary=pagamentos|map(attribute='id')|join(',')) %}
+        ...
+    {% endcall %}
+
+Version keys come from table change counters in ``table_versions``. Every
+transaction that writes a tracked table increments its counter in the same
+commit, so all gunicorn workers see the new version exactly when the data
+becomes visible. Views decorated with ``snapshot_table_versions`` read the
+counters in one query *before* loading their data: the HTML stored under a
+version is never older than that version.
+
+A fragment renders uncached when:
+- the view took no snapshot (not decorated, or the counters could not be read)
+- ``tables`` is empty, e.g. client lists fetched from JotForm instead of the
+  clients table
+
+``vary`` separates fragments of the same name that render different rows
+(page, month, filters). Writes that bypass the ORM (raw SQL) are picked up
+after FRAGMENT_CACHE_TTL_SECONDS (default 300; 0 disables the cache).
+"""
+
+import functools
+import logging
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from flask import g, has_request_context
+from markupsafe import Markup
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from app.core.runtime import env_number
+from app.core.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 4096
+
+# Tables whose writes bump a counter; fragments may only depend on these.
+# extratos versions the snapshot cache in extrato_cache.
+TRACKED_TABLES = frozenset(
+    {"clients", "comissoes", "extratos", "gastos", "pagamentos", "sessoes", "users"}
+)
+
+_PENDING_KEY = "fragment_cache_pending_tables"
+_SNAPSHOT_KEY = "table_versions"
+
+# Rendered HTML per fragment, valid for one set of table versions
+fragment_cache = TTLCache(
+    ttl_seconds=env_number("FRAGMENT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS, float),
+    max_entries=DEFAULT_MAX_ENTRIES,
+)
+
+
+# -- Version snapshot ----------------------------------------------------------
+
+
+def read_table_versions() -> Optional[Dict[str, int]]:
+    """All change counters in one query, or None when they cannot be read."""
+    from app.db.base import TableVersion
+    from app.db.session import get_engine
+
+    table = TableVersion.__table__
+    try:
+        with get_engine().connect() as conn:
+            rows = conn.execute(select(table.c.table_name, table.c.version)).all()
+    except Exception as e:
+        logger.debug(
+            "Table versions unavailable - fragments render uncached",
+            extra={"context": {"error": str(e)}},
+        )
+        return None
+    return {name: version for name, version in rows}
+
+
+def snapshot_table_versions(view):
+    """Read the change counters before ``view`` loads its data."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if fragment_cache.enabled:
+            setattr(g, _SNAPSHOT_KEY, read_table_versions())
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def cached_fragment(
+    name: str,
+    tables: Optional[Iterable[str]] = None,
+    vary: Any = None,
+    caller: Optional[Callable[[], str]] = None,
+) -> Markup:
+    """Jinja ``{% call %}`` helper: the block's HTML, rendered once per version."""
+    if caller is None:
+        raise TypeError("cached_fragment must be used with {% call %}")
+    tables = tuple(tables or ())
+    untracked = [table for table in tables if table not in TRACKED_TABLES]
+    if untracked:
+        raise ValueError(f"Fragment depends on untracked tables: {untracked}")
+
+    snapshot = g.get(_SNAPSHOT_KEY) if has_request_context() else None
+    if not tables or snapshot is None or not fragment_cache.enabled:
+        return caller()
+
+    versions = tuple(snapshot.get(table, 0) for table in tables)
+    key = (name, tables, _hashable(vary))
+    return Markup(fragment_cache.get(key, lambda: str(caller()), version=versions))
+
+
+# -- Change counters -----------------------------------------------------------
+
+# Engines known to have the table_versions table
+_ready_engines: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def _has_versions_table(connection) -> bool:
+    engine = connection.engine
+    if _ready_engines.get(engine):
+        return True
+    if inspect(connection).has_table("table_versions"):
+        _ready_engines[engine] = True
+        return True
+    return False
+
+
+def bump_table_versions(connection, tables: Iterable[str]) -> None:
+    """Increment the counters of ``tables`` inside the caller's transaction."""
+    from app.db.base import TableVersion
+
+    dialect_name = connection.dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return
+
+    table = TableVersion.__table__
+    # Sorted so concurrent transactions lock the counter rows in the same order
+    rows = [{"table_name": name, "version": 1} for name in sorted(tables)]
+    statement = insert(table).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.table_name],
+        set_={"version": table.c.version + 1},
+    )
+    connection.execute(statement)
+
+
+def _remember(session, table_name: Optional[str]) -> None:
+    if session is not None and table_name in TRACKED_TABLES:
+        session.info.setdefault(_PENDING_KEY, set()).add(table_name)
+
+
+def _on_row_change(mapper, connection, target) -> None:
+    _remember(object_session(target), mapper.local_table.name)
+
+
+def _on_orm_execute(orm_execute_state) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements skip the mapper events
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        _remember(state.session, getattr(state.statement.table, "name", None))
+
+
+def _before_commit(session) -> None:
+    # The commit's own flush runs after this hook: flush first so its writes
+    # are counted too
+    session.flush()
+    tables = session.info.pop(_PENDING_KEY, None)
+    if not tables:
+        return
+    try:
+        connection = session.connection()
+        if _has_versions_table(connection):
+            bump_table_versions(connection, tables)
+    except Exception as e:
+        logger.warning(
+            "Failed to bump table versions",
+            extra={"context": {"tables": sorted(tables), "error": str(e)}},
+        )
+
+
+def _after_soft_rollback(session, previous_transaction) -> None:
+    # A rolled back savepoint keeps the outer transaction's pending tables
+    if not session.in_transaction():
+        session.info.pop(_PENDING_KEY, None)
+
+
+def register_change_counters() -> None:
+    """Bump ``table_versions`` on commits that write tracked tables (idempotent)."""
+    for name in ("after_insert", "after_update", "after_delete"):
+        if not event.contains(Mapper, name, _on_row_change):
+            event.listen(Mapper, name, _on_row_change)
+    for name, listener in (
+        ("do_orm_execute", _on_orm_execute),
+        ("before_commit", _before_commit),
+        ("after_soft_rollback", _after_soft_rollback),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
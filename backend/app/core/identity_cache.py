@@ -0,0 +1,133 @@
+"""
+Identity cache for Flask-Login.
+
+``login_manager.user_loader`` runs on every authenticated request. Instead of
+opening a session and loading the ``User`` row each time, the loaders return
+an immutable ``UserSnapshot`` kept in a small per-process TTL cache, so most
+requests make no authentication queries at all.
+
+Invalidation:
+- UserService calls ``invalidate`` after updating, deactivating or deleting
+  a user
+- ORM inserts/updates/deletes of ``User`` invalidate the id on flush and again
+  after commit (covers code paths outside UserService)
+- everything else (raw SQL, other gunicorn workers) is bounded by the TTL
+
+IDENTITY_CACHE_TTL_SECONDS sets the TTL (default 60); 0 disables the cache.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.runtime import env_number
+from app.core.ttl_cache import TTLCache
+
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MAX_ENTRIES = 1024
+
+_PENDING_KEY = "identity_cache_pending"
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Read-only view of a ``User`` row with the Flask-Login interface."""
+
+    id: int
+    name: str
+    email: Optional[str]
+    avatar_url: Optional[str]
+    role: str
+    active_flag: bool
+    unified_flow_enabled: bool
+
+    @classmethod
+    def from_model(cls, user: Any) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            avatar_url=user.avatar_url,
+            role=user.role,
+            active_flag=bool(user.active_flag),
+            unified_flow_enabled=bool(user.unified_flow_enabled),
+        )
+
+    @property
+    def is_active(self) -> bool:
+        return self.active_flag
+
+    @property
+    def is_authenticated(self) -> bool:
+        return True
+
+    @property
+    def is_anonymous(self) -> bool:
+        return False
+
+    def get_id(self) -> str:
+        return str(self.id)
+
+
+# user id -> UserSnapshot
+identity_cache = TTLCache(
+    ttl_seconds=env_number("IDENTITY_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS, float),
+    max_entries=DEFAULT_MAX_ENTRIES,
+)
+
+
+def _load_snapshot(user_id: int) -> Optional[UserSnapshot]:
+    from app.db.base import User
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        return UserSnapshot.from_model(user) if user else None
+
+
+def load_user_snapshot(user_id: Any) -> Optional[UserSnapshot]:
+    """Flask-Login loader: cached snapshot for ``user_id`` or None."""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    # Missing users (None) are not cached
+    return identity_cache.get(user_id, lambda: _load_snapshot(user_id))
+
+
+def invalidate_user(user_id: Optional[int]) -> None:
+    if user_id is not None:
+        identity_cache.invalidate(int(user_id))
+
+
+# -- ORM invalidation ------------------------------------------------------
+
+
+def _on_user_change(mapper, connection, target) -> None:
+    user_id = getattr(target, "id", None)
+    invalidate_user(user_id)
+    session = object_session(target)
+    if session is not None and user_id is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+def _after_commit(session) -> None:
+    # A request may have reloaded the old row between flush and commit
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_user(user_id)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_invalidation_events(user_model) -> None:
+    """Invalidate cached snapshots when ``user_model`` rows change (idempotent)."""
+    for name in ("after_insert", "after_update", "after_delete"):
+        if not event.contains(user_model, name, _on_user_change):
+            event.listen(user_model, name, _on_user_change)
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,106 @@
+"""
+Startup import profile.
+
+Runs ``python -X importtime -c "from app import app"`` in a fresh interpreter
+(the same imports a gunicorn worker does before serving, ``create_app``
+included) and parses the report. ``python manage.py profile_startup`` prints the
+slowest modules and top-level packages; ``tests/unit/test_import_budget.py``
+fails when boot imports a module from ``LAZY_IMPORTS`` or goes over
+``STARTUP_IMPORT_BUDGET_MS``.
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from app.core.runtime import env_number
+
+# Imported on first use only; boot must not pull them in
+LAZY_IMPORTS = ("matplotlib", "numpy", "passlib")
+
+# Generous on purpose: catches a heavy import coming back, not jitter
+DEFAULT_BUDGET_MS = 3000
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Records from ``-X importtime`` stderr, in import completion order."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue  # Header line
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        records.append(
+            ImportRecord(name.strip(), self_us, cumulative_us, max(depth, 0))
+        )
+    return records
+
+
+def profile_imports(
+    statement: str = "from app import app", env: Optional[Mapping[str, str]] = None
+) -> List[ImportRecord]:
+    """Run ``statement`` in a child interpreter and return its import times."""
+    child_env = dict(os.environ if env is None else env)
+    child_env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (BACKEND_DIR, child_env.get("PYTHONPATH")) if p
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        env=child_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    records = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.splitlines()[-5:])
+        raise RuntimeError(f"{statement} failed:\n{tail}")
+    return records
+
+
+def total_ms(records: Iterable[ImportRecord]) -> float:
+    """Wall time of the profiled imports (sum of the top-level entries)."""
+    return sum(r.cumulative_us for r in records if r.depth == 0) / 1000
+
+
+def package_totals(records: Iterable[ImportRecord]) -> Dict[str, float]:
+    """Self time per top-level package in ms, slowest first."""
+    totals: Dict[str, float] = defaultdict(float)
+    for record in records:
+        totals[record.package] += record.self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def lazy_violations(
+    records: Iterable[ImportRecord], lazy: Iterable[str] = LAZY_IMPORTS
+) -> List[str]:
+    """Packages from ``lazy`` imported at boot."""
+    imported = {record.package for record in records}
+    return [name for name in lazy if name in imported]
+
+
+def budget_ms() -> float:
+    return env_number("STARTUP_IMPORT_BUDGET_MS", float(DEFAULT_BUDGET_MS), float)
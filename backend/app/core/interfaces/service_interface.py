@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ...domain.entities import InventoryItem
 
@@ -21,3 +21,17 @@ class InventoryServiceInterface:
 
     def change_quantity(self, item_id: int, delta: int) -> InventoryItem:
         raise NotImplementedError
+
+    def adjust_quantities(self, adjustments: Dict[int, int]) -> List[InventoryItem]:
+        raise NotImplementedError
+
+    def move_item(
+        self,
+        item_id: int,
+        previous_id: Optional[int] = None,
+        next_id: Optional[int] = None,
+    ) -> InventoryItem:
+        raise NotImplementedError
+
+    def rebalance_ranks(self, force: bool = False) -> int:
+        raise NotImplementedError
@@ -0,0 +1,498 @@
+"""
+Database-backed background job queue.
+
+Work that used to run in a thread per request (the extrato check on every
+``/historico`` and ``/extrato`` view) or inline in a request (JotForm client
+sync, backups) is enqueued as a row in ``jobs`` and run by a few worker
+threads per process:
+
+    job, created = enqueue("client_sync", dedupe_key="client_sync")
+
+- Single-flight: while a job with the same dedupe key is queued or running,
+  ``enqueue`` returns it instead of adding another (a unique index on
+  ``jobs.active_key`` settles races between threads, workers and replicas).
+  ``cooldown_seconds`` also reuses a job that succeeded that recently.
+- Claiming: ``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL, so workers
+  never wait on each other's rows; on SQLite a compare-and-swap ``UPDATE``
+  on the job's status.
+- Durable: queued jobs survive restarts. While a handler runs, its worker
+  refreshes the job's ``locked_at`` every third of JOB_LOCK_TIMEOUT_SECONDS
+  (default 900); a job left ``running`` by a dead process stops being
+  refreshed and is claimed again after that timeout.
+- Retries: a failing job runs up to ``max_attempts`` times (default 3) with
+  exponential backoff from JOB_RETRY_BASE_SECONDS (default 30). Raise
+  ``PermanentJobError`` to fail without retrying.
+- Handlers are registered with ``@job_handler("type")``, take the JSON
+  payload and return a JSON-serializable result (app.services.background_jobs).
+
+Worker threads only run in serving processes: gunicorn's post_worker_init
+hook (gunicorn.conf.py) calls ``start_job_workers``. Elsewhere (management
+commands, ``flask run``), with JOB_QUEUE_WORKERS=0 and always under TESTING,
+each job runs inline in ``enqueue``, and a retry once its backoff has passed
+in the next ``enqueue`` of the same key. JOB_QUEUE_WORKERS sets the worker
+threads per gunicorn worker (default 2) and JOB_POLL_SECONDS their idle poll
+interval (default 2); ``enqueue`` wakes the local workers immediately.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.runtime import as_utc, env_number, utcnow
+from app.db.base import Job
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+STATUSES = (QUEUED, RUNNING, SUCCEEDED, FAILED)
+
+DEFAULT_WORKERS = 2
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_SECONDS = 30.0
+DEFAULT_LOCK_TIMEOUT_SECONDS = 900.0
+
+_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+_workers: Optional["JobWorkers"] = None
+_workers_lock = threading.Lock()
+
+
+class PermanentJobError(Exception):
+    """Fail the job now; retrying would not help."""
+
+
+def job_handler(job_type: str):
+    """Register the function that runs jobs of ``job_type``."""
+
+    def decorator(func: Callable[[Dict[str, Any]], Any]):
+        _handlers[job_type] = func
+        return func
+
+    return decorator
+
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value is not None else None
+
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "dedupe_key": job.dedupe_key,
+        "status": job.status,
+        "payload": job.payload,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "last_error": job.last_error,
+        "result": job.result,
+        "run_after": iso(job.run_after),
+        "created_at": iso(job.created_at),
+        "started_at": iso(job.started_at),
+        "finished_at": iso(job.finished_at),
+    }
+
+
+def _default_dedupe_key(job_type: str, payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    return f"{job_type}:{digest}"
+
+
+def _reusable(job: Optional[Job], cooldown_seconds: float, now: datetime) -> bool:
+    if job is None:
+        return False
+    if job.status in (QUEUED, RUNNING):
+        return True
+    finished_at = as_utc(job.finished_at)
+    return (
+        job.status == SUCCEEDED
+        and cooldown_seconds > 0
+        and finished_at is not None
+        and finished_at >= now - timedelta(seconds=cooldown_seconds)
+    )
+
+
+def enqueue(
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    dedupe_key: Optional[str] = None,
+    max_attempts: Optional[int] = None,
+    cooldown_seconds: float = 0,
+) -> Tuple[Dict[str, Any], bool]:
+    """Queue a job unless an equivalent one is active; ``(job, created)``.
+
+    ``dedupe_key`` defaults to the job type plus a hash of the payload.
+    """
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+    payload = payload or {}
+    key = dedupe_key or _default_dedupe_key(job_type, payload)
+    now = utcnow()
+
+    with SessionLocal() as db:
+        latest_stmt = (
+            select(Job).where(Job.dedupe_key == key).order_by(Job.id.desc()).limit(1)
+        )
+        latest = db.execute(latest_stmt).scalar_one_or_none()
+        if _reusable(latest, cooldown_seconds, now):
+            return _run_due_inline(job_to_dict(latest)), False
+
+        job = Job(
+            job_type=job_type,
+            dedupe_key=key,
+            active_key=key,
+            payload=payload,
+            status=QUEUED,
+            attempts=0,
+            max_attempts=max_attempts
+            or env_number("JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS, int),
+            run_after=now,
+            created_at=now,
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another thread or process queued the same key first
+            db.rollback()
+            active = db.execute(
+                select(Job).where(Job.active_key == key)
+            ).scalar_one_or_none()
+            if active is None:
+                raise
+            return job_to_dict(active), False
+        job_id = job.id
+        queued = job_to_dict(job)
+
+    logger.info(
+        "Job queued",
+        extra={"context": {"job_id": job_id, "job_type": job_type, "key": key}},
+    )
+    workers = _workers
+    if workers is not None:
+        workers.notify()
+        return queued, True
+    # No worker threads in this process: run it now
+    run_next(worker_id=f"inline:{os.getpid()}", job_id=job_id)
+    return get_job(job_id) or queued, True
+
+
+def _run_due_inline(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a reused active job now when no worker thread will.
+
+    Without workers nothing polls the queue: a retry past its backoff, or a
+    job left running by a dead process, runs on the next ``enqueue``.
+    """
+    if _workers is not None or job["status"] not in (QUEUED, RUNNING):
+        return job
+    if not run_next(worker_id=f"inline:{os.getpid()}", job_id=job["id"]):
+        return job
+    return get_job(job["id"]) or job
+
+
+def _lock_timeout_seconds() -> float:
+    return env_number("JOB_LOCK_TIMEOUT_SECONDS", DEFAULT_LOCK_TIMEOUT_SECONDS, float)
+
+
+def _claim(db, worker_id: str, job_id: Optional[int] = None) -> Optional[Job]:
+    now = utcnow()
+    stale_before = now - timedelta(seconds=_lock_timeout_seconds())
+    ready = or_(
+        and_(Job.status == QUEUED, Job.run_after <= now),
+        and_(Job.status == RUNNING, Job.locked_at < stale_before),
+    )
+    stmt = select(Job).where(ready)
+    if job_id is not None:
+        stmt = stmt.where(Job.id == job_id)
+    stmt = stmt.order_by(Job.run_after, Job.id).limit(1)
+    claim = {
+        "status": RUNNING,
+        "locked_by": worker_id,
+        "locked_at": now,
+        "started_at": now,
+    }
+
+    if db.get_bind().dialect.name == "postgresql":
+        job = db.execute(stmt.with_for_update(skip_locked=True)).scalar_one_or_none()
+        if job is None:
+            db.rollback()
+            return None
+        for name, value in claim.items():
+            setattr(job, name, value)
+        job.attempts += 1
+        db.commit()
+        return job
+
+    # SQLite has no row locks: claim with a compare-and-swap on the status
+    for _ in range(3):
+        job = db.execute(stmt).scalar_one_or_none()
+        if job is None:
+            return None
+        swapped = db.execute(
+            update(Job)
+            .where(
+                Job.id == job.id,
+                Job.status == job.status,
+                Job.attempts == job.attempts,
+            )
+            .values(attempts=Job.attempts + 1, **claim)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if swapped.rowcount == 1:
+            db.refresh(job)
+            return job
+    return None
+
+
+def _finish(job_id: int, worker_id: str, values: Dict[str, Any]) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id)
+            .values(locked_by=None, locked_at=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def _heartbeat(
+    job_id: int, worker_id: str, interval: float, stop: threading.Event
+) -> None:
+    """Keep a running job's lock fresh until ``stop`` is set."""
+    while not stop.wait(interval):
+        try:
+            with SessionLocal() as db:
+                db.execute(
+                    update(Job)
+                    .where(
+                        Job.id == job_id,
+                        Job.locked_by == worker_id,
+                        Job.status == RUNNING,
+                    )
+                    .values(locked_at=utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+        except Exception as e:
+            logger.warning(
+                "Job heartbeat failed",
+                extra={"context": {"job_id": job_id, "error": str(e)}},
+            )
+
+
+def run_next(worker_id: str, job_id: Optional[int] = None) -> bool:
+    """Claim and run one ready job (``job_id`` only); False when none."""
+    with SessionLocal() as db:
+        job = _claim(db, worker_id, job_id)
+        if job is None:
+            return False
+        job_id, job_type = job.id, job.job_type
+        payload = dict(job.payload or {})
+        attempts, max_attempts = job.attempts, job.max_attempts
+
+    context = {"job_id": job_id, "job_type": job_type, "attempt": attempts}
+    if attempts > max_attempts:
+        # Reclaimed after its last attempt's worker died
+        _finish(
+            job_id,
+            worker_id,
+            {
+                "status": FAILED,
+                "active_key": None,
+                "last_error": "Abandoned: worker stopped while running it",
+                "finished_at": utcnow(),
+            },
+        )
+        logger.warning("Job abandoned", extra={"context": context})
+        return True
+
+    started = time.perf_counter()
+    try:
+        handler = _handlers.get(job_type)
+        if handler is None:
+            raise PermanentJobError(f"No handler for job type {job_type}")
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=_heartbeat,
+            args=(job_id, worker_id, _lock_timeout_seconds() / 3, stop_heartbeat),
+            name=f"job-heartbeat-{job_id}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            result = handler(payload)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"[:500]
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        retry = attempts < max_attempts and not isinstance(e, PermanentJobError)
+        if retry:
+            base = env_number(
+                "JOB_RETRY_BASE_SECONDS", DEFAULT_RETRY_BASE_SECONDS, float
+            )
+            delay = base * 2 ** (attempts - 1)
+            _finish(
+                job_id,
+                worker_id,
+                {
+                    "status": QUEUED,
+                    "last_error": error,
+                    "run_after": utcnow() + timedelta(seconds=delay),
+                },
+            )
+        else:
+            _finish(
+                job_id,
+                worker_id,
+                {
+                    "status": FAILED,
+                    "active_key": None,
+                    "last_error": error,
+                    "finished_at": utcnow(),
+                },
+            )
+        logger.warning(
+            "Job failed - retrying" if retry else "Job failed",
+            extra={"context": {**context, "error": error, "duration_ms": duration_ms}},
+            exc_info=True,
+        )
+        return True
+
+    _finish(
+        job_id,
+        worker_id,
+        {
+            "status": SUCCEEDED,
+            "active_key": None,
+            "result": result,
+            "last_error": None,
+            "finished_at": utcnow(),
+        },
+    )
+    logger.info(
+        "Job succeeded",
+        extra={
+            "context": {
+                **context,
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+            }
+        },
+    )
+    return True
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        return job_to_dict(job) if job is not None else None
+
+
+def recent_jobs(
+    limit: int = 50, status: Optional[str] = None, job_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    stmt = select(Job).order_by(Job.id.desc()).limit(limit)
+    if status:
+        stmt = stmt.where(Job.status == status)
+    if job_type:
+        stmt = stmt.where(Job.job_type == job_type)
+    with SessionLocal() as db:
+        return [job_to_dict(job) for job in db.execute(stmt).scalars()]
+
+
+def job_counts() -> Dict[str, Dict[str, int]]:
+    """``{job_type: {status: count}}`` over the whole table."""
+    stmt = select(Job.job_type, Job.status, func.count()).group_by(
+        Job.job_type, Job.status
+    )
+    counts: Dict[str, Dict[str, int]] = {}
+    with SessionLocal() as db:
+        for job_type, status, count in db.execute(stmt):
+            counts.setdefault(job_type, dict.fromkeys(STATUSES, 0))[status] = count
+    return counts
+
+
+class JobWorkers:
+    """Fixed set of daemon threads polling the queue."""
+
+    def __init__(self, app, workers: int, poll_seconds: float):
+        self.app = app
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run,
+                args=(f"{prefix}:{index}",),
+                name=f"job-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    ran = run_next(worker_id)
+            except Exception as e:
+                logger.error(
+                    "Job worker error",
+                    extra={"context": {"worker": worker_id, "error": str(e)}},
+                    exc_info=True,
+                )
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+
+def start_job_workers(app) -> Optional[JobWorkers]:
+    """Start this process's workers (none under TESTING or with 0 workers)."""
+    global _workers
+    workers = env_number("JOB_QUEUE_WORKERS", DEFAULT_WORKERS, int)
+    if app.config.get("TESTING") or workers <= 0:
+        logger.info("Job queue workers disabled - jobs run inline")
+        return None
+    with _workers_lock:
+        if _workers is None:
+            _workers = JobWorkers(
+                app,
+                workers,
+                env_number("JOB_POLL_SECONDS", DEFAULT_POLL_SECONDS, float),
+            )
+            _workers.start()
+            logger.info(
+                "Job queue workers started",
+                extra={"context": {"workers": workers, "pid": os.getpid()}},
+            )
+    return _workers
@@ -8,6 +8,9 @@ This module provides structured logging with:
 - Request/response logging
 - Log rotation
 - Performance metrics
+- Non-blocking output: records are queued and written by a background
+  QueueListener thread, so request threads never wait on disk I/O
+- Sampling of routine request logs and per-logger rate limits
 
 Usage:
     from app.core.logging_config import setup_logging, get_logger
@@ -20,21 +23,28 @@ Usage:
     logger.info("Operation completed", extra={"context": {"user_id": 123}})
 """
 
+import atexit
+import copy
 import json
 import logging
 import logging.handlers
 import os
+import queue
+import random
 import sys
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from flask import Flask, g, request
 from flask_login import current_user
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
+from app.core.runtime import env_number
+
 
 class JSONFormatter(logging.Formatter):
     """
@@ -53,9 +63,12 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add exception info if present
+        # Add exception info if present (exc_text when pre-formatted by the
+        # queue handler)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
 
         # Add context from extra parameter
         if hasattr(record, "context"):
@@ -79,11 +92,205 @@ class ConsoleFormatter(logging.Formatter):
     RESET = "\033[0m"
 
     def format(self, record: logging.LogRecord) -> str:
+        # Color a copy: the same record is also handed to the JSON file handlers
+        record = copy.copy(record)
         color = self.COLORS.get(record.levelname, self.RESET)
         record.levelname = f"{color}{record.levelname:8}{self.RESET}"
         return super().format(record)
 
 
+# Logging pipeline counters (see get_logging_stats)
+_STATS_LOCK = threading.Lock()
+_LOGGING_STATS: Dict[str, Any] = {
+    "mode": "sync",
+    "enqueued": 0,
+    "dropped": 0,
+    "rate_limited": 0,
+    "requests_sampled_out": 0,
+    "enqueue_time_ms": 0.0,
+    "handled": 0,
+    "handle_time_ms": 0.0,
+}
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _count(key: str, amount: Union[int, float] = 1) -> None:
+    with _STATS_LOCK:
+        _LOGGING_STATS[key] += amount
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """
+    Return logging pipeline counters and the measured overhead.
+
+    - enqueue_avg_us: time a logging call costs the calling (request) thread
+    - handle_avg_us: time the listener thread spends formatting and writing
+    - dropped: records discarded because the queue was full
+    - rate_limited / requests_sampled_out: records suppressed on purpose
+    """
+    with _STATS_LOCK:
+        stats = dict(_LOGGING_STATS)
+    stats["enqueue_avg_us"] = (
+        round(stats["enqueue_time_ms"] * 1000 / stats["enqueued"], 2)
+        if stats["enqueued"]
+        else 0.0
+    )
+    stats["handle_avg_us"] = (
+        round(stats["handle_time_ms"] * 1000 / stats["handled"], 2)
+        if stats["handled"]
+        else 0.0
+    )
+    stats["queue_size"] = (
+        _queue_listener.queue.qsize() if _queue_listener is not None else 0
+    )
+    return stats
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    When the bounded queue is full the record is dropped and counted instead
+    of waiting for the listener. The time spent on the calling thread is
+    accumulated in the logging stats.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        start = time.perf_counter()
+        try:
+            self.enqueue(self.prepare(record))
+        except queue.Full:
+            _count("dropped")
+            return
+        except Exception:
+            self.handleError(record)
+            return
+        with _STATS_LOCK:
+            _LOGGING_STATS["enqueued"] += 1
+            _LOGGING_STATS["enqueue_time_ms"] += (time.perf_counter() - start) * 1000
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.put_nowait(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve message args and traceback now (they may not be picklable or
+        # may change later) but keep the record structured for JSONFormatter,
+        # unlike the stdlib default that formats the whole line here.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _TimedQueueListener(logging.handlers.QueueListener):
+    """QueueListener that measures time spent in the output handlers."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        start = time.perf_counter()
+        super().handle(record)
+        with _STATS_LOCK:
+            _LOGGING_STATS["handled"] += 1
+            _LOGGING_STATS["handle_time_ms"] += (time.perf_counter() - start) * 1000
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-logger token bucket for records below WARNING.
+
+    Args:
+        limits: Mapping of logger name (or dotted prefix) to records per second
+        default_rate: Records per second for loggers without an entry (0 = off)
+        burst_seconds: Bucket capacity expressed in seconds of the rate
+
+    The same filter may be attached to several handlers; the decision is cached
+    on the record so each record consumes a token only once.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, float]] = None,
+        default_rate: float = 0.0,
+        burst_seconds: float = 2.0,
+    ):
+        super().__init__()
+        self.limits = dict(limits or {})
+        self.default_rate = default_rate
+        self.burst_seconds = burst_seconds
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> float:
+        candidate = name
+        while candidate:
+            if candidate in self.limits:
+                return self.limits[candidate]
+            candidate = candidate.rpartition(".")[0]
+        return self.default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        cached = getattr(record, "_rate_limit_allowed", None)
+        if cached is not None:
+            return cached
+        allowed = self._allow(record)
+        record._rate_limit_allowed = allowed
+        if not allowed:
+            _count("rate_limited")
+        return allowed
+
+    def _allow(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate <= 0:
+            return True
+        capacity = max(rate * self.burst_seconds, 1.0)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(record.name, [capacity, now])
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens < 1.0:
+                self._buckets[record.name] = [tokens, now]
+                return False
+            self._buckets[record.name] = [tokens - 1.0, now]
+            return True
+
+
+def parse_rate_limits(value: Optional[str]) -> Dict[str, float]:
+    """Parse ``LOG_RATE_LIMITS`` ("logger=rate,other.logger=rate")."""
+    limits: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        name, _, rate = item.partition("=")
+        try:
+            limits[name.strip()] = float(rate)
+        except ValueError:
+            continue
+    return limits
+
+
+def _async_logging_enabled() -> bool:
+    # Off by default under TESTING: tests read handler output synchronously
+    testing = os.getenv("TESTING", "").lower() in ("1", "true", "yes")
+    return os.getenv("LOG_ASYNC", "0" if testing else "1") == "1"
+
+
+def _stop_queue_listener() -> None:
+    global _queue_listener
+    if _queue_listener is not None:
+        try:
+            _queue_listener.stop()
+        except Exception:
+            pass
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def setup_logging(
     app: Optional[Flask] = None,
     log_level: Union[int, str] = "INFO",
@@ -130,6 +337,7 @@ def setup_logging(
     root_logger.setLevel(level)
 
     # Close and remove existing handlers properly
+    _stop_queue_listener()
     for handler in root_logger.handlers[:]:
         handler.close()
         root_logger.removeHandler(handler)
@@ -208,6 +416,40 @@ def setup_logging(
                 )
             )
 
+    # Keep recent alerts in memory for the admin alerts dashboard
+    from app.services.alert_dashboard_service import AlertBufferHandler
+
+    root_logger.addHandler(AlertBufferHandler())
+
+    # Per-logger rate limits (LOG_RATE_LIMITS="app.services.x=5,flask.request=50")
+    rate_limit_filter = RateLimitFilter(
+        limits=parse_rate_limits(os.getenv("LOG_RATE_LIMITS")),
+        default_rate=env_number("LOG_RATE_LIMIT_DEFAULT", 0.0, float),
+    )
+
+    # Move the output handlers behind a queue so callers only pay for an
+    # enqueue; a background listener thread formats and writes the records.
+    output_handlers = root_logger.handlers[:]
+    if _async_logging_enabled():
+        global _queue_listener
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(
+            maxsize=int(env_number("LOG_QUEUE_SIZE", 10000, float))
+        )
+        for handler in output_handlers:
+            root_logger.removeHandler(handler)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        queue_handler.addFilter(rate_limit_filter)
+        root_logger.addHandler(queue_handler)
+        _queue_listener = _TimedQueueListener(
+            log_queue, *output_handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
+        _LOGGING_STATS["mode"] = "async"
+    else:
+        for handler in output_handlers:
+            handler.addFilter(rate_limit_filter)
+        _LOGGING_STATS["mode"] = "sync"
+
     # Configure SQLAlchemy logging
     if enable_sql_echo:
         sql_logger = logging.getLogger("sqlalchemy.engine")
@@ -254,6 +496,12 @@ def setup_logging(
             if current_user.is_authenticated:
                 g.user_id = getattr(current_user, "id", None)
 
+            # Routine requests are logged at LOG_REQUEST_SAMPLE_RATE; errors
+            # and slow responses are always logged (see log_response)
+            g.request_log_sampled = _sample_request_log()
+            if not g.request_log_sampled:
+                return
+
             req_logger = logging.getLogger("flask.request")
             req_logger.info(
                 f"{request.method} {request.path}",
@@ -274,6 +522,13 @@ def setup_logging(
         def log_response(response):
             if hasattr(g, "request_start_time"):
                 duration_ms = (time.time() - g.request_start_time) * 1000
+                if not (
+                    g.get("request_log_sampled", True)
+                    or response.status_code >= 400
+                    or duration_ms >= env_number("LOG_SLOW_REQUEST_MS", 1000.0, float)
+                ):
+                    _count("requests_sampled_out")
+                    return response
                 resp_logger = logging.getLogger("flask.response")
                 resp_logger.info(
                     f"{request.method} {request.path} {response.status_code} in {duration_ms:.2f}ms",
@@ -303,6 +558,11 @@ def setup_logging(
     )
 
 
+def _sample_request_log() -> bool:
+    rate = env_number("LOG_REQUEST_SAMPLE_RATE", 1.0, float)
+    return rate >= 1.0 or random.random() < rate
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for the specified module.
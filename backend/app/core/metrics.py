@@ -0,0 +1,206 @@
+"""
+Prometheus metrics shared by the application.
+
+Request latency per route/status is recorded by prometheus_flask_exporter (see
+main.create_app); this module holds the application-level metrics:
+
+- DB query duration histogram (per statement type)
+- Connection pool checked-out / overflow gauges
+- Extrato job duration histogram and outcome counter
+- Outbound HTTP latency for the JotForm and Google integrations
+
+Multiprocess mode: when PROMETHEUS_MULTIPROC_DIR is set before the app is
+imported (gunicorn.conf.py does this), prometheus_client writes samples to that
+directory and /metrics aggregates all gunicorn workers. Gauges therefore
+declare a multiprocess_mode.
+"""
+
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Buckets tuned for this app: most queries are sub-10ms, extratos take seconds
+DB_QUERY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+HTTP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_STATEMENT_TYPES = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+def is_multiprocess_mode() -> bool:
+    """Return True when metrics are aggregated across gunicorn workers."""
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def _get_or_create(metric_cls, name: str, documentation: str, **kwargs):
+    """Create a metric, reusing an already registered one with the same name.
+
+    Tests re-import modules and create several apps per process; registering
+    the same name twice would raise "Duplicated timeseries".
+    """
+    existing = getattr(REGISTRY, "_names_to_collectors", {}).get(name)
+    if existing is not None:
+        return existing
+    return metric_cls(name, documentation, **kwargs)
+
+
+DB_QUERY_DURATION = _get_or_create(
+    Histogram,
+    "db_query_duration_seconds",
+    "Database query duration in seconds",
+    labelnames=("operation",),
+    buckets=DB_QUERY_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = _get_or_create(
+    Gauge,
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = _get_or_create(
+    Gauge,
+    "db_pool_overflow_connections",
+    "Connections open beyond pool_size (overflow)",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = _get_or_create(
+    Gauge,
+    "db_pool_size",
+    "Configured SQLAlchemy pool size",
+    multiprocess_mode="livemax",
+)
+EXTRATO_JOB_DURATION = _get_or_create(
+    Histogram,
+    "extrato_job_duration_seconds",
+    "Extrato generation duration in seconds",
+    labelnames=("outcome",),
+    buckets=JOB_BUCKETS,
+)
+EXTRATO_JOBS = _get_or_create(
+    Counter,
+    "extrato_jobs",
+    "Extrato generation runs by outcome",
+    labelnames=("outcome",),
+)
+OUTBOUND_HTTP_DURATION = _get_or_create(
+    Histogram,
+    "outbound_http_request_duration_seconds",
+    "Latency of HTTP calls to external services",
+    labelnames=("service", "method", "status"),
+    buckets=HTTP_BUCKETS,
+)
+
+
+def statement_operation(statement: str) -> str:
+    """Return the statement type label (SELECT/INSERT/UPDATE/DELETE/OTHER)."""
+    keyword = (statement or "").lstrip().split(None, 1)
+    operation = keyword[0].upper() if keyword else ""
+    return operation if operation in _STATEMENT_TYPES else "OTHER"
+
+
+def observe_db_query(statement: str, duration_seconds: float) -> None:
+    """Record one query duration; never raises."""
+    try:
+        DB_QUERY_DURATION.labels(operation=statement_operation(statement)).observe(
+            duration_seconds
+        )
+    except Exception:
+        pass
+
+
+def register_pool_metrics(engine: Engine) -> None:
+    """Keep pool gauges current from checkout/checkin events."""
+    if getattr(engine, "_pool_metrics_registered", False):
+        return
+
+    pool = engine.pool
+    try:
+        DB_POOL_SIZE.set(pool.size())
+    except Exception:
+        # StaticPool/NullPool (SQLite, tests) have no fixed size
+        pass
+
+    def _update(returning: int = 0) -> None:
+        try:
+            DB_POOL_CHECKED_OUT.set(pool.checkedout() - returning)
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+        except Exception:
+            # Only QueuePool keeps these counters (StaticPool/NullPool do not)
+            pass
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _update()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        # Checkin fires before the connection is back in the pool
+        _update(returning=1)
+
+    setattr(engine, "_pool_metrics_registered", True)
+
+
+def track_extrato_job(func: Callable[..., bool]) -> Callable[..., bool]:
+    """Decorator recording duration and outcome of an extrato generation run.
+
+    Outcome is ``success`` for a truthy return, ``failure`` for a falsy one and
+    ``error`` when the function raises.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = func(*args, **kwargs)
+            outcome = "success" if result else "failure"
+            return result
+        finally:
+            try:
+                EXTRATO_JOB_DURATION.labels(outcome=outcome).observe(
+                    time.perf_counter() - start
+                )
+                EXTRATO_JOBS.labels(outcome=outcome).inc()
+            except Exception:
+                pass
+
+    return wrapper
+
+
+class _OutboundCall:
+    status: Optional[int] = None
+
+
+@contextmanager
+def outbound_timer(service: str, method: str) -> Iterator[_OutboundCall]:
+    """Time one outbound HTTP call.
+
+    Usage::
+
+        with outbound_timer("jotform", "GET") as call:
+            response = requests.get(url, timeout=10)
+            call.status = response.status_code
+
+    Calls that raise are recorded with status ``error``.
+    """
+    call = _OutboundCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        status = str(call.status) if call.status is not None else "error"
+        try:
+            OUTBOUND_HTTP_DURATION.labels(
+                service=service, method=method.upper(), status=status
+            ).observe(time.perf_counter() - start)
+        except Exception:
+            pass
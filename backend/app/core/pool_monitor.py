@@ -0,0 +1,423 @@
+"""
+Connection pool instrumentation from SQLAlchemy pool events.
+
+``pool.status()`` only tells how many connections are out right now. This
+module listens to the pool's ``checkout``, ``checkin``, ``connect``, ``close``,
+``invalidate`` and ``reset`` events and keeps a rolling window
+(POOL_MONITOR_WINDOW_SECONDS, default 300) of:
+
+- checkout wait: time to get a connection from the pool. This includes
+  waiting for a free one, opening a new one and the pre-ping. It is timed
+  around ``Engine.raw_connection`` because no pool event fires before the
+  wait starts.
+- hold time: checkout to checkin, per code location (the first frame in
+  ``app/`` that asked for the connection), including the longest hold in the
+  window and the connection checked out the longest right now.
+- churn: connections opened and closed (overflow connections are closed on
+  checkin), invalidations and resets.
+
+Utilization is checked-out connections over ``pool_size``, so overflow use
+goes above 100%. It logs a warning when utilization stays at or above
+POOL_ALERT_UTILIZATION_PERCENT (80) for POOL_ALERT_SUSTAINED_SECONDS (60),
+and logs again when it recovers. ``/pool-metrics`` serves ``snapshot()``
+for the engine, with the code locations for admins only. Everything is per
+process, like the pool itself.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.runtime import env_number
+
+logger = logging.getLogger(__name__)
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+HOLD_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000, 120000)
+EVENTS = ("checkout", "checkin", "connect", "close", "invalidate", "reset")
+
+DEFAULT_WINDOW_SECONDS = 300
+DEFAULT_ALERT_UTILIZATION_PERCENT = 80.0
+DEFAULT_ALERT_SUSTAINED_SECONDS = 60.0
+# The window is kept as this many slots; older slots drop off as a whole
+WINDOW_SLOTS = 30
+TOP_LOCATIONS = 5
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_BACKEND_DIR = os.path.dirname(_APP_DIR)
+# Frames in these files are plumbing, not the code holding the connection
+_SKIP_FILES = {
+    os.path.abspath(__file__),
+    os.path.join(_APP_DIR, "db", "session.py"),
+    os.path.join(_APP_DIR, "core", "db.py"),
+}
+_RECORD_KEY = "pool_monitor_checkout"
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def caller_location() -> str:
+    """``path:line in function`` of the innermost app frame on the stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _SKIP_FILES:
+            path = os.path.relpath(filename, _BACKEND_DIR)
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self, buckets: Tuple[int, ...]):
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, buckets: Tuple[int, ...], value_ms: float) -> None:
+        self.counts[bisect_left(buckets, value_ms)] += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+
+class _Slot:
+    __slots__ = ("index", "wait", "hold", "events", "locations", "longest")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.wait = _Histogram(WAIT_BUCKETS_MS)
+        self.hold = _Histogram(HOLD_BUCKETS_MS)
+        self.events = dict.fromkeys(EVENTS, 0)
+        # location -> [count, total_ms, max_ms]
+        self.locations: Dict[str, List[float]] = {}
+        # (hold_ms, location, checked in at)
+        self.longest: Optional[Tuple[float, str, float]] = None
+
+
+def _summary(buckets: Tuple[int, ...], histograms: List[_Histogram]) -> Dict[str, Any]:
+    counts = [sum(h.counts[i] for h in histograms) for i in range(len(buckets) + 1)]
+    count = sum(counts)
+    maximum = max((h.max for h in histograms), default=0.0)
+
+    def percentile(fraction: float) -> Optional[float]:
+        # Upper bound of the bucket holding the percentile
+        if not count:
+            return None
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= fraction * count:
+                return float(buckets[index]) if index < len(buckets) else maximum
+        return maximum
+
+    labels = [f"le_{b}" for b in buckets] + ["inf"]
+    return {
+        "count": count,
+        "avg_ms": (
+            round(sum(h.total for h in histograms) / count, 2) if count else None
+        ),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(maximum, 2),
+        "buckets": dict(zip(labels, counts)),
+    }
+
+
+class PoolMonitor:
+    """Rolling pool statistics for one engine; see the module docstring."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        alert_utilization_percent: float = DEFAULT_ALERT_UTILIZATION_PERCENT,
+        alert_sustained_seconds: float = DEFAULT_ALERT_SUSTAINED_SECONDS,
+        clock=time.time,
+    ):
+        self.engine = engine
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / WINDOW_SLOTS
+        self.alert_utilization_percent = alert_utilization_percent
+        self.alert_sustained_seconds = alert_sustained_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slots: Deque[_Slot] = deque()
+        # id(connection_record) -> (checked out at, location)
+        self._checked_out: Dict[int, Tuple[float, str]] = {}
+        self._high_since: Optional[float] = None
+        self._alerting = False
+
+    # -- recording -------------------------------------------------------
+
+    def _slot(self, now: float) -> _Slot:
+        index = int(now // self.slot_seconds)
+        if not self._slots or self._slots[-1].index != index:
+            self._slots.append(_Slot(index))
+        while self._slots[0].index <= index - WINDOW_SLOTS:
+            self._slots.popleft()
+        return self._slots[-1]
+
+    def record_event(self, name: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._slot(now).events[name] += 1
+
+    def record_wait(self, wait_ms: float) -> None:
+        now = self._clock()
+        with self._lock:
+            self._slot(now).wait.observe(WAIT_BUCKETS_MS, wait_ms)
+
+    def record_checkout(self, connection_record: Any, location: str) -> None:
+        now = self._clock()
+        connection_record.info[_RECORD_KEY] = (now, location)
+        with self._lock:
+            self._checked_out[id(connection_record)] = (now, location)
+            self._slot(now).events["checkout"] += 1
+        self._check_utilization(now)
+
+    def record_checkin(self, connection_record: Any, returning: int = 1) -> None:
+        now = self._clock()
+        checkout = connection_record.info.pop(_RECORD_KEY, None)
+        with self._lock:
+            self._checked_out.pop(id(connection_record), None)
+            slot = self._slot(now)
+            slot.events["checkin"] += 1
+            if checkout is not None:
+                started, location = checkout
+                hold_ms = (now - started) * 1000
+                slot.hold.observe(HOLD_BUCKETS_MS, hold_ms)
+                stats = slot.locations.setdefault(location, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += hold_ms
+                stats[2] = max(stats[2], hold_ms)
+                if slot.longest is None or hold_ms > slot.longest[0]:
+                    slot.longest = (hold_ms, location, now)
+        self._check_utilization(now, returning=returning)
+
+    # -- utilization and alerts -----------------------------------------
+
+    def pool_state(self, returning: int = 0) -> Dict[str, Any]:
+        """Counters of the engine's pool (QueuePool; others report less)."""
+        pool = self.engine.pool
+        state: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        for key, method in (
+            ("pool_size", "size"),
+            ("connections_in_pool", "checkedin"),
+            ("checked_out", "checkedout"),
+            ("overflow", "overflow"),
+        ):
+            try:
+                state[key] = getattr(pool, method)()
+            except Exception:
+                # StaticPool/NullPool (SQLite, tests) keep no such counters
+                continue
+        if "checked_out" in state:
+            # Checkin fires before the connection is back in the pool
+            state["checked_out"] -= returning
+        max_overflow = getattr(pool, "_max_overflow", None)
+        if isinstance(max_overflow, int):
+            state["max_overflow"] = max_overflow
+        if state.get("pool_size") and "checked_out" in state:
+            state["utilization_percent"] = round(
+                state["checked_out"] / state["pool_size"] * 100, 2
+            )
+        return state
+
+    def _check_utilization(self, now: float, returning: int = 0) -> None:
+        utilization = self.pool_state(returning).get("utilization_percent")
+        if utilization is None:
+            return
+        with self._lock:
+            if utilization < self.alert_utilization_percent:
+                recovered = self._alerting
+                self._high_since, self._alerting = None, False
+                fire = False
+            else:
+                recovered = False
+                if self._high_since is None:
+                    self._high_since = now
+                fire = not self._alerting and (
+                    now - self._high_since >= self.alert_sustained_seconds
+                )
+                if fire:
+                    self._alerting = True
+            high_since = self._high_since
+        if fire:
+            logger.warning(
+                "Connection pool utilization high",
+                extra={
+                    "context": {
+                        "utilization_percent": utilization,
+                        "threshold_percent": self.alert_utilization_percent,
+                        "high_for_seconds": round(now - high_since, 1),
+                        "longest_held": self._oldest_checkout(now),
+                    }
+                },
+            )
+        elif recovered:
+            logger.info(
+                "Connection pool utilization back to normal",
+                extra={"context": {"utilization_percent": utilization}},
+            )
+
+    def _oldest_checkout(self, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._checked_out:
+                return None
+            started, location = min(self._checked_out.values())
+        return {"location": location, "held_ms": round((now - started) * 1000, 2)}
+
+    # -- reporting -------------------------------------------------------
+
+    def snapshot(self, include_locations: bool = True) -> Dict[str, Any]:
+        """Structured view of the window for ``/pool-metrics``.
+
+        ``include_locations=False`` leaves out the code locations (source
+        paths and function names) for callers that are not admins.
+        """
+        now = self._clock()
+        state = self.pool_state()
+        self._check_utilization(now)
+        with self._lock:
+            self._slot(now)
+            slots = list(self._slots)
+            high_since, alerting = self._high_since, self._alerting
+            checked_out_now = len(self._checked_out)
+        events = {name: sum(s.events[name] for s in slots) for name in EVENTS}
+        locations: Dict[str, List[float]] = {}
+        for slot in slots:
+            for location, (count, total, maximum) in slot.locations.items():
+                stats = locations.setdefault(location, [0, 0.0, 0.0])
+                stats[0] += count
+                stats[1] += total
+                stats[2] = max(stats[2], maximum)
+        longest = max((s.longest for s in slots if s.longest is not None), default=None)
+
+        hold = _summary(HOLD_BUCKETS_MS, [s.hold for s in slots])
+        hold["longest"] = (
+            {
+                "location": longest[1],
+                "held_ms": round(longest[0], 2),
+                "checked_in_at": _iso(longest[2]),
+            }
+            if longest is not None
+            else None
+        )
+        hold["top_locations"] = [
+            {
+                "location": location,
+                "count": int(count),
+                "total_ms": round(total, 2),
+                "max_ms": round(maximum, 2),
+            }
+            for location, (count, total, maximum) in sorted(
+                locations.items(), key=lambda item: item[1][2], reverse=True
+            )[:TOP_LOCATIONS]
+        ]
+
+        snapshot = {
+            "status": "alert" if alerting else "healthy",
+            **state,
+            "window_seconds": self.window_seconds,
+            "checkout_wait_ms": _summary(WAIT_BUCKETS_MS, [s.wait for s in slots]),
+            "hold_ms": hold,
+            "checked_out_now": {
+                "count": checked_out_now,
+                "oldest": self._oldest_checkout(now),
+            },
+            "events": events,
+            "churn": {
+                "opened": events["connect"],
+                "closed": events["close"],
+                "invalidated": events["invalidate"],
+            },
+            "alert": {
+                "active": alerting,
+                "threshold_percent": self.alert_utilization_percent,
+                "sustained_seconds": self.alert_sustained_seconds,
+                "high_since": _iso(high_since),
+            },
+        }
+        if not include_locations:
+            del hold["top_locations"]
+            for entry in (hold["longest"], snapshot["checked_out_now"]["oldest"]):
+                if entry is not None:
+                    del entry["location"]
+        return snapshot
+
+
+def register_pool_monitor(engine: Engine) -> PoolMonitor:
+    """Attach a ``PoolMonitor`` to ``engine`` (once) and return it."""
+    existing = getattr(engine, "_pool_monitor", None)
+    if existing is not None:
+        return existing
+
+    monitor = PoolMonitor(
+        engine,
+        window_seconds=env_number(
+            "POOL_MONITOR_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS, float
+        ),
+        alert_utilization_percent=env_number(
+            "POOL_ALERT_UTILIZATION_PERCENT", DEFAULT_ALERT_UTILIZATION_PERCENT, float
+        ),
+        alert_sustained_seconds=env_number(
+            "POOL_ALERT_SUSTAINED_SECONDS", DEFAULT_ALERT_SUSTAINED_SECONDS, float
+        ),
+    )
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        monitor.record_checkout(connection_record, caller_location())
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        monitor.record_checkin(connection_record)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        monitor.record_event("connect")
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        monitor.record_event("close")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        monitor.record_event("invalidate")
+
+    @event.listens_for(engine, "reset")
+    def _on_reset(dbapi_connection, connection_record, reset_state):
+        monitor.record_event("reset")
+
+    raw_connection = engine.raw_connection
+
+    def _timed_raw_connection():
+        start = time.perf_counter()
+        connection = raw_connection()
+        monitor.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    # Instance attribute: every Connection gets its DBAPI connection here
+    engine.raw_connection = _timed_raw_connection  # type: ignore[method-assign]
+    setattr(engine, "_pool_monitor", monitor)
+    return monitor
+
+
+def get_pool_monitor(engine: Engine) -> Optional[PoolMonitor]:
+    return getattr(engine, "_pool_monitor", None)
@@ -0,0 +1,128 @@
+"""
+Reference-data cache for slow-changing lookups (artists, ...).
+
+Lists like "all artists" are read on almost every page but change a few
+times a month. ``reference_cache.get(key, loader)`` keeps the loaded value
+per process for REFERENCE_CACHE_TTL_SECONDS (default 300; 0 disables).
+
+Invalidation:
+- explicit ``invalidate_reference(key)`` from the endpoints that change the
+  data (artist_controller CRUD)
+- SQLAlchemy events registered with ``invalidate_on_change``: the key is
+  dropped on flush and again after commit or rollback, so a list read inside
+  an uncommitted transaction never outlives it
+- the TTL bounds everything else (raw SQL, other gunicorn workers)
+
+Cached values are shared: callers receive shallow copies (see ``get``).
+"""
+
+import copy
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.runtime import env_number
+from app.core.ttl_cache import TTLCache
+
+DEFAULT_TTL_SECONDS = 300.0
+
+ARTISTS = "artists"
+
+_PENDING_KEY = "reference_cache_pending"
+
+
+class ReferenceCache(TTLCache):
+    """``key -> value`` per scope with a TTL and explicit invalidation."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(ttl_seconds=ttl_seconds, clock=clock)
+
+    def get(self, key: str, loader: Callable[[], Any], scope: Hashable = None) -> Any:
+        """Cached value for ``key``; lists are returned as copies of their items.
+
+        ``scope`` separates values of the same key loaded from different
+        databases (repositories pass their session's bind).
+        """
+        return _copied(super().get((key, scope), loader))
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop ``keys`` in every scope."""
+        self.invalidate_where(lambda entry_key: entry_key[0] in keys)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["keys"] = sorted({key for key, _ in self.keys()})
+        return stats
+
+
+def _copied(value: Any) -> Any:
+    if isinstance(value, list):
+        return [copy.copy(item) for item in value]
+    return value
+
+
+reference_cache = ReferenceCache(
+    ttl_seconds=env_number("REFERENCE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS, float)
+)
+
+
+def invalidate_reference(*keys: str) -> None:
+    reference_cache.invalidate(*keys)
+
+
+# -- ORM invalidation ------------------------------------------------------
+
+_watched: Dict[Any, list] = {}
+
+
+def _on_change(mapper, connection, target) -> None:
+    keys = [
+        key
+        for key, predicate in _watched.get(mapper.class_, ())
+        if predicate is None or predicate(target)
+    ]
+    if not keys:
+        return
+    reference_cache.invalidate(*keys)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).update(keys)
+
+
+def _on_session_end(session, *args) -> None:
+    keys = session.info.pop(_PENDING_KEY, None)
+    if keys:
+        reference_cache.invalidate(*keys)
+
+
+def invalidate_on_change(
+    model, key: str, predicate: Optional[Callable[[Any], bool]] = None
+) -> None:
+    """Drop ``key`` whenever a ``model`` row (matching ``predicate``) changes.
+
+    Idempotent: registering the same key twice has no effect.
+    """
+    watchers = _watched.setdefault(model, [])
+    if any(existing == key for existing, _ in watchers):
+        return
+    watchers.append((key, predicate))
+    for name in ("after_insert", "after_update", "after_delete"):
+        if not event.contains(model, name, _on_change):
+            event.listen(model, name, _on_change)
+    for name in ("after_commit", "after_soft_rollback"):
+        if not event.contains(Session, name, _on_session_end):
+            event.listen(Session, name, _on_session_end)
+
+
+def artist_row_changed(user) -> bool:
+    """True when a users row is, or was until this flush, an artist."""
+    if getattr(user, "role", None) == "artist":
+        return True
+    history = inspect(user).attrs.role.history
+    return "artist" in (history.deleted or ())
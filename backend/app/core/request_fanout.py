@@ -0,0 +1,190 @@
+"""
+Request fan-out - run a page handler's independent work in parallel.
+
+Page handlers often chain unrelated I/O (monthly totals, the client list from
+JotForm, the artist list, a Google Calendar fetch). Submitted to a
+``FanOut``, they run on a shared thread pool so the page waits for the
+slowest part instead of the sum of all parts:
+
+    fanout = FanOut(session_factory=SessionLocal)
+    totals = fanout.submit(get_current_month_totals, session=True)
+    clients = fanout.submit(fetch_clients, default=[])
+    ...  # the handler keeps using its own session meanwhile
+    current_totals = totals.result()
+
+- ``session=True`` tasks get their own session from ``session_factory`` as
+  first argument, closed when the task ends. ORM objects they return are
+  detached: load everything the caller needs inside the task.
+- ``uses_db=True`` marks tasks that open their own sessions (services,
+  token lookups).
+- Tasks run inside a copy of the current request context (``current_user``,
+  ``request`` and ``current_app`` work as usual).
+- Every ``result()`` shares one deadline per FanOut; ``deadline=`` gives a
+  task its own, counted from its submission (slow external calls). A task
+  that fails or misses its deadline returns its ``default`` (logged) or
+  raises when it has none. A task past its deadline is not interrupted: it
+  finishes in the pool with nobody waiting for it.
+- Database tasks run inline on SQLite: the in-memory test database shares a
+  single connection between sessions, and SQLite gains nothing from
+  concurrent readers.
+
+REQUEST_FANOUT_WORKERS sets the pool size per process (default 8; 0 runs
+everything inline). REQUEST_FANOUT_DEADLINE_SECONDS sets the default
+deadline (20).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Optional
+
+from flask import copy_current_request_context, has_request_context
+
+from app.core.runtime import env_number
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_DEADLINE_SECONDS = 20.0
+
+_MISSING = object()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> Optional[ThreadPoolExecutor]:
+    """The process-wide pool, or None when fan-out is disabled."""
+    global _executor
+    workers = env_number("REQUEST_FANOUT_WORKERS", DEFAULT_WORKERS, int)
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="request-fanout"
+            )
+        return _executor
+
+
+def _parallel_db_allowed() -> bool:
+    from app.db.session import get_engine
+
+    try:
+        return get_engine().dialect.name != "sqlite"
+    except Exception:
+        return False
+
+
+class Task:
+    """Handle for one submitted call; ``result()`` waits up to the deadline."""
+
+    def __init__(
+        self,
+        fanout: "FanOut",
+        name: str,
+        default: Any,
+        deadline: Optional[float] = None,
+    ):
+        self._fanout = fanout
+        self.name = name
+        self.default = default
+        self.deadline = fanout.deadline if deadline is None else deadline
+        self._expires = (
+            fanout._expires if deadline is None else time.monotonic() + deadline
+        )
+        self._future: Optional[Future] = None
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+
+    def _run_inline(self, call: Callable[[], Any]) -> None:
+        try:
+            self._value = call()
+        except Exception as e:
+            self._error = e
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires - time.monotonic())
+
+    def result(self) -> Any:
+        if self._future is not None:
+            try:
+                self._value = self._future.result(timeout=self.remaining())
+            except FutureTimeout:
+                self._future.cancel()
+                return self._fallback(
+                    TimeoutError(f"{self.name} missed the {self.deadline}s deadline")
+                )
+            except Exception as e:
+                return self._fallback(e)
+            return self._value
+        if self._error is not None:
+            return self._fallback(self._error)
+        return self._value
+
+    def _fallback(self, error: BaseException) -> Any:
+        if self.default is _MISSING:
+            raise error
+        logger.warning(
+            "Fan-out task failed - using default",
+            extra={"context": {"task": self.name, "error": str(error)}},
+        )
+        return self.default
+
+
+class FanOut:
+    """Independent calls of one request, sharing a deadline."""
+
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ):
+        if deadline is None:
+            deadline = env_number(
+                "REQUEST_FANOUT_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS, float
+            )
+        self.deadline = deadline
+        self.session_factory = session_factory
+        self._expires = time.monotonic() + deadline
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires - time.monotonic())
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        session: bool = False,
+        uses_db: bool = False,
+        default: Any = _MISSING,
+        name: Optional[str] = None,
+        deadline: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Task:
+        """Start ``fn(*args, **kwargs)``, with a new session first if ``session``."""
+        task = Task(self, name or getattr(fn, "__name__", "task"), default, deadline)
+        if session and self.session_factory is None:
+            raise ValueError("session tasks need a session_factory")
+        uses_db = uses_db or session
+
+        def call() -> Any:
+            if not session:
+                return fn(*args, **kwargs)
+            db = self.session_factory()
+            try:
+                return fn(db, *args, **kwargs)
+            finally:
+                db.close()
+
+        executor = _get_executor()
+        if executor is None or (uses_db and not _parallel_db_allowed()):
+            task._run_inline(call)
+            return task
+
+        if has_request_context():
+            call = copy_current_request_context(call)
+        task._future = executor.submit(call)
+        return task
@@ -0,0 +1,35 @@
+"""
+Helpers shared by the caches and background services: numeric settings read
+from the environment and UTC timestamps.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def env_number(name: str, default: T, cast: Callable[[str], T]) -> T:
+    """``cast`` of the variable ``name``; ``default`` when unset or invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """``value`` as an aware UTC datetime.
+
+    SQLite hands back naive datetimes; everything stored by the app is UTC.
+    """
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,361 @@
+"""
+Leader election for the APScheduler jobs.
+
+Every gunicorn worker, on every replica, builds the same ``BackgroundScheduler``
+in ``create_app``. Left alone, each job would run once per process, all at
+the same moment and on the same rows. The scheduler now starts paused
+everywhere, and only the process holding the ``scheduler_leader`` lock
+(app.db.locks: a PostgreSQL advisory lock, a file lock on SQLite) resumes it:
+
+- Election: every SCHEDULER_HEARTBEAT_SECONDS (default 15) a follower tries
+  to take the lock without waiting.
+- Heartbeat: the leader checks that it still holds the lock (on PostgreSQL,
+  that its session is alive) and pauses its scheduler if not. Every node
+  records a heartbeat in ``scheduler_nodes``.
+- Failover: the lock goes away with the leader's process or database session,
+  and a follower takes over on its next heartbeat.
+
+The last run of each job is recorded in ``scheduler_job_runs``.
+``scheduler_status()`` backs ``GET /admin/scheduler``. Only gunicorn workers
+join the election (``start_scheduler_leader`` from the post_worker_init hook
+in gunicorn.conf.py); in other processes, and under TESTING, the scheduler
+stays paused.
+"""
+
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
+from sqlalchemy import delete, select
+
+from app.core.runtime import as_utc, env_number, utcnow
+from app.db.base import SchedulerJobRun, SchedulerNode
+from app.db.locks import AdvisoryLock
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "scheduler_leader"
+LEADER = "leader"
+FOLLOWER = "follower"
+
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+# A node missing this many heartbeats is reported as not alive
+STALE_HEARTBEATS = 3
+# Rows of nodes gone this long are pruned by the leader
+NODE_RETENTION = timedelta(days=1)
+
+_leader: Optional["SchedulerLeader"] = None
+_leader_lock = threading.Lock()
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    value = as_utc(value)
+    return value.isoformat() if value is not None else None
+
+
+def heartbeat_seconds() -> float:
+    return env_number("SCHEDULER_HEARTBEAT_SECONDS", DEFAULT_HEARTBEAT_SECONDS, float)
+
+
+class SchedulerLeader:
+    """Runs ``scheduler``'s jobs only while this process holds the lock.
+
+    ``scheduler`` must be started paused; ``tick()`` is one heartbeat and
+    ``start()`` runs it every ``heartbeat_seconds`` on a daemon thread.
+    """
+
+    def __init__(
+        self,
+        scheduler: Any,
+        heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+        lock: Optional[AdvisoryLock] = None,
+        node_id: Optional[str] = None,
+    ):
+        self.scheduler = scheduler
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lock = lock if lock is not None else AdvisoryLock(LOCK_NAME)
+        self.hostname = socket.gethostname()
+        self.pid = os.getpid()
+        self.node_id = node_id or f"{self.hostname}:{self.pid}"
+        self.started_at = utcnow()
+        self.leader_since: Optional[datetime] = None
+        self._job_starts: Dict[str, datetime] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_SUBMITTED
+            | EVENT_JOB_EXECUTED
+            | EVENT_JOB_ERROR
+            | EVENT_JOB_MISSED,
+        )
+
+    @property
+    def is_leader(self) -> bool:
+        return self.leader_since is not None
+
+    def tick(self) -> bool:
+        """One heartbeat: elect or re-check the lock, then record it."""
+        if self.is_leader:
+            if not self.lock.verify():
+                self._step_down()
+                logger.warning(
+                    "Scheduler leadership lost - jobs paused on this node",
+                    extra={"context": {"node": self.node_id}},
+                )
+        else:
+            try:
+                acquired = self.lock.acquire(blocking=False)
+            except Exception as e:
+                logger.warning(
+                    "Scheduler leader election failed",
+                    extra={"context": {"node": self.node_id, "error": str(e)}},
+                )
+                acquired = False
+            if acquired:
+                self.leader_since = utcnow()
+                self.scheduler.resume()
+                logger.info(
+                    "Scheduler leadership acquired - running scheduled jobs",
+                    extra={"context": {"node": self.node_id}},
+                )
+        self._heartbeat()
+        return self.is_leader
+
+    def _step_down(self) -> None:
+        self.leader_since = None
+        if self.scheduler.running:
+            self.scheduler.pause()
+        self.lock.release()
+
+    def _heartbeat(self) -> None:
+        now = utcnow()
+        try:
+            with SessionLocal() as db:
+                node = db.get(SchedulerNode, self.node_id)
+                if node is None:
+                    node = SchedulerNode(
+                        node_id=self.node_id,
+                        hostname=self.hostname,
+                        pid=self.pid,
+                        started_at=self.started_at,
+                    )
+                    db.add(node)
+                node.role = LEADER if self.is_leader else FOLLOWER
+                node.heartbeat_at = now
+                node.leader_since = self.leader_since
+                if self.is_leader:
+                    db.execute(
+                        delete(SchedulerNode).where(
+                            SchedulerNode.heartbeat_at < now - NODE_RETENTION
+                        )
+                    )
+                db.commit()
+        except Exception as e:
+            logger.warning(
+                "Scheduler heartbeat failed",
+                extra={"context": {"node": self.node_id, "error": str(e)}},
+            )
+
+    def _on_job_event(self, event) -> None:
+        if event.code == EVENT_JOB_SUBMITTED:
+            self._job_starts[event.job_id] = utcnow()
+            return
+        if event.code == EVENT_JOB_MISSED:
+            # Runs due before this node took over were the previous leader's;
+            # don't overwrite what it recorded
+            if self.leader_since is None or (
+                event.scheduled_run_time < self.leader_since
+            ):
+                return
+            status = "missed"
+        elif event.code == EVENT_JOB_ERROR:
+            status = "error"
+        else:
+            status = "success"
+        exception = getattr(event, "exception", None)
+        self.record_run(
+            event.job_id,
+            status,
+            scheduled_at=event.scheduled_run_time,
+            started_at=self._job_starts.pop(event.job_id, None),
+            error=(
+                f"{type(exception).__name__}: {exception}"
+                if exception is not None
+                else None
+            ),
+        )
+
+    def record_run(
+        self,
+        job_id: str,
+        status: str,
+        scheduled_at: Optional[datetime] = None,
+        started_at: Optional[datetime] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        finished_at = utcnow()
+        duration_ms = None
+        if started_at is not None:
+            duration_ms = int((finished_at - started_at).total_seconds() * 1000)
+        try:
+            with SessionLocal() as db:
+                run = db.get(SchedulerJobRun, job_id)
+                if run is None:
+                    run = SchedulerJobRun(job_id=job_id)
+                    db.add(run)
+                run.node_id = self.node_id
+                run.status = status
+                run.scheduled_at = scheduled_at
+                run.started_at = started_at
+                run.finished_at = finished_at
+                run.duration_ms = duration_ms
+                run.last_error = error[:500] if error else None
+                db.commit()
+        except Exception as e:
+            logger.warning(
+                "Failed to record scheduled job run",
+                extra={"context": {"job_id": job_id, "error": str(e)}},
+            )
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="scheduler-leader", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(
+                    "Scheduler leader heartbeat error",
+                    extra={"context": {"node": self.node_id, "error": str(e)}},
+                    exc_info=True,
+                )
+            self._stop.wait(self.heartbeat_seconds)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop electing and hand leadership over (pauses the scheduler)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.is_leader:
+            self._step_down()
+            self._heartbeat()
+
+
+def start_scheduler_leader(app, scheduler) -> SchedulerLeader:
+    """Elect this process's paused ``scheduler`` (not under TESTING)."""
+    global _leader
+    leader = SchedulerLeader(scheduler, heartbeat_seconds())
+    app.extensions["scheduler_leader"] = leader
+    if app.config.get("TESTING"):
+        logger.info("Scheduler leader election disabled - scheduler stays paused")
+        return leader
+    with _leader_lock:
+        # A second create_app in this process replaces the first scheduler
+        if _leader is not None:
+            _leader.stop()
+        _leader = leader
+        leader.start()
+    logger.info(
+        "Scheduler leader election started",
+        extra={
+            "context": {
+                "node": leader.node_id,
+                "heartbeat_seconds": leader.heartbeat_seconds,
+            }
+        },
+    )
+    return leader
+
+
+def scheduler_status(leader: Optional[SchedulerLeader] = None) -> Dict[str, Any]:
+    """Current leader, live nodes and each job's schedule and last run."""
+    interval = leader.heartbeat_seconds if leader else heartbeat_seconds()
+    alive_after = utcnow() - timedelta(seconds=STALE_HEARTBEATS * interval)
+    with SessionLocal() as db:
+        nodes = (
+            db.execute(
+                select(SchedulerNode).order_by(SchedulerNode.heartbeat_at.desc())
+            )
+            .scalars()
+            .all()
+        )
+        runs = {
+            run.job_id: run
+            for run in db.execute(select(SchedulerJobRun)).scalars().all()
+        }
+
+    node_dicts = [
+        {
+            "node_id": node.node_id,
+            "hostname": node.hostname,
+            "pid": node.pid,
+            "role": node.role,
+            "alive": as_utc(node.heartbeat_at) >= alive_after,
+            "started_at": _iso(node.started_at),
+            "heartbeat_at": _iso(node.heartbeat_at),
+            "leader_since": _iso(node.leader_since),
+        }
+        for node in nodes
+    ]
+    current = next((n for n in node_dicts if n["role"] == LEADER and n["alive"]), None)
+
+    def run_dict(run: Optional[SchedulerJobRun]) -> Optional[Dict[str, Any]]:
+        if run is None:
+            return None
+        return {
+            "status": run.status,
+            "node_id": run.node_id,
+            "scheduled_at": _iso(run.scheduled_at),
+            "started_at": _iso(run.started_at),
+            "finished_at": _iso(run.finished_at),
+            "duration_ms": run.duration_ms,
+            "error": run.last_error,
+        }
+
+    jobs = []
+    if leader is not None:
+        for job in leader.scheduler.get_jobs():
+            jobs.append(
+                {
+                    "id": job.id,
+                    "name": job.name,
+                    "trigger": str(job.trigger),
+                    # A follower's own schedule is not what will run
+                    "next_run_time": (
+                        _iso(job.next_run_time) if leader.is_leader else None
+                    ),
+                    "last_run": run_dict(runs.pop(job.id, None)),
+                }
+            )
+    # Jobs recorded by other nodes but not registered here
+    for job_id, run in sorted(runs.items()):
+        jobs.append({"id": job_id, "last_run": run_dict(run)})
+
+    return {
+        "leader": current,
+        "this_node": (
+            {
+                "node_id": leader.node_id,
+                "role": LEADER if leader.is_leader else FOLLOWER,
+            }
+            if leader is not None
+            else None
+        ),
+        "nodes": [n for n in node_dicts if n["alive"]],
+        "jobs": jobs,
+    }
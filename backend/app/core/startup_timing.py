@@ -0,0 +1,58 @@
+"""
+Startup timing report.
+
+``create_app`` marks the end of each boot phase (logging, security, database,
+migrations, blueprints, scheduler, ...). Every gunicorn worker pays these on
+boot, so the report says where a slow start goes. It is logged once per
+process as "Startup timing" and kept in ``app.extensions["startup_timing"]``;
+``python manage.py startup_report`` prints it as a table.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class StartupTimer:
+    """Durations between consecutive ``mark`` calls, in milliseconds."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._started = clock()
+        self._last = self._started
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """Close ``phase`` (everything since the previous mark)."""
+        now = self._clock()
+        elapsed_ms = (now - self._last) * 1000
+        self._last = now
+        self.phases.append((phase, elapsed_ms))
+        return elapsed_ms
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self._started) * 1000
+
+    def report(self) -> Dict[str, Any]:
+        total = self.total_ms
+        return {
+            "total_ms": round(total, 1),
+            "phases": [
+                {
+                    "phase": phase,
+                    "ms": round(ms, 1),
+                    "percent": round(100 * ms / total, 1) if total else 0.0,
+                }
+                for phase, ms in self.phases
+            ],
+        }
+
+    def format_table(self) -> str:
+        report = self.report()
+        width = max([len(p["phase"]) for p in report["phases"]] + [len("total")])
+        lines = [
+            f"{p['phase']:<{width}}  {p['ms']:>9.1f} ms  {p['percent']:>5.1f}%"
+            for p in report["phases"]
+        ]
+        lines.append(f"{'total':<{width}}  {report['total_ms']:>9.1f} ms")
+        return "\n".join(lines)
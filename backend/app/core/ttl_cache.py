@@ -0,0 +1,105 @@
+"""
+Thread-safe in-process cache used by the fragment, reference, identity and
+extrato caches.
+
+Each entry is stored with the ``version`` it was loaded under (table change
+counters, ...) and an expiry: a lookup with another version, or after
+``ttl_seconds``, loads again. ``max_entries`` bounds the cache as an LRU.
+``invalidate`` and ``clear`` also discard loads still in progress, so a value
+read before a write is never stored after it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """LRU of ``key -> (version, expires, value)`` with hit/miss counters.
+
+    ``ttl_seconds`` None keeps entries until their version changes;
+    ``ttl_seconds`` or ``max_entries`` 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Bumped by invalidate/clear: a load that started before is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self.ttl_seconds is not None and self.ttl_seconds <= 0:
+            return False
+        return self.max_entries is None or self.max_entries > 0
+
+    def get(self, key: Hashable, load: Callable[[], Any], version: Any = None) -> Any:
+        """Value cached for ``key`` at ``version``, calling ``load`` on a miss.
+
+        None results are not cached.
+        """
+        if not self.enabled:
+            return load()
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                expires = entry[1]
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+            self.misses += 1
+            generation = self._generation
+
+        value = load()
+        if value is None:
+            return value
+        with self._lock:
+            if self._generation == generation:
+                expires = None if self.ttl_seconds is None else now + self.ttl_seconds
+                self._entries[key] = (version, expires, value)
+                self._entries.move_to_end(key)
+                while self.max_entries and len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        self.invalidate_where(lambda key: key in keys)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every key matching ``predicate``."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -12,6 +12,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     UniqueConstraint,
@@ -116,8 +117,12 @@ class Inventory(Base):
     nome: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     quantidade: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     observacoes: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    # Manual order for drag&drop. Nullable: items without manual order appear first (newest first)
+    # Position from the last full-list reorder (drag&drop form). Kept for compatibility;
+    # listing order comes from 'rank'.
     order: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=None)
+    # Rank key (app.utils.rank_keys) that drives the listing order; moving an item
+    # rewrites only its own key. NULL sorts first, newest first.
+    rank: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
     category: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     unit_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True)
     supplier: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
@@ -461,6 +466,12 @@ class ExtratoRunLog(Base):
     )
     status: Mapped[str] = mapped_column(String(50), nullable=False)
     message: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Wall-clock duration of the run and the backfill batch that produced it
+    # (both nullable: runs from the scheduler/API leave them empty)
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    batch_id: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True, index=True
+    )
 
     __table_args__ = (
         UniqueConstraint("mes", "ano", "status", name="unique_extrato_run_per_month"),
@@ -483,7 +494,11 @@ class ExtratoSnapshot(Base):
     ano: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     data: Mapped[Any] = mapped_column(
         get_json_type(), nullable=False
-    )  # JSON snapshot of extrato data
+    )  # JSON snapshot metadata (legacy rows also hold the full payload)
+    # Payload lives in extrato_snapshot_blobs, shared by identical snapshots
+    content_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     correlation_id: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     created_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -493,6 +508,30 @@ class ExtratoSnapshot(Base):
         return f"<ExtratoSnapshot(id={self.id}, snapshot_id={self.snapshot_id}, mes={self.mes}, ano={self.ano})>"
 
 
+class ExtratoSnapshotBlob(Base):
+    """Compressed, content-addressed extrato payload referenced by snapshots.
+
+    Keyed by the SHA-256 of the uncompressed payload so forcing the same month
+    again does not store a second copy of identical data.
+    """
+
+    __tablename__ = "extrato_snapshot_blobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    content_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, unique=True, index=True
+    )
+    codec: Mapped[str] = mapped_column(String(10), nullable=False)  # zlib | zstd
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self):
+        return f"<ExtratoSnapshotBlob(id={self.id}, content_hash={self.content_hash[:12]}, codec={self.codec})>"
+
+
 class MigrationAudit(Base):
     """Audit trail for database migrations and refactoring operations.
 
@@ -528,3 +567,114 @@ class MigrationAudit(Base):
             f"<MigrationAudit(id={self.id}, entity_type={self.entity_type}, "
             f"action={self.action}, status={self.status})>"
         )
+
+
+class TableVersion(Base):
+    """Change counter of a table, bumped in the transaction that writes it.
+
+    Used as the version key of cached template fragments
+    (app.core.fragment_cache).
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(table_name={self.table_name}, version={self.version})>"
+
+
+class Job(Base):
+    """Background job, claimed and run by app.core.job_queue workers.
+
+    ``active_key`` holds the dedupe key while the job is queued or running
+    and is cleared when it finishes; its unique index makes enqueueing
+    single-flight across threads, workers and replicas.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    job_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    dedupe_key: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    active_key: Mapped[Optional[str]] = mapped_column(
+        String(128), nullable=True, unique=True
+    )
+    payload: Mapped[Optional[Any]] = mapped_column(get_json_type(), nullable=True)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, index=True
+    )  # queued | running | succeeded | failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    result: Mapped[Optional[Any]] = mapped_column(get_json_type(), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self):
+        return (
+            f"<Job(id={self.id}, job_type={self.job_type}, status={self.status}, "
+            f"attempts={self.attempts})>"
+        )
+
+
+class SchedulerNode(Base):
+    """A process running the APScheduler, as seen by app.core.scheduler_leader.
+
+    Every node heartbeats its row; ``role`` is ``leader`` for the single node
+    holding the scheduler lock (the only one whose jobs run).
+    """
+
+    __tablename__ = "scheduler_nodes"
+
+    node_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    hostname: Mapped[str] = mapped_column(String(100), nullable=False)
+    pid: Mapped[int] = mapped_column(Integer, nullable=False)
+    role: Mapped[str] = mapped_column(String(20), nullable=False)  # leader | follower
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    leader_since: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class SchedulerJobRun(Base):
+    """Last run of each scheduled job, whichever node ran it."""
+
+    __tablename__ = "scheduler_job_runs"
+
+    job_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    node_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # success | error | missed
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -0,0 +1,184 @@
+"""
+Cross-process locks for work that must run in one process at a time.
+
+Gunicorn workers and replicas share the database, so the database is where
+they agree on who runs something (``manage.py migrate`` racing a booting
+worker, for example):
+
+- PostgreSQL: a session-level advisory lock (``pg_advisory_lock``) held on a
+  dedicated pooled connection. The server releases it if the process dies.
+- SQLite: an exclusive ``flock`` on ``<database file>.<name>.lock``. The OS
+  releases it if the process dies.
+- In-memory SQLite (tests): a process-local lock, the database does not
+  outlive the process anyway.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.db.session import get_engine
+
+try:  # Optional: not available on Windows
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_process_locks: Dict[str, threading.Lock] = {}
+_process_locks_guard = threading.Lock()
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit key for ``pg_advisory_lock``."""
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def _process_lock(name: str) -> threading.Lock:
+    with _process_locks_guard:
+        return _process_locks.setdefault(name, threading.Lock())
+
+
+class AdvisoryLock:
+    """Named lock shared by every process using the same database.
+
+    ``acquire(blocking=False)`` returns False instead of waiting. Also usable
+    as a blocking context manager::
+
+        with AdvisoryLock("schema_migrations"):
+            ...
+    """
+
+    def __init__(self, name: str, engine: Any = None):
+        self.name = name
+        self._engine = engine
+        self._conn = None
+        self._file = None
+        self._thread_lock: Optional[threading.Lock] = None
+        self.held = False
+
+    @property
+    def engine(self):
+        return self._engine if self._engine is not None else get_engine()
+
+    def _sqlite_path(self) -> Optional[str]:
+        database = self.engine.url.database
+        if not database or database == ":memory:" or fcntl is None:
+            return None
+        return f"{os.path.abspath(database)}.{self.name}.lock"
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if self.held:
+            return True
+        engine = self.engine
+        if engine.dialect.name == "postgresql":
+            self.held = self._acquire_postgres(engine, blocking)
+        else:
+            path = self._sqlite_path()
+            if path is not None:
+                self.held = self._acquire_file(path, blocking)
+            else:
+                lock = _process_lock(self.name)
+                self.held = lock.acquire(blocking)
+                if self.held:
+                    self._thread_lock = lock
+        return self.held
+
+    def _acquire_postgres(self, engine, blocking: bool) -> bool:
+        conn = engine.connect()
+        try:
+            key = {"key": lock_key(self.name)}
+            if blocking:
+                conn.execute(text("SELECT pg_advisory_lock(:key)"), key)
+                acquired = True
+            else:
+                result = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), key)
+                acquired = bool(result.scalar())
+            # The lock is session-level: end the transaction, keep the connection
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if acquired:
+            self._conn = conn
+        else:
+            conn.close()
+        return acquired
+
+    def _acquire_file(self, path: str, blocking: bool) -> bool:
+        handle = open(path, "a+")
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(handle.fileno(), flags)
+        except BlockingIOError:
+            handle.close()
+            return False
+        except Exception:
+            handle.close()
+            raise
+        self._file = handle
+        return True
+
+    def verify(self) -> bool:
+        """Whether a held lock is still ours.
+
+        A PostgreSQL advisory lock lives as long as its session: if the
+        connection was dropped the server has released it and another process
+        may hold it now. File and process locks cannot be lost while held.
+        """
+        if not self.held:
+            return False
+        if self._conn is None:
+            return True
+        try:
+            self._conn.execute(text("SELECT 1"))
+            self._conn.commit()
+            return True
+        except Exception as e:
+            logger.warning(
+                "Advisory lock connection lost",
+                extra={"context": {"lock": self.name, "error": str(e)}},
+            )
+            return False
+
+    def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            try:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": lock_key(self.name)},
+                )
+                conn.commit()
+            except Exception as e:
+                # Dropping the session releases the lock server-side
+                logger.warning(
+                    "Advisory unlock failed - discarding connection",
+                    extra={"context": {"lock": self.name, "error": str(e)}},
+                )
+                conn.invalidate()
+            finally:
+                conn.close()
+        if self._file is not None:
+            handle, self._file = self._file, None
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            handle.close()
+        if self._thread_lock is not None:
+            lock, self._thread_lock = self._thread_lock, None
+            lock.release()
+
+    def __enter__(self) -> "AdvisoryLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
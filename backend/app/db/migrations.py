@@ -1,19 +1,32 @@
 """
 Database migration functions.
 
-This module contains functions that apply schema migrations automatically
-during application startup. Each migration function is idempotent and safe
-to run multiple times.
+Each ``ensure_migration_*`` function is idempotent and safe to run multiple
+times; it returns False when the migration failed (the error is logged).
+
+``MIGRATIONS`` lists them by version. Applied versions are recorded in the
+``schema_version`` table, so startup only has to compare one ``MAX(version)``
+query against the registry (``check_schema_on_startup``) instead of
+inspecting the schema in every worker. Pending migrations are applied by
+``python manage.py migrate`` (``run_migrations``) under a database-wide
+advisory lock; outside production, or with MIGRATE_ON_STARTUP=1, startup
+applies them too.
 """
 
 import logging
+import os
+import time
+from typing import Callable, List, NamedTuple, Optional
+
 from sqlalchemy import text, inspect
+from app.db.locks import AdvisoryLock
 from app.db.session import get_engine
+from app.utils.rank_keys import evenly_spaced
 
 logger = logging.getLogger(__name__)
 
 
-def ensure_migration_001_applied() -> None:
+def ensure_migration_001_applied() -> bool:
     """
     Migration 001: Make jotform_submission_id nullable in clients table.
 
@@ -46,7 +59,7 @@ def ensure_migration_001_applied() -> None:
                     "Migration 001 skipped - jotform_submission_id column not found",
                     extra={"context": {"table": "clients"}},
                 )
-                return
+                return True
 
             # Check if already nullable
             is_nullable = jotform_col.get("nullable", False)
@@ -61,7 +74,7 @@ def ensure_migration_001_applied() -> None:
                         }
                     },
                 )
-                return
+                return True
 
             # Apply migration based on database type
             logger.info(
@@ -109,7 +122,7 @@ def ensure_migration_001_applied() -> None:
                     "Migration 001 skipped - unsupported database dialect",
                     extra={"context": {"dialect": dialect_name}},
                 )
-                return
+                return True
 
             logger.info(
                 "Migration 001 applied successfully",
@@ -123,6 +136,7 @@ def ensure_migration_001_applied() -> None:
                 },
             )
 
+        return True
     except Exception as e:
         logger.error(
             "Failed to apply Migration 001",
@@ -131,9 +145,10 @@ def ensure_migration_001_applied() -> None:
         )
         # Don't raise - app should still start even if migration fails
         # Existing Jotform clients will still work, only manual input will fail
+        return False
 
 
-def ensure_migration_002_applied() -> None:
+def ensure_migration_002_applied() -> bool:
     """
     Migration 002: Create migration_audit table.
 
@@ -159,7 +174,7 @@ def ensure_migration_002_applied() -> None:
                     "Migration 002 already applied - migration_audit table exists",
                     extra={"context": {"table": "migration_audit"}},
                 )
-                return
+                return True
 
             logger.info(
                 "Applying Migration 002 - creating migration_audit table",
@@ -211,7 +226,7 @@ def ensure_migration_002_applied() -> None:
                     "Migration 002 skipped - unsupported database dialect",
                     extra={"context": {"dialect": dialect_name}},
                 )
-                return
+                return True
 
             logger.info(
                 "Migration 002 applied successfully",
@@ -224,6 +239,7 @@ def ensure_migration_002_applied() -> None:
                 },
             )
 
+        return True
     except Exception as e:
         logger.error(
             "Failed to apply Migration 002",
@@ -231,9 +247,10 @@ def ensure_migration_002_applied() -> None:
             exc_info=True,
         )
         # Don't raise - app should still start
+        return False
 
 
-def ensure_migration_003_applied() -> None:
+def ensure_migration_003_applied() -> bool:
     """
     Migration 003: Add google_event_id column to pagamentos table.
 
@@ -267,7 +284,7 @@ def ensure_migration_003_applied() -> None:
                         "context": {"table": "pagamentos", "column": "google_event_id"}
                     },
                 )
-                return
+                return True
 
             logger.info(
                 "Applying Migration 003 - adding google_event_id to pagamentos",
@@ -307,7 +324,7 @@ def ensure_migration_003_applied() -> None:
                     "Migration 003 skipped - unsupported database dialect",
                     extra={"context": {"dialect": dialect_name}},
                 )
-                return
+                return True
 
             logger.info(
                 "Migration 003 applied successfully",
@@ -321,6 +338,7 @@ def ensure_migration_003_applied() -> None:
                 },
             )
 
+        return True
     except Exception as e:
         logger.error(
             "Failed to apply Migration 003",
@@ -328,9 +346,10 @@ def ensure_migration_003_applied() -> None:
             exc_info=True,
         )
         # Don't raise - app should still start
+        return False
 
 
-def ensure_migration_004_backfill_google_event_id() -> None:
+def ensure_migration_004_backfill_google_event_id() -> bool:
     """
     Migration 004: Backfill google_event_id from sessoes to pagamentos.
 
@@ -359,7 +378,7 @@ def ensure_migration_004_backfill_google_event_id() -> None:
                     "Migration 004 skipped - migration_audit table not found (run Migration 002 first)",
                     extra={"context": {"dependency": "migration_audit"}},
                 )
-                return
+                return True
 
             # Check if google_event_id column exists in pagamentos
             columns = inspector.get_columns("pagamentos")
@@ -374,7 +393,7 @@ def ensure_migration_004_backfill_google_event_id() -> None:
                         "context": {"table": "pagamentos", "column": "google_event_id"}
                     },
                 )
-                return
+                return True
 
             logger.info(
                 "Applying Migration 004 - backfilling google_event_id",
@@ -467,7 +486,7 @@ def ensure_migration_004_backfill_google_event_id() -> None:
                     "Migration 004 skipped - unsupported database dialect",
                     extra={"context": {"dialect": dialect_name}},
                 )
-                return
+                return True
 
             # Step 3: Log summary to migration_audit
             conn.execute(
@@ -496,6 +515,7 @@ def ensure_migration_004_backfill_google_event_id() -> None:
                 },
             )
 
+        return True
     except Exception as e:
         logger.error(
             "Failed to apply Migration 004",
@@ -503,9 +523,10 @@ def ensure_migration_004_backfill_google_event_id() -> None:
             exc_info=True,
         )
         # Don't raise - app should still start
+        return False
 
 
-def ensure_migration_005_unified_flow_flag() -> None:
+def ensure_migration_005_unified_flow_flag() -> bool:
     """
     Migration 005: Add unified_flow_enabled flag to users table (Phase 3).
 
@@ -534,7 +555,7 @@ def ensure_migration_005_unified_flow_flag() -> None:
                         "context": {"table": "users", "column": "unified_flow_enabled"}
                     },
                 )
-                return
+                return True
 
             logger.info(
                 "Applying Migration 005 - adding unified_flow_enabled to users",
@@ -562,7 +583,7 @@ def ensure_migration_005_unified_flow_flag() -> None:
                     "Migration 005 skipped - unsupported database dialect",
                     extra={"context": {"dialect": dialect_name}},
                 )
-                return
+                return True
 
             # Log migration completion
             conn.execute(
@@ -585,6 +606,7 @@ def ensure_migration_005_unified_flow_flag() -> None:
                 extra={"context": {"dialect": dialect_name}},
             )
 
+        return True
     except Exception as e:
         logger.error(
             "Failed to apply Migration 005",
@@ -592,3 +614,405 @@ def ensure_migration_005_unified_flow_flag() -> None:
             exc_info=True,
         )
         # Don't raise - app should still start
+        return False
+
+
+def ensure_migration_006_extrato_run_timing() -> bool:
+    """
+    Migration 006: Add duration_ms and batch_id columns to extrato_run_logs.
+
+    Used by the multi-month backfill command to record per-month timings and
+    to resume a failed batch. Both columns are nullable so existing rows and
+    runs triggered by the scheduler/API are unaffected.
+
+    This function is idempotent - it can be called multiple times safely.
+    """
+    try:
+        engine = get_engine()
+        dialect_name = engine.dialect.name
+
+        with engine.connect() as conn:
+            inspector = inspect(engine)
+            if "extrato_run_logs" not in inspector.get_table_names():
+                logger.warning(
+                    "Migration 006 skipped - extrato_run_logs table not found",
+                    extra={"context": {"table": "extrato_run_logs"}},
+                )
+                return True
+
+            existing = {
+                col["name"] for col in inspector.get_columns("extrato_run_logs")
+            }
+            missing = [
+                name for name in ("duration_ms", "batch_id") if name not in existing
+            ]
+
+            if not missing:
+                logger.debug(
+                    "Migration 006 already applied - timing columns exist",
+                    extra={"context": {"table": "extrato_run_logs"}},
+                )
+                return True
+
+            if dialect_name not in ("postgresql", "sqlite"):
+                logger.warning(
+                    "Migration 006 skipped - unsupported database dialect",
+                    extra={"context": {"dialect": dialect_name}},
+                )
+                return True
+
+            logger.info(
+                "Applying Migration 006 - adding timing columns to extrato_run_logs",
+                extra={"context": {"dialect": dialect_name, "columns": missing}},
+            )
+
+            # Same DDL on PostgreSQL and SQLite (ADD COLUMN of nullable columns)
+            if "duration_ms" in missing:
+                conn.execute(text("""
+                    ALTER TABLE extrato_run_logs
+                    ADD COLUMN duration_ms INTEGER NULL;
+                """))
+            if "batch_id" in missing:
+                conn.execute(text("""
+                    ALTER TABLE extrato_run_logs
+                    ADD COLUMN batch_id VARCHAR(50) NULL;
+                """))
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_extrato_run_logs_batch_id
+                    ON extrato_run_logs(batch_id);
+                """))
+            conn.commit()
+
+            logger.info(
+                "Migration 006 applied successfully",
+                extra={"context": {"dialect": dialect_name, "columns": missing}},
+            )
+
+        return True
+    except Exception as e:
+        logger.error(
+            "Failed to apply Migration 006",
+            extra={"context": {"error": str(e)}},
+            exc_info=True,
+        )
+        # Don't raise - app should still start
+        return False
+
+
+def ensure_migration_007_snapshot_content_hash() -> bool:
+    """
+    Migration 007: Add content_hash column to extrato_snapshots.
+
+    Snapshots now reference a compressed, deduplicated payload stored in
+    extrato_snapshot_blobs (created by create_tables). Legacy rows keep their
+    inline payload in ``data`` and a NULL content_hash.
+
+    This function is idempotent - it can be called multiple times safely.
+    """
+    try:
+        engine = get_engine()
+        dialect_name = engine.dialect.name
+
+        with engine.connect() as conn:
+            inspector = inspect(engine)
+            if "extrato_snapshots" not in inspector.get_table_names():
+                logger.warning(
+                    "Migration 007 skipped - extrato_snapshots table not found",
+                    extra={"context": {"table": "extrato_snapshots"}},
+                )
+                return True
+
+            columns = inspector.get_columns("extrato_snapshots")
+            if any(col["name"] == "content_hash" for col in columns):
+                logger.debug(
+                    "Migration 007 already applied - content_hash column exists",
+                    extra={
+                        "context": {
+                            "table": "extrato_snapshots",
+                            "column": "content_hash",
+                        }
+                    },
+                )
+                return True
+
+            if dialect_name not in ("postgresql", "sqlite"):
+                logger.warning(
+                    "Migration 007 skipped - unsupported database dialect",
+                    extra={"context": {"dialect": dialect_name}},
+                )
+                return True
+
+            logger.info(
+                "Applying Migration 007 - adding content_hash to extrato_snapshots",
+                extra={"context": {"dialect": dialect_name}},
+            )
+
+            conn.execute(text("""
+                ALTER TABLE extrato_snapshots
+                ADD COLUMN content_hash VARCHAR(64) NULL;
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_extrato_snapshots_content_hash
+                ON extrato_snapshots(content_hash);
+            """))
+            conn.commit()
+
+            logger.info(
+                "Migration 007 applied successfully",
+                extra={"context": {"dialect": dialect_name}},
+            )
+
+        return True
+    except Exception as e:
+        logger.error(
+            "Failed to apply Migration 007",
+            extra={"context": {"error": str(e)}},
+            exc_info=True,
+        )
+        # Don't raise - app should still start
+        return False
+
+
+def ensure_migration_008_inventory_rank() -> bool:
+    """
+    Migration 008: Add rank column to inventory and backfill it.
+
+    Drag & drop now moves one item by giving it a rank key between its
+    neighbours (app.utils.rank_keys) instead of renumbering every 'order'.
+    Existing rows get evenly spaced keys in their current listing order:
+    items without 'order' first (newest first), then by 'order'.
+
+    This function is idempotent - it can be called multiple times safely.
+    """
+    try:
+        engine = get_engine()
+        dialect_name = engine.dialect.name
+
+        with engine.connect() as conn:
+            inspector = inspect(engine)
+            if "inventory" not in inspector.get_table_names():
+                logger.warning(
+                    "Migration 008 skipped - inventory table not found",
+                    extra={"context": {"table": "inventory"}},
+                )
+                return True
+
+            columns = inspector.get_columns("inventory")
+            if any(col["name"] == "rank" for col in columns):
+                logger.debug(
+                    "Migration 008 already applied - rank column exists",
+                    extra={"context": {"table": "inventory", "column": "rank"}},
+                )
+                return True
+
+            if dialect_name not in ("postgresql", "sqlite"):
+                logger.warning(
+                    "Migration 008 skipped - unsupported database dialect",
+                    extra={"context": {"dialect": dialect_name}},
+                )
+                return True
+
+            logger.info(
+                "Applying Migration 008 - adding rank to inventory",
+                extra={"context": {"dialect": dialect_name}},
+            )
+
+            conn.execute(text("""
+                ALTER TABLE inventory
+                ADD COLUMN rank VARCHAR(64) NULL;
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_inventory_rank
+                ON inventory(rank);
+            """))
+
+            # Same order the listing used before rank existed
+            ids = conn.execute(text("""
+                SELECT id FROM inventory
+                ORDER BY "order" IS NOT NULL, "order" ASC, created_at DESC, id DESC
+            """)).scalars().all()
+            keys = evenly_spaced(len(ids))
+            if ids:
+                conn.execute(
+                    text("UPDATE inventory SET rank = :rank WHERE id = :id"),
+                    [{"id": i, "rank": key} for i, key in zip(ids, keys)],
+                )
+            conn.commit()
+
+            logger.info(
+                "Migration 008 applied successfully",
+                extra={"context": {"dialect": dialect_name, "rows": len(ids)}},
+            )
+
+        return True
+    except Exception as e:
+        logger.error(
+            "Failed to apply Migration 008",
+            extra={"context": {"error": str(e)}},
+            exc_info=True,
+        )
+        # Don't raise - app should still start
+        return False
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[], bool]
+
+
+# Append new migrations here with the next version number
+MIGRATIONS = (
+    Migration(1, "jotform_submission_id nullable", ensure_migration_001_applied),
+    Migration(2, "migration_audit table", ensure_migration_002_applied),
+    Migration(3, "pagamentos.google_event_id", ensure_migration_003_applied),
+    Migration(
+        4, "google_event_id backfill", ensure_migration_004_backfill_google_event_id
+    ),
+    Migration(5, "users.unified_flow_enabled", ensure_migration_005_unified_flow_flag),
+    Migration(6, "extrato_run_logs timing", ensure_migration_006_extrato_run_timing),
+    Migration(7, "snapshot content_hash", ensure_migration_007_snapshot_content_hash),
+    Migration(8, "inventory.rank", ensure_migration_008_inventory_rank),
+)
+
+MIGRATION_LOCK = "schema_migrations"
+
+
+def latest_schema_version() -> int:
+    return MIGRATIONS[-1].version
+
+
+def current_schema_version() -> Optional[int]:
+    """Highest applied version, 0 for none; None when the table is missing."""
+    try:
+        with get_engine().connect() as conn:
+            version = conn.execute(
+                text("SELECT MAX(version) FROM schema_version")
+            ).scalar()
+    except Exception:
+        return None
+    return version or 0
+
+
+def pending_migrations(current: Optional[int] = None) -> List[Migration]:
+    if current is None:
+        current = current_schema_version() or 0
+    return [m for m in MIGRATIONS if m.version > current]
+
+
+def _ensure_schema_version_table(conn) -> None:
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            duration_ms INTEGER,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """))
+
+
+def run_migrations() -> List[dict]:
+    """Apply pending migrations in order and record each applied version.
+
+    Holds the ``schema_migrations`` advisory lock, so concurrent callers
+    (``manage.py migrate`` and booting workers) wait and then find nothing
+    left to do. Stops at the first failure: later migrations may depend on
+    it, and the failed one stays pending for the next run.
+    """
+    engine = get_engine()
+    applied = []
+    with AdvisoryLock(MIGRATION_LOCK, engine):
+        with engine.begin() as conn:
+            _ensure_schema_version_table(conn)
+
+        for migration in pending_migrations():
+            started = time.perf_counter()
+            ok = migration.apply()
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            if not ok:
+                logger.error(
+                    "Schema migration failed - later migrations not applied",
+                    extra={
+                        "context": {
+                            "version": migration.version,
+                            "migration": migration.name,
+                        }
+                    },
+                )
+                break
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "INSERT INTO schema_version (version, name, duration_ms) "
+                        "VALUES (:version, :name, :duration_ms)"
+                    ),
+                    {
+                        "version": migration.version,
+                        "name": migration.name,
+                        "duration_ms": duration_ms,
+                    },
+                )
+            applied.append(
+                {
+                    "version": migration.version,
+                    "name": migration.name,
+                    "duration_ms": duration_ms,
+                }
+            )
+
+    if applied:
+        logger.info(
+            "Schema migrations applied",
+            extra={
+                "context": {
+                    "versions": [m["version"] for m in applied],
+                    "schema_version": applied[-1]["version"],
+                }
+            },
+        )
+    return applied
+
+
+def migrate_on_startup(is_production: bool) -> bool:
+    """MIGRATE_ON_STARTUP=1/0; unset means everywhere but production."""
+    value = os.getenv("MIGRATE_ON_STARTUP", "").strip().lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    return not is_production
+
+
+def check_schema_on_startup(is_production: bool) -> List[dict]:
+    """Startup gate: one query when the schema is current.
+
+    Returns the migrations applied here (empty when none were pending or
+    startup migrations are disabled, in which case a warning is logged).
+    """
+    current = current_schema_version()
+    pending = pending_migrations(current)
+    if not pending:
+        return []
+
+    if not migrate_on_startup(is_production):
+        logger.warning(
+            "Database schema is behind - run `python manage.py migrate`",
+            extra={
+                "context": {
+                    "schema_version": current,
+                    "latest": latest_schema_version(),
+                }
+            },
+        )
+        return []
+
+    try:
+        return run_migrations()
+    except Exception as e:
+        logger.error(
+            "Startup migrations failed",
+            extra={"context": {"error": str(e)}},
+            exc_info=True,
+        )
+        # Don't raise - app should still start
+        return []
@@ -91,6 +91,19 @@ def get_engine():
             except Exception:
                 _engine = create_engine(database_url, echo=False)
         register_query_timing(_engine)
+        try:
+            from app.core.metrics import register_pool_metrics
+
+            register_pool_metrics(_engine)
+        except Exception:
+            # Metrics are optional; never fail engine creation because of them
+            pass
+        try:
+            from app.core.pool_monitor import register_pool_monitor
+
+            register_pool_monitor(_engine)
+        except Exception:
+            pass
         try:
             # Emit explicit debug about the constructed engine target and dialect
             print(">>> DEBUG: SQLAlchemy engine URL:", str(getattr(_engine, "url", "")))
@@ -115,6 +128,27 @@ def get_sessionmaker():
     return _SessionLocal
 
 
+def dispose_engine(close: bool = True):
+    """Drop the cached engine and sessionmaker so the next call builds new ones.
+
+    Worker processes call this on startup so they never share pooled
+    connections with their parent. Pass close=False in a forked child: the
+    inherited connections are then abandoned instead of closed, leaving the
+    parent's sockets untouched.
+    """
+    global _engine
+    global _SessionLocal
+    global _database_url
+    if _engine is not None:
+        try:
+            _engine.dispose(close=close)
+        except Exception:
+            pass
+    _engine = None
+    _SessionLocal = None
+    _database_url = None
+
+
 def SessionLocal():
     """Compatibility wrapper: calling SessionLocal() returns a new Session
     instance. Modules that do `from db.session import SessionLocal` and then
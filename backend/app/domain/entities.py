@@ -137,7 +137,8 @@ class CalendarEvent:
         """Check if event is in the past."""
         if not self.end_time:
             return False
-        return self.end_time < datetime.now()
+        # Google returns offset-aware datetimes; all-day events are naive
+        return self.end_time < datetime.now(self.end_time.tzinfo)
 
 
 @dataclass
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import sys
@@ -12,6 +11,7 @@ from flask import (  # noqa: E402
     abort,
     flash,
     jsonify,
+    make_response,
     redirect,
     render_template,
     request,
@@ -71,6 +71,7 @@ from app.auth.google_calendar import (  # noqa: E402
     create_google_calendar_blueprint,
 )
 from app.core.limiter_config import limiter  # noqa: E402
+from app.core.startup_timing import StartupTimer  # noqa: E402
 
 # Get Google OAuth credentials
 google_client_id = os.getenv("GOOGLE_CLIENT_ID")
@@ -158,6 +159,9 @@ def get_db_status(non_blocking: bool = True) -> str:
 
 
 def create_app():  # noqa: C901
+    # Boot phase durations, logged at the end ("Startup timing")
+    startup_timer = StartupTimer()
+
     # Calculate paths based on the actual file system structure
     script_dir = os.path.dirname(
         os.path.abspath(__file__)
@@ -250,6 +254,11 @@ def create_app():  # noqa: C901
     if testing_env in ("true", "1", "yes"):
         app.config["TESTING"] = True
 
+    # gzip/brotli for HTML and JSON; registered first so it runs last
+    from app.core.compression import register_response_compression
+
+    register_response_compression(app)
+
     # Add long-lived cache headers for static assets
     @app.after_request
     def add_cache_headers(response):
@@ -263,14 +272,29 @@ def create_app():  # noqa: C901
     from app.core.logging_config import setup_logging
     import logging
 
+    # LOG_LEVEL / SQL_ECHO override the environment defaults (e.g. load tests)
+    log_level = getattr(logging, os.getenv("LOG_LEVEL", "").upper(), None)
+    if not isinstance(log_level, int):
+        log_level = None
+    sql_echo_env = os.getenv("SQL_ECHO", "").lower().strip()
     setup_logging(
         app=app,  # Pass app to register request/response hooks
-        log_level=logging.INFO if is_production else logging.DEBUG,
-        enable_sql_echo=not is_production,  # SQL echo in dev only
+        log_level=log_level or (logging.INFO if is_production else logging.DEBUG),
+        enable_sql_echo=(
+            sql_echo_env in ("1", "true", "yes")
+            if sql_echo_env
+            else not is_production  # SQL echo in dev only
+        ),
         # log_to_file controlled by LOG_TO_FILE env var (1=files, 0=stdout only)
         use_json_format=is_production,  # JSON logs in production, colored in dev
     )
 
+    # Per-request SQL query budget, N+1 detection and Server-Timing header
+    from app.core.db import register_request_query_tracking
+
+    register_request_query_tracking(app)
+    startup_timer.mark("flask_and_logging")
+
     logger = logging.getLogger(__name__)
     logger.info(
         "Logging configured",
@@ -483,12 +507,27 @@ def create_app():  # noqa: C901
             extra={"context": {"environment": env}},
         )
 
+    startup_timer.mark("config_and_sentry")
+
     # Prometheus Metrics (Task 9 - Logging and Observability)
     # Expose /metrics endpoint for Prometheus scraping
     # MUST be initialized BEFORE limiter to avoid being rate-limited
-    from prometheus_flask_exporter import PrometheusMetrics
+    from app.core.metrics import is_multiprocess_mode
+
+    # group_by="url_rule": one latency series per route template instead of
+    # one per concrete path (/extrato/2024/03, /extrato/2024/04, ...)
+    if is_multiprocess_mode():
+        # Under gunicorn every worker writes samples to PROMETHEUS_MULTIPROC_DIR
+        # and /metrics aggregates them (see gunicorn.conf.py)
+        from prometheus_flask_exporter.multiprocess import (
+            GunicornInternalPrometheusMetrics,
+        )
 
-    metrics = PrometheusMetrics(app)
+        metrics = GunicornInternalPrometheusMetrics(app, group_by="url_rule")
+    else:
+        from prometheus_flask_exporter import PrometheusMetrics
+
+        metrics = PrometheusMetrics(app, group_by="url_rule")
     # Add custom app_info metric with version (only if not already registered)
     try:
         metrics.info(
@@ -505,7 +544,12 @@ def create_app():  # noqa: C901
         )
     logger.info(
         "Prometheus metrics initialized",
-        extra={"context": {"metrics_endpoint": "/metrics"}},
+        extra={
+            "context": {
+                "metrics_endpoint": "/metrics",
+                "multiprocess": is_multiprocess_mode(),
+            }
+        },
     )
 
     # Configuration
@@ -526,7 +570,8 @@ def create_app():  # noqa: C901
     app.config["RATELIMIT_EXEMPT_PATHS"] = ["/metrics", "/pool-metrics"]
     limiter.init_app(app)
 
-    # Disable rate limiting in test mode if RATE_LIMIT_ENABLED=0
+    # Disable rate limiting in test mode (or any non-production environment,
+    # e.g. local load tests) if RATE_LIMIT_ENABLED=0
     # This is evaluated at app creation time (after pytest is loaded)
     def _is_test_mode_for_limiter():
         """Check if we're in test mode for limiter configuration."""
@@ -541,7 +586,9 @@ def create_app():  # noqa: C901
             return True
         return False
 
-    if _is_test_mode_for_limiter() and os.getenv("RATE_LIMIT_ENABLED", "1") == "0":
+    if (_is_test_mode_for_limiter() or not is_production) and os.getenv(
+        "RATE_LIMIT_ENABLED", "1"
+    ) == "0":
         limiter.enabled = False
         logger.info(
             "Rate limiting disabled for testing",
@@ -665,6 +712,8 @@ def create_app():  # noqa: C901
 
         app.wsgi_app = permissions_policy_middleware
 
+    startup_timer.mark("metrics_limiter_security")
+
     # Surface DATABASE_URL in Flask config
     # Allows other components (e.g., JSON vs JSONB) to infer dialect
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL", "")
@@ -808,6 +857,8 @@ def create_app():  # noqa: C901
                     exc_info=True,
                 )
 
+    startup_timer.mark("database")
+
     # HTTP → HTTPS Redirect Fallback (Task 3 - Production Security)
     # Render terminates TLS at edge and sets X-Forwarded-Proto header
     # This ensures any HTTP requests are redirected to HTTPS
@@ -869,32 +920,27 @@ def create_app():  # noqa: C901
     # Import models after app creation
     from app.db.base import User
 
-    # Apply database migrations (idempotent, safe to run on every startup)
-    from app.db.migrations import (
-        ensure_migration_001_applied,
-        ensure_migration_002_applied,
-        ensure_migration_003_applied,
-        ensure_migration_004_backfill_google_event_id,
-        ensure_migration_005_unified_flow_flag,
-    )
+    # Schema version gate: a single query when the schema is current.
+    # Pending migrations run via `python manage.py migrate`, or here outside
+    # production (MIGRATE_ON_STARTUP overrides), see app.db.migrations
+    from app.db.migrations import check_schema_on_startup
 
-    ensure_migration_001_applied()
-    ensure_migration_002_applied()  # Phase 1: Create migration_audit table
-    ensure_migration_003_applied()  # Phase 1: Add google_event_id to pagamentos
-    ensure_migration_004_backfill_google_event_id()  # Phase 1: Backfill google_event_id
-    ensure_migration_005_unified_flow_flag()  # Phase 3: Add per-user unified flow flag
+    check_schema_on_startup(is_production)
 
     # Ensure service account user exists for GitHub Actions automation
     from app.db.seed import ensure_service_account_user
 
     ensure_service_account_user()
+    startup_timer.mark("migrations")
+
+    # Loaders return cached UserSnapshot objects (no query on most requests)
+    from app.core.identity_cache import load_user_snapshot, register_invalidation_events
+
+    register_invalidation_events(User)
 
     @login_manager.user_loader
     def load_user(user_id):
-        from app.db.session import SessionLocal
-
-        with SessionLocal() as db:
-            return db.get(User, int(user_id))
+        return load_user_snapshot(user_id)
 
     @login_manager.request_loader
     def load_user_from_request(request):
@@ -922,13 +968,9 @@ def create_app():  # noqa: C901
         if not user_id:
             return None
 
-        # Load user from database
-        from app.db.session import SessionLocal
-
-        with SessionLocal() as db:
-            user = db.get(User, int(user_id))
-            if user and user.is_active:
-                return user
+        user = load_user_snapshot(user_id)
+        if user and user.is_active:
+            return user
 
         return None
 
@@ -1029,8 +1071,11 @@ def create_app():  # noqa: C901
     @app.route("/extrato/<int:ano>/<int:mes>")
     @login_required
     def extrato_for_period(ano, mes):
-        from app.db.base import Extrato
-        from app.db.session import SessionLocal
+        from app.core.extrato_cache import (
+            PAGE_CACHE_CONTROL,
+            extrato_page_etag,
+            get_extrato_entry,
+        )
 
         if mes < 1 or mes > 12 or ano < 2000 or ano > 2100:
             abort(404)
@@ -1039,6 +1084,7 @@ def create_app():  # noqa: C901
         selected_mes_str = requested_mes_str
         selected_ano_str = str(ano)
         bootstrap_data = None
+        page_etag = None
 
         bootstrap_mes_nome = None
         feedback_state = "warning"
@@ -1059,55 +1105,52 @@ def create_app():  # noqa: C901
             12: "Dezembro",
         }
 
-        with SessionLocal() as db:
-            stmt = select(Extrato).where(Extrato.mes == mes, Extrato.ano == ano)
-            extrato_record = db.execute(stmt).scalar_one_or_none()
-
-            if extrato_record:
-                try:
-                    record_mes = extrato_record.mes
-                    record_ano = extrato_record.ano
-                    record_mes_str = f"{record_mes:02d}"
-                    record_mes_nome = month_names_pt.get(
-                        record_mes, f"Mês {record_mes_str}"
-                    )
-                    bootstrap_data = {
-                        "mes": record_mes,
-                        "mes_nome": record_mes_nome,
-                        "ano": record_ano,
-                        "pagamentos": json.loads(extrato_record.pagamentos or "[]"),
-                        "sessoes": json.loads(extrato_record.sessoes or "[]"),
-                        "comissoes": json.loads(extrato_record.comissoes or "[]"),
-                        "gastos": json.loads(extrato_record.gastos or "[]"),
-                        "totais": json.loads(extrato_record.totais or "{}"),
-                    }
-                    selected_mes_str = record_mes_str
-                    selected_ano_str = str(record_ano)
-                    bootstrap_mes_nome = record_mes_nome
-                    feedback_state = "success"
-                    feedback_message = (
-                        f"Extrato de {record_mes_nome}/{record_ano} "
-                        "carregado automaticamente."
-                    )
-                except json.JSONDecodeError as err:
-                    app.logger.error(
-                        "Erro ao desserializar extrato para exibição: %s", err
-                    )
-                    bootstrap_data = None
-                    feedback_state = "error"
-                    feedback_message = (
-                        "Erro ao carregar dados do extrato para exibição."
-                    )
+        try:
+            entry = get_extrato_entry(mes, ano)
+        except ValueError as err:
+            app.logger.error("Erro ao desserializar extrato para exibição: %s", err)
+            entry = None
+            feedback_state = "error"
+            feedback_message = "Erro ao carregar dados do extrato para exibição."
+
+        if entry is not None:
+            # Same snapshot, session and deploy: the browser's copy is current
+            page_etag = extrato_page_etag(entry)
+            if page_etag and request.if_none_match.contains_weak(page_etag):
+                response = make_response("", 304)
+                response.set_etag(page_etag, weak=True)
+                response.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+                return response
+
+            record_mes = entry.data["mes"]
+            record_ano = entry.data["ano"]
+            record_mes_str = f"{record_mes:02d}"
+            record_mes_nome = month_names_pt.get(record_mes, f"Mês {record_mes_str}")
+            bootstrap_data = dict(entry.data, mes_nome=record_mes_nome)
+            selected_mes_str = record_mes_str
+            selected_ano_str = str(record_ano)
+            bootstrap_mes_nome = record_mes_nome
+            feedback_state = "success"
+            feedback_message = (
+                f"Extrato de {record_mes_nome}/{record_ano} "
+                "carregado automaticamente."
+            )
 
-        return render_template(
-            "extrato.html",
-            initial_mes=selected_mes_str,
-            initial_ano=selected_ano_str,
-            bootstrap_extrato=bootstrap_data,
-            bootstrap_message=feedback_message,
-            bootstrap_state=feedback_state,
-            bootstrap_mes_nome=bootstrap_mes_nome,
+        response = make_response(
+            render_template(
+                "extrato.html",
+                initial_mes=selected_mes_str,
+                initial_ano=selected_ano_str,
+                bootstrap_extrato=bootstrap_data,
+                bootstrap_message=feedback_message,
+                bootstrap_state=feedback_state,
+                bootstrap_mes_nome=bootstrap_mes_nome,
+            )
         )
+        if page_etag:
+            response.set_etag(page_etag, weak=True)
+            response.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+        return response
 
     @app.route("/financeiro")
     @login_required
@@ -1174,62 +1217,22 @@ def create_app():  # noqa: C901
         """
         SQLAlchemy connection pool metrics endpoint (Task 9).
 
-        Returns JSON with pool statistics for monitoring.
-        Useful for tracking connection usage, detecting leaks, and capacity planning.
+        Returns this process's pool counters plus a rolling window of checkout
+        wait and hold times, churn and utilization alerts, recorded from pool
+        events (app.core.pool_monitor). Used to size pool_size/max_overflow.
+        The code locations holding connections (source paths) are only
+        included for a logged-in admin.
         """
+        from app.core.pool_monitor import register_pool_monitor
         from app.db.session import get_engine
 
+        is_admin = (
+            current_user.is_authenticated
+            and getattr(current_user, "role", None) == "admin"
+        )
         try:
-            engine = get_engine()
-            pool = engine.pool
-
-            # Get pool status string and parse it
-            status_str = pool.status()
-
-            # Parse the status string
-            # Format: "Pool size: X  Connections in pool: Y
-            #          Current Overflow: Z Current Checked out connections: W"
-            # Use Dict[str, Union[str, int, float]] to allow mixed types
-            from typing import Dict, Union
-
-            pool_stats: Dict[str, Union[str, int, float]] = {
-                "status": "healthy",
-                "pool_status": status_str,
-            }
-
-            # Extract metrics from status string
-            import re
-
-            size_match = re.search(r"Pool size:\s*(\d+)", status_str)
-            in_pool_match = re.search(r"Connections in pool:\s*(\d+)", status_str)
-            overflow_match = re.search(r"Current Overflow:\s*(-?\d+)", status_str)
-            checked_out_match = re.search(
-                r"Current Checked out connections:\s*(\d+)", status_str
-            )
-
-            if size_match:
-                pool_stats["pool_size"] = int(size_match.group(1))
-            if in_pool_match:
-                pool_stats["connections_in_pool"] = int(in_pool_match.group(1))
-            if overflow_match:
-                pool_stats["overflow"] = int(overflow_match.group(1))
-            if checked_out_match:
-                pool_stats["checked_out"] = int(checked_out_match.group(1))
-
-            # Calculate utilization if we have the data
-            if "pool_size" in pool_stats and "checked_out" in pool_stats:
-                pool_size_val = pool_stats["pool_size"]
-                checked_out_val = pool_stats["checked_out"]
-                if isinstance(pool_size_val, int) and isinstance(checked_out_val, int):
-                    if pool_size_val > 0:
-                        pool_stats["utilization_percent"] = round(
-                            (checked_out_val / pool_size_val) * 100, 2
-                        )
-                    else:
-                        pool_stats["utilization_percent"] = 0.0
-
-            return jsonify(pool_stats), 200
-
+            monitor = register_pool_monitor(get_engine())
+            return jsonify(monitor.snapshot(include_locations=is_admin)), 200
         except Exception as e:
             logger.error(
                 "Failed to retrieve pool metrics",
@@ -1378,10 +1381,14 @@ def create_app():  # noqa: C901
             logger.error(f"Error querying OAuth providers: {str(e)}")
             return jsonify({"error": str(e)}), 500
 
+    startup_timer.mark("routes")
+
     # Register blueprints/controllers here
 
     from app.controllers.admin_alerts_controller import admin_alerts_bp
     from app.controllers.admin_extrato_controller import admin_extrato_bp
+    from app.controllers.admin_jobs_controller import admin_jobs_bp
+    from app.controllers.admin_scheduler_controller import admin_scheduler_bp
     from app.controllers.api_controller import api_bp
     from app.controllers.artist_controller import artist_bp
     from app.controllers.auth_controller import auth_bp
@@ -1414,6 +1421,8 @@ def create_app():  # noqa: C901
     app.register_blueprint(health_bp)
     app.register_blueprint(admin_alerts_bp)
     app.register_blueprint(admin_extrato_bp)
+    app.register_blueprint(admin_jobs_bp)
+    app.register_blueprint(admin_scheduler_bp)
     app.register_blueprint(reports_bp)
 
     # CRITICAL FIX: Configure SQLAlchemy storage for Flask-Dance
@@ -1540,7 +1549,10 @@ def create_app():  # noqa: C901
         },
     )
 
+    startup_timer.mark("blueprints")
+
     # Register template helper functions
+    from app.core.fragment_cache import cached_fragment, register_change_counters
     from app.utils.template_helpers import (
         format_client_name,
         format_currency,
@@ -1551,6 +1563,7 @@ def create_app():  # noqa: C901
 
     app.jinja_env.globals.update(
         {
+            "cached_fragment": cached_fragment,
             "format_client_name": format_client_name,
             "format_currency": format_currency,
             "format_currency_dot": format_currency_dot,
@@ -1559,7 +1572,23 @@ def create_app():  # noqa: C901
         }
     )
 
+    # Fragment cache version keys: commits bump table_versions
+    register_change_counters()
+
+    # Fingerprinted bundles from `scripts/build_assets.py` (sources without it)
+    from app.core.assets import register_asset_bundles
+
+    register_asset_bundles(app)
+
     logger.info("Template helper functions registered")
+    startup_timer.mark("templates_and_assets")
+
+    # Background job queue: extrato checks, backups and client syncs. The
+    # worker threads are started by gunicorn's post_worker_init hook
+    # (gunicorn.conf.py); other processes run enqueued jobs inline.
+    from app.services import background_jobs  # noqa: F401 - registers job types
+
+    startup_timer.mark("job_handlers")
 
     # Initialize background token refresh scheduler
     try:
@@ -1713,6 +1742,33 @@ def create_app():  # noqa: C901
                     exc_info=True,
                 )
 
+        def rebalance_inventory_ranks_job():
+            """Shorten inventory rank keys once drag & drop has made them long."""
+            from app.repositories.inventory_repository import InventoryRepository
+            from app.services.inventory_service import InventoryService
+
+            try:
+                with SessionLocal() as db:
+                    rows = InventoryService(InventoryRepository(db)).rebalance_ranks()
+                if rows:
+                    logger.info(
+                        "Inventory rank keys rebalanced",
+                        extra={
+                            "context": {"job": "inventory_rank_rebalance", "rows": rows}
+                        },
+                    )
+            except Exception as e:
+                logger.error(
+                    "Error in inventory rank rebalance",
+                    extra={
+                        "context": {
+                            "job": "inventory_rank_rebalance",
+                            "error": str(e),
+                        }
+                    },
+                    exc_info=True,
+                )
+
         # Start background scheduler for token refresh
         scheduler = BackgroundScheduler()
         scheduler.add_job(
@@ -1753,7 +1809,19 @@ def create_app():  # noqa: C901
                 extra={"context": {"ENABLE_MONTHLY_EXTRATO_JOB": "false"}},
             )
 
-        scheduler.start()
+        scheduler.add_job(
+            rebalance_inventory_ranks_job,
+            trigger=CronTrigger(hour=3, minute=30),  # Daily at 03:30 AM
+            id="inventory_rank_rebalance",
+            name="Rebalance inventory rank keys",
+            replace_existing=True,
+        )
+
+        # Paused in every process: only the elected leader resumes it, so each
+        # job runs once across workers and replicas. Gunicorn workers join the
+        # election in post_worker_init (gunicorn.conf.py); other processes
+        # keep it paused.
+        scheduler.start(paused=True)
         logger.info(
             "Background scheduler started with token refresh and monthly extrato jobs"
         )
@@ -1773,6 +1841,8 @@ def create_app():  # noqa: C901
             exc_info=True,
         )
 
+    startup_timer.mark("scheduler")
+
     # Add CLI commands
     @app.cli.command("reset-seed-test")
     def reset_seed_test_command():
@@ -1781,4 +1851,7 @@ def create_app():  # noqa: C901
 
         sys.exit(main())
 
+    app.extensions["startup_timing"] = startup_timer
+    logger.info("Startup timing", extra={"context": startup_timer.report()})
+
     return app
@@ -4,15 +4,24 @@ Single Responsibility: Handle Google Calendar API operations
 """
 
 import logging
+import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import requests
 from app.core.exceptions import ExpiredAccessTokenError
+from app.core.metrics import outbound_timer
 from app.domain.interfaces import IGoogleCalendarRepository
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_GOOGLE_CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+
+
+def google_calendar_api_url() -> str:
+    """Calendar API base URL; GOOGLE_CALENDAR_API_URL points it at a local fake."""
+    return os.getenv("GOOGLE_CALENDAR_API_URL", DEFAULT_GOOGLE_CALENDAR_API_URL)
+
 
 class GoogleCalendarRepository(IGoogleCalendarRepository):
     """
@@ -21,7 +30,7 @@ class GoogleCalendarRepository(IGoogleCalendarRepository):
     """
 
     def __init__(self):
-        self.base_url = "https://www.googleapis.com/calendar/v3"
+        self.base_url = google_calendar_api_url()
 
     def fetch_events(
         self, access_token: str, start_date: datetime, end_date: datetime
@@ -63,43 +72,46 @@ class GoogleCalendarRepository(IGoogleCalendarRepository):
                 "maxResults": 250,  # Google Calendar API limit
             }
 
-            # DEBUG: Log API call details
-            logger.info(f"DEBUG: Making Google Calendar API call")
-            logger.info(f"DEBUG: URL: {self.base_url}/calendars/primary/events")
-            logger.info(f"DEBUG: Parameters: {params}")
-            logger.info(f"DEBUG: Date range: {time_min} to {time_max}")
-
-            response = requests.get(
-                f"{self.base_url}/calendars/primary/events",
-                headers=headers,
-                params=params,
-                timeout=30,
+            # Log API call details
+            logger.debug(
+                "Google Calendar API call: GET %s/calendars/primary/events params=%s",
+                self.base_url,
+                params,
             )
 
-            # DEBUG: Log API response
-            logger.info(f"DEBUG: Google API response status: {response.status_code}")
+            with outbound_timer("google_calendar", "GET") as call:
+                response = requests.get(
+                    f"{self.base_url}/calendars/primary/events",
+                    headers=headers,
+                    params=params,
+                    timeout=30,
+                )
+                call.status = response.status_code
+
+            # Log API response
+            logger.debug(f"Google API response status: {response.status_code}")
 
             if response.status_code == 200:
                 data = response.json()
                 events_count = len(data.get("items", []))
-                logger.info(f"DEBUG: Google API returned {events_count} events")
+                logger.debug(f"Google API returned {events_count} events")
 
                 # Log sample event if any exist
                 if events_count > 0:
                     sample_event = data.get("items", [])[0]
-                    logger.info(
-                        f"DEBUG: Sample event: {sample_event.get('summary', 'No title')} - {sample_event.get('start', {})}"
+                    logger.debug(
+                        "Sample event: %s - %s",
+                        sample_event.get("summary", "No title"),
+                        sample_event.get("start", {}),
                     )
 
                 return data.get("items", [])
             elif response.status_code == 401:
-                logger.warning("DEBUG: Google Calendar API: Unauthorized access token")
+                logger.warning("Google Calendar API: Unauthorized access token")
                 raise ExpiredAccessTokenError("Access token expired, needs refresh")
             else:
-                logger.error(
-                    f"DEBUG: Google Calendar API error: {response.status_code}"
-                )
-                logger.error(f"DEBUG: Response text: {response.text}")
+                logger.error(f"Google Calendar API error: {response.status_code}")
+                logger.error(f"Response text: {response.text}")
                 return []
 
         except requests.RequestException as e:
@@ -129,12 +141,14 @@ class GoogleCalendarRepository(IGoogleCalendarRepository):
             # Ensure payload matches Google Calendar API schema
             formatted = self._format_event_for_google(event_data)
 
-            response = requests.post(
-                f"{self.base_url}/calendars/primary/events",
-                headers=headers,
-                json=formatted,
-                timeout=30,
-            )
+            with outbound_timer("google_calendar", "POST") as call:
+                response = requests.post(
+                    f"{self.base_url}/calendars/primary/events",
+                    headers=headers,
+                    json=formatted,
+                    timeout=30,
+                )
+                call.status = response.status_code
 
             if response.status_code in (200, 201):
                 created_event = response.json()
@@ -174,9 +188,11 @@ class GoogleCalendarRepository(IGoogleCalendarRepository):
             }
 
             # Make a simple request to validate token
-            response = requests.get(
-                f"{self.base_url}/calendars/primary", headers=headers, timeout=10
-            )
+            with outbound_timer("google_calendar", "GET") as call:
+                response = requests.get(
+                    f"{self.base_url}/calendars/primary", headers=headers, timeout=10
+                )
+                call.status = response.status_code
 
             if response.status_code == 200:
                 return True
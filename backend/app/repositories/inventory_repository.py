@@ -1,30 +1,171 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.core.interfaces.repository_interface import InventoryRepositoryInterface
 from app.db.base import Inventory
 from app.db.session import SessionLocal
 from app.domain.entities import InventoryItem
+from app.utils.rank_keys import MAX_KEY_LENGTH, evenly_spaced, key_between
+from sqlalchemy import (
+    Integer,
+    String,
+    column,
+    func,
+    literal,
+    select,
+    union_all,
+    update,
+    values,
+)
+
+
+def _id_table(dialect_name: str, columns: Sequence[Tuple[str, Any]], rows: Iterable):
+    """An inline ``v(id, <columns>...)`` table to join an UPDATE against.
+
+    PostgreSQL gets ``(VALUES ...) AS v (id, ...)``. SQLite cannot alias
+    VALUES columns, so other dialects get the equivalent UNION ALL of SELECTs.
+    """
+    rows = list(rows)
+    columns = [("id", Integer), *columns]
+    if dialect_name == "postgresql":
+        return values(*(column(name, type_) for name, type_ in columns), name="v").data(
+            rows
+        )
+    return union_all(
+        *(
+            select(
+                *(
+                    literal(value, type_).label(name)
+                    for value, (name, type_) in zip(row, columns)
+                )
+            )
+            for row in rows
+        )
+    ).subquery("v")
 
 
 class InventoryRepository(InventoryRepositoryInterface):
     def reorder_items(self, order_list: list[int]) -> None:
-        """Update the 'order' field for each item according to the given list of IDs."""
-        for idx, item_id in enumerate(order_list):
-            db_item = self.db.query(Inventory).filter_by(id=item_id).first()
-            if db_item:
-                setattr(db_item, "order", idx)
+        """Rewrite 'order' and 'rank' for the whole list with a single UPDATE.
+
+        Unknown IDs are ignored; a repeated ID keeps its last position.
+        """
+        positions = {item_id: idx for idx, item_id in enumerate(order_list)}
+        if not positions:
+            return
+        keys = evenly_spaced(len(positions))
+        v = self._id_table(
+            [("ord", Integer), ("rank", String)],
+            [(i, idx, keys[idx]) for idx, i in enumerate(positions)],
+        )
+        self.db.execute(
+            update(Inventory)
+            .where(Inventory.id == v.c.id)
+            .values(order=v.c.ord, rank=v.c.rank),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        self.db.commit()
+
+    def move_item(
+        self,
+        item_id: int,
+        previous_id: Optional[int] = None,
+        next_id: Optional[int] = None,
+    ) -> InventoryItem:
+        """Place an item between two neighbours by rewriting only its rank.
+
+        ``previous_id`` is the item shown right above it and ``next_id`` the
+        one right below (None at either end of the list).
+        """
+        if item_id in (previous_id, next_id):
+            raise ValueError("An item cannot be its own neighbour")
+        ids = [i for i in (item_id, previous_id, next_id) if i is not None]
+        ranks = self._ranks(ids)
+        not_found = [i for i in ids if i not in ranks]
+        if not_found:
+            raise ValueError(f"Item not found: {not_found}")
+
+        def bounds():
+            return (
+                ranks[previous_id] if previous_id is not None else None,
+                ranks[next_id] if next_id is not None else None,
+            )
+
+        before, after = bounds()
+        unranked = (previous_id is not None and before is None) or (
+            next_id is not None and after is None
+        )
+        if unranked or (before is not None and before == after):
+            # Rows without keys or duplicate keys: give the whole list fresh keys
+            self.rebalance_ranks(force=True)
+            ranks = self._ranks(ids)
+            before, after = bounds()
+
+        # Raises ValueError if the neighbours are no longer adjacent in this order
+        key = key_between(before, after)
+        if len(key) > MAX_KEY_LENGTH:
+            # Repeated drops into the same gap grow keys; shorten them all now
+            # rather than waiting for the daily job (rank is String(64))
+            self.rebalance_ranks(force=True)
+            ranks = self._ranks(ids)
+            key = key_between(*bounds())
+        moved = self.db.scalars(
+            update(Inventory)
+            .where(Inventory.id == item_id)
+            .values(rank=key)
+            .returning(Inventory),
+            execution_options={"populate_existing": True},
+        ).one()
+        result = self._to_domain(moved)
         self.db.commit()
+        return result
+
+    def rebalance_ranks(self, force: bool = False) -> int:
+        """Reassign short, evenly spaced keys in the current listing order.
+
+        Runs only when a key is longer than MAX_KEY_LENGTH or an item has no
+        key yet, unless ``force`` is set. Returns the number of rows rewritten.
+        """
+        if not force:
+            longest, unranked = self.db.execute(
+                select(
+                    func.max(func.length(Inventory.rank)),
+                    func.count().filter(Inventory.rank.is_(None)),
+                )
+            ).one()
+            if (longest or 0) <= MAX_KEY_LENGTH and not unranked:
+                return 0
+
+        ids = list(
+            self.db.scalars(select(Inventory.id).order_by(*self._listing_order()))
+        )
+        if not ids:
+            return 0
+        v = self._id_table([("rank", String)], zip(ids, evenly_spaced(len(ids))))
+        self.db.execute(
+            update(Inventory).where(Inventory.id == v.c.id).values(rank=v.c.rank),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        self.db.commit()
+        return len(ids)
 
     def __init__(self, db_session=None):
         self.db = db_session or SessionLocal()
 
     def add(self, item: InventoryItem) -> InventoryItem:
+        # New items go to the top of the list, like before
+        key = key_between(None, self.db.scalar(select(func.min(Inventory.rank))))
+        if len(key) > MAX_KEY_LENGTH:
+            # Every insert at the front shortens the gap below the first key;
+            # same guard as move_item
+            self.rebalance_ranks(force=True)
+            key = key_between(None, self.db.scalar(select(func.min(Inventory.rank))))
         db_item = Inventory(
             nome=item.nome,
             quantidade=item.quantidade,
             observacoes=item.observacoes,
             # New items should not have a manual order by default
             order=None,
+            rank=key,
         )
         self.db.add(db_item)
         self.db.commit()
@@ -53,33 +194,68 @@ class InventoryRepository(InventoryRepositoryInterface):
         return self._to_domain(db_item) if db_item else None
 
     def list_all(self) -> List[InventoryItem]:
-        # Return items in two groups to satisfy ordering requirements:
-        # 1) Items without manual 'order' (NULL) sorted by created_at DESC (newest first)
-        # 2) Items with manual 'order' defined sorted by order ASC
-        no_order_items = (
-            self.db.query(Inventory)
-            .filter(Inventory.order == None)
-            .order_by(Inventory.created_at.desc())
-            .all()
-        )
-        ordered_items = (
-            self.db.query(Inventory)
-            .filter(Inventory.order != None)
-            .order_by(Inventory.order.asc())
-            .all()
-        )
-        items = no_order_items + ordered_items
+        items = self.db.scalars(
+            select(Inventory).order_by(*self._listing_order())
+        ).all()
         return [self._to_domain(i) for i in items]
 
+    @staticmethod
+    def _listing_order():
+        # One query, two groups:
+        # 1) Items without a rank key (NULL) sorted by created_at DESC (newest first)
+        # 2) Ranked items sorted by rank ASC
+        return (
+            Inventory.rank.asc().nulls_first(),
+            Inventory.created_at.desc(),
+            Inventory.id.desc(),
+        )
+
     def change_quantity(self, item_id: int, delta: int) -> InventoryItem:
-        db_item = self.db.query(Inventory).filter_by(id=item_id).first()
-        if not db_item:
-            raise ValueError("Item not found")
-        current_qtd = getattr(db_item, "quantidade", 0) or 0
-        setattr(db_item, "quantidade", current_qtd + delta)
+        """Add ``delta`` atomically in the database (no read-modify-write)."""
+        return self.adjust_quantities({item_id: delta})[0]
+
+    def adjust_quantities(self, adjustments: Dict[int, int]) -> List[InventoryItem]:
+        """Apply ``{item_id: delta}`` in one ``UPDATE ... RETURNING`` statement.
+
+        ``quantidade = quantidade + delta`` is evaluated by the database, so
+        concurrent adjustments never overwrite each other. All or nothing: an
+        unknown item or a result below zero rolls the whole batch back.
+        """
+        if not adjustments:
+            return []
+        v = self._id_table([("delta", Integer)], adjustments.items())
+        new_quantity = func.coalesce(Inventory.quantidade, 0) + v.c.delta
+        updated = self.db.scalars(
+            update(Inventory)
+            .where(Inventory.id == v.c.id, new_quantity >= 0)
+            .values(quantidade=new_quantity)
+            .returning(Inventory),
+            execution_options={"populate_existing": True},
+        ).all()
+        if len(updated) != len(adjustments):
+            self.db.rollback()
+            missing = sorted(set(adjustments) - {i.id for i in updated})
+            existing = set(
+                self.db.scalars(select(Inventory.id).where(Inventory.id.in_(missing)))
+            )
+            not_found = [i for i in missing if i not in existing]
+            if not_found:
+                raise ValueError(f"Item not found: {not_found}")
+            raise ValueError(f"Quantidade não pode ser negativa: {missing}")
+        # Build results from the RETURNING rows before commit expires them
+        by_id = {i.id: self._to_domain(i) for i in updated}
         self.db.commit()
-        self.db.refresh(db_item)
-        return self._to_domain(db_item)
+        return [by_id[item_id] for item_id in adjustments]
+
+    def _ranks(self, ids: List[int]) -> Dict[int, Optional[str]]:
+        return dict(
+            self.db.execute(
+                select(Inventory.id, Inventory.rank).where(Inventory.id.in_(ids))
+            ).all()
+        )
+
+    def _id_table(self, columns, rows):
+        return _id_table(self.db.get_bind().dialect.name, columns, rows)
 
     def _to_domain(self, db_item: Inventory) -> InventoryItem:
         return InventoryItem(
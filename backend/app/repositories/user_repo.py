@@ -1,10 +1,19 @@
 from typing import List, Optional
 
+from app.core.reference_cache import (
+    ARTISTS,
+    artist_row_changed,
+    invalidate_on_change,
+    reference_cache,
+)
 from app.db.base import User as DbUser
 from app.domain.entities import User as DomainUser
 from app.domain.interfaces import IUserRepository
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
+# The artist list is cached (read on most pages); drop it when an artist changes
+invalidate_on_change(DbUser, ARTISTS, artist_row_changed)
+
 
 class UserRepository(IUserRepository):
     def get_db_by_google_id(self, google_id: str) -> Optional[DbUser]:
@@ -61,7 +70,15 @@ class UserRepository(IUserRepository):
         return self._to_domain(db_user) if db_user else None
 
     def get_all_artists(self) -> List[DomainUser]:
-        """Get all users with role 'artist', returning domain entities."""
+        """Get all users with role 'artist', returning domain entities.
+
+        Served from the reference-data cache; see app.core.reference_cache.
+        """
+        return reference_cache.get(
+            ARTISTS, self._load_all_artists, scope=self.db.get_bind()
+        )
+
+    def _load_all_artists(self) -> List[DomainUser]:
         db_artists = (
             self.db.query(DbUser).filter_by(role="artist").order_by(DbUser.name).all()
         )
@@ -1,11 +1,28 @@
 import json
+import logging
+import os
+import threading
 from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterator, List, Optional
 
 from flask import current_app, has_app_context
 
 _ALERT_LEVELS = {"WARNING", "ERROR", "CRITICAL"}
+_MAX_LIMIT = 500
+
+# Newest alerts seen by this process, appended by AlertBufferHandler
+_ALERT_BUFFER: Deque[Dict[str, Any]] = deque(maxlen=_MAX_LIMIT)
+_BUFFER_LOCK = threading.Lock()
+
+# Last tail read of the shared log file, reused while the file is unchanged:
+# (path, size, mtime_ns) -> (alerts, read exhausted the tail window)
+_FILE_CACHE: Dict[Any, Any] = {}
+
+# Tail reads stop after this many bytes from the end of the log
+_TAIL_BLOCK_SIZE = 64 * 1024
+_TAIL_MAX_BYTES = int(os.getenv("ALERT_TAIL_MAX_BYTES", str(4 * 1024 * 1024)))
 
 
 def _default_log_path() -> Path:
@@ -26,17 +43,11 @@ def _sanitize_context(raw_context: Any) -> Dict[str, Any]:
     return context_copy
 
 
-def _parse_line(line: str) -> Optional[Dict[str, Any]]:
-    line = line.strip()
-    if not line:
-        return None
-    try:
-        payload = json.loads(line)
-    except json.JSONDecodeError:
-        return None
-
-    level = str(payload.get("level", "")).upper()
-    context = _sanitize_context(payload.get("context"))
+def _build_entry(
+    level: str, timestamp: Any, message: str, raw_context: Any
+) -> Optional[Dict[str, Any]]:
+    level = level.upper()
+    context = _sanitize_context(raw_context)
 
     alert_type = context.get("alert_type") or level.lower()
     severity = context.get("severity") or level.lower()
@@ -45,36 +56,133 @@ def _parse_line(line: str) -> Optional[Dict[str, Any]]:
         return None
 
     return {
-        "timestamp": payload.get("timestamp"),
-        "message": payload.get("message", ""),
+        "timestamp": timestamp,
+        "message": message,
         "alert_type": alert_type,
         "severity": severity.lower(),
         "details": context,
     }
 
 
-def get_recent_alerts(limit: int = 50) -> List[Dict[str, Any]]:
-    limit = max(1, min(limit, 500))
-    log_path = _default_log_path()
-    if not log_path.exists():
-        return []
+def _parse_line(line: str) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        payload = json.loads(line)
+    except json.JSONDecodeError:
+        return None
 
-    buffer_size = max(limit * 4, 200)
-    lines: deque[str] = deque(maxlen=buffer_size)
+    return _build_entry(
+        str(payload.get("level", "")),
+        payload.get("timestamp"),
+        payload.get("message", ""),
+        payload.get("context"),
+    )
+
+
+class AlertBufferHandler(logging.Handler):
+    """
+    Logging handler that keeps WARNING+ and ``alert_type`` records in memory.
+
+    Installed by setup_logging next to the file handlers. The buffer only
+    holds this process's alerts, so the dashboard uses it only when there is
+    no log file; gunicorn workers share the file.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            context = getattr(record, "context", None)
+            if record.levelno < logging.WARNING and not (
+                isinstance(context, dict) and context.get("alert_type")
+            ):
+                return
+            entry = _build_entry(
+                logging.getLevelName(record.levelno),
+                datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                record.getMessage(),
+                context,
+            )
+            if entry is not None:
+                with _BUFFER_LOCK:
+                    _ALERT_BUFFER.append(entry)
+        except Exception:
+            self.handleError(record)
+
+
+def clear_alert_buffer() -> None:
+    with _BUFFER_LOCK:
+        _ALERT_BUFFER.clear()
+        _FILE_CACHE.clear()
+
+
+def _buffered_alerts(limit: int) -> List[Dict[str, Any]]:
+    with _BUFFER_LOCK:
+        count = min(limit, len(_ALERT_BUFFER))
+        return [_ALERT_BUFFER[-1 - i] for i in range(count)]
+
+
+def _iter_lines_reversed(path: Path, max_bytes: int) -> Iterator[str]:
+    """Yield the file's lines newest first, reading fixed blocks from the end."""
+    with path.open("rb") as logfile:
+        logfile.seek(0, os.SEEK_END)
+        position = logfile.tell()
+        stop = max(0, position - max_bytes)
+        remainder = b""
+        while position > stop:
+            size = min(_TAIL_BLOCK_SIZE, position - stop)
+            position -= size
+            logfile.seek(position)
+            lines = (logfile.read(size) + remainder).split(b"\n")
+            # The first piece may be a partial line; complete it next block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode("utf-8", errors="replace")
+        if position == 0 and remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def _tail_alerts(log_path: Path, limit: int) -> List[Dict[str, Any]]:
+    alerts: List[Dict[str, Any]] = []
     try:
-        with log_path.open("r", encoding="utf-8") as logfile:
-            for line in logfile:
-                lines.append(line)
+        for line in _iter_lines_reversed(log_path, _TAIL_MAX_BYTES):
+            entry = _parse_line(line)
+            if not entry:
+                continue
+            alerts.append(entry)
+            if len(alerts) >= limit:
+                break
     except OSError:
         return []
+    return alerts
 
-    alerts: List[Dict[str, Any]] = []
-    for line in reversed(lines):
-        entry = _parse_line(line)
-        if not entry:
-            continue
-        alerts.append(entry)
-        if len(alerts) >= limit:
-            break
 
+def get_recent_alerts(limit: int = 50) -> List[Dict[str, Any]]:
+    """Return the newest alerts first.
+
+    The log file is shared by every gunicorn worker, so it is the source
+    whenever it exists. It is tail-read backwards, so the cost depends on
+    ``limit`` rather than the size of the log. The result is cached until the
+    file's size or mtime changes. Without a log file, the in-memory ring
+    buffer (this process's alerts only) is used.
+    """
+    limit = max(1, min(limit, _MAX_LIMIT))
+    log_path = _default_log_path()
+    try:
+        stat = log_path.stat()
+    except OSError:
+        return _buffered_alerts(limit)
+
+    key = (str(log_path), stat.st_size, stat.st_mtime_ns)
+    with _BUFFER_LOCK:
+        cached = _FILE_CACHE.get(key)
+    if cached is not None:
+        alerts, exhausted = cached
+        if exhausted or len(alerts) >= limit:
+            return alerts[:limit]
+
+    alerts = _tail_alerts(log_path, limit)
+    with _BUFFER_LOCK:
+        _FILE_CACHE.clear()
+        _FILE_CACHE[key] = (alerts, len(alerts) < limit)
     return alerts
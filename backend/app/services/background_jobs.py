@@ -0,0 +1,109 @@
+"""
+Background job types run by the job queue (app.core.job_queue).
+
+- ``extrato_check``: check and, when due, generate the previous month's
+  extrato. Enqueued by ``/historico`` and ``/extrato`` views; one per month
+  at a time, and not again within EXTRATO_CHECK_COOLDOWN_SECONDS (default
+  3600) of a successful check.
+- ``backup``: CSV backup of a month's historical data. An existing backup is
+  a permanent failure, anything else is retried.
+- ``client_sync``: JotForm submissions into the clients table; also drops
+  the cached JotForm client list (app.services.client_choices).
+"""
+
+import importlib
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.job_queue import PermanentJobError, enqueue, job_handler
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTRATO_CHECK_COOLDOWN_SECONDS = 3600
+
+
+@job_handler("extrato_check")
+def run_extrato_check(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Resolved at call time so tests that patch
+    # app.services.extrato_generation.check_and_generate_extrato are effective
+    extrato_gen = importlib.import_module("app.services.extrato_generation")
+    logger.info(
+        "Starting scheduled extrato generation",
+        extra={"context": {"job": "monthly_extrato"}},
+    )
+    extrato_gen.check_and_generate_extrato()
+    return {"mes": payload.get("mes"), "ano": payload.get("ano")}
+
+
+@job_handler("backup")
+def run_backup(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app.services.backup_service import BackupService
+
+    success, message = BackupService().create_backup(
+        year=payload.get("year"), month=payload.get("month")
+    )
+    if not success:
+        if "already exists" in message:
+            raise PermanentJobError(message)
+        raise RuntimeError(message)
+    return {"message": message}
+
+
+@job_handler("client_sync")
+def run_client_sync(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app.core.reference_cache import invalidate_reference
+    from app.repositories.client_repo import ClientRepository
+    from app.services.client_choices import JOTFORM_CLIENTS
+    from app.services.client_service import ClientService
+    from app.services.jotform_service import JotFormService
+
+    jotform_service = JotFormService(
+        os.getenv("JOTFORM_API_KEY", "test-api-key"),
+        os.getenv("JOTFORM_FORM_ID", "test-form-id"),
+    )
+    with SessionLocal() as db:
+        client_service = ClientService(ClientRepository(db), jotform_service)
+        synced_clients = client_service.sync_clients_from_jotform()
+    # New submissions show up in the form dropdowns right away
+    invalidate_reference(JOTFORM_CLIENTS)
+    return {"synced": len(synced_clients)}
+
+
+def enqueue_extrato_check() -> Tuple[Dict[str, Any], bool]:
+    from app.services.extrato_core import get_previous_month
+
+    mes, ano = get_previous_month()
+    try:
+        cooldown = int(
+            os.getenv(
+                "EXTRATO_CHECK_COOLDOWN_SECONDS",
+                DEFAULT_EXTRATO_CHECK_COOLDOWN_SECONDS,
+            )
+        )
+    except ValueError:
+        cooldown = DEFAULT_EXTRATO_CHECK_COOLDOWN_SECONDS
+    return enqueue(
+        "extrato_check",
+        {"mes": mes, "ano": ano},
+        dedupe_key=f"extrato_check:{ano}-{mes:02d}",
+        cooldown_seconds=cooldown,
+    )
+
+
+def enqueue_backup(
+    year: Optional[int] = None, month: Optional[int] = None
+) -> Tuple[Dict[str, Any], bool]:
+    now = datetime.now()
+    year, month = year or now.year, month or now.month
+    return enqueue(
+        "backup",
+        {"year": year, "month": month},
+        dedupe_key=f"backup:{year}-{month:02d}",
+    )
+
+
+def enqueue_client_sync() -> Tuple[Dict[str, Any], bool]:
+    return enqueue("client_sync", dedupe_key="client_sync")
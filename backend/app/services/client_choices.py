@@ -0,0 +1,96 @@
+"""
+Client choices for the session form and the historico edit modals.
+
+At runtime the choices are ALL JotForm submissions (``{"id", "name"}``
+dicts, sorted by name); tests and deployments without JotForm credentials
+list the ``clients`` table instead.
+
+The JotForm crawl pages through up to 5000 submissions (one request per 100,
+30 s timeout each), far past the request fan-out's shared deadline. Pages
+therefore wait for it at most JOTFORM_CLIENTS_DEADLINE_SECONDS (default 60)
+and render with an empty list and a warning past that. The crawl itself
+finishes in the background and its result is kept in the reference cache
+(REFERENCE_CACHE_TTL_SECONDS), so the next page load gets it right away.
+
+Only one crawl per process runs at a time. Pages arriving during it do not
+wait for it, since they would hold request fan-out threads: they get the
+cached list, or render with the warning when there is none.
+"""
+
+import os
+import threading
+from typing import Any, Optional
+
+from app.core.reference_cache import reference_cache
+from app.core.runtime import env_number
+from app.db.base import Client
+
+DEFAULT_JOTFORM_DEADLINE_SECONDS = 60.0
+
+JOTFORM_CLIENTS = "jotform_clients"
+
+CLIENTS_UNAVAILABLE_MESSAGE = (
+    "Não foi possível carregar a lista de clientes. "
+    "Tente novamente em alguns instantes."
+)
+
+# Held while crawling; never waited on
+_crawl_lock = threading.Lock()
+
+
+def use_jotform_clients() -> bool:
+    """JotForm is the client source at runtime; tests and unset env use the DB."""
+    testing_flag = os.getenv("TESTING", "").lower() in ("1", "true", "yes")
+    return (
+        not testing_flag
+        and bool(os.getenv("JOTFORM_API_KEY", ""))
+        and bool(os.getenv("JOTFORM_FORM_ID", ""))
+    )
+
+
+def jotform_clients_deadline() -> float:
+    """Seconds a page waits for the JotForm client list."""
+    return env_number(
+        "JOTFORM_CLIENTS_DEADLINE_SECONDS", DEFAULT_JOTFORM_DEADLINE_SECONDS, float
+    )
+
+
+def load_client_choices(db: Any, use_jotform: bool) -> Optional[list]:
+    """Clients for a dropdown: ALL JotForm submissions, or DB rows.
+
+    None while another request is crawling JotForm and nothing is cached.
+    """
+    if not use_jotform:
+        return db.query(Client).order_by(Client.name).all()
+
+    form_id = os.getenv("JOTFORM_FORM_ID", "")
+    if not _crawl_lock.acquire(blocking=False):
+        # None is not cached: the running crawl stores its result as usual
+        return reference_cache.get(JOTFORM_CLIENTS, lambda: None, scope=form_id)
+    try:
+        return reference_cache.get(
+            JOTFORM_CLIENTS, lambda: _crawl_jotform_clients(db), scope=form_id
+        )
+    finally:
+        _crawl_lock.release()
+
+
+def _crawl_jotform_clients(db: Any) -> list:
+    from app.repositories.client_repo import ClientRepository
+    from app.services.client_service import ClientService
+    from app.services.jotform_service import JotFormService
+
+    client_repo = ClientRepository(db)
+    jotform_service = JotFormService(
+        os.getenv("JOTFORM_API_KEY", ""), os.getenv("JOTFORM_FORM_ID", "")
+    )
+    client_service = ClientService(client_repo, jotform_service)
+
+    clients = []
+    for submission in client_service.get_jotform_submissions_for_display():
+        client_name = submission.get("client_name", "Sem nome")
+        submission_id = submission.get("id", "")
+        if client_name and client_name != "Sem nome":
+            clients.append({"id": submission_id, "name": client_name})
+    clients.sort(key=lambda x: x["name"].lower())
+    return clients
@@ -10,6 +10,7 @@ import logging
 import uuid
 from datetime import datetime
 
+from app.core.metrics import track_extrato_job
 from app.db.base import Extrato
 from app.db.session import SessionLocal
 from app.services.extrato_core import _log_extrato_run
@@ -32,6 +33,7 @@ logger = logging.getLogger(__name__)
 LAST_RUN_INFO: dict = {"correlation_id": None, "stage": None, "error": None}
 
 
+@track_extrato_job
 def generate_extrato_with_atomic_transaction(
     mes: int, ano: int, force: bool = False
 ) -> bool:
@@ -5,10 +5,8 @@ This module contains the automation logic for monthly extrato generation,
 background processing, and scheduling.
 """
 
-import importlib
 import logging
 import os
-import threading
 from datetime import datetime
 
 from app.db.base import ExtratoRunLog
@@ -62,10 +60,11 @@ def should_run_monthly_extrato():
 
 
 def run_extrato_in_background():
-    """Run extrato generation in background thread with error handling.
+    """Queue the monthly extrato check (a job per month, single-flight).
 
-    This is a shared utility function to avoid code duplication between
-    main.py and historico_controller.py.
+    Shared by main.py (/extrato) and historico_controller.py. The check runs
+    on the job queue workers (app.services.background_jobs), not in the
+    request.
     """
     # Check if background processing is disabled (for testing or CI)
     disable_background = os.getenv(
@@ -86,25 +85,13 @@ def run_extrato_in_background():
         )
         return
 
-    # Run in background thread
-    def run_extrato_generation():
-        try:
-            # Resolve the function at call time so tests that patch app.services.extrato_generation.check_and_generate_extrato are effective
-            extrato_gen = importlib.import_module("app.services.extrato_generation")
-            # add structured context before starting (tests assert presence of 'monthly_extrato')
-            logger.info(
-                "Starting scheduled extrato generation",
-                extra={"context": {"job": "monthly_extrato"}},
-            )
-            extrato_gen.check_and_generate_extrato()
-        except Exception as e:
-            # Use the exact message the unit test asserts and include structured context
-            logger.error(
-                "Error in scheduled extrato generation",
-                extra={"context": {"job": "monthly_extrato", "error": str(e)}},
-                exc_info=True,
-            )
+    try:
+        from app.services.background_jobs import enqueue_extrato_check
 
-    # Start background thread
-    thread = threading.Thread(target=run_extrato_generation, daemon=True)
-    thread.start()
+        enqueue_extrato_check()
+    except Exception as e:
+        logger.error(
+            "Could not queue the extrato check",
+            extra={"context": {"job": "monthly_extrato", "error": str(e)}},
+            exc_info=True,
+        )
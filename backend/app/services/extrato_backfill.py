@@ -0,0 +1,226 @@
+"""
+Extrato Backfill Service - Multi-month regeneration.
+
+This module regenerates extratos for a range of months. Months are independent
+(each extrato only reads its own date window), so they run concurrently in a
+bounded process pool where every worker builds its own engine. Each month's
+outcome and duration is recorded in ExtratoRunLog under a batch id so a failed
+batch can be resumed without redoing the months that already succeeded.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.db.base import Extrato, ExtratoRunLog
+from app.db.session import SessionLocal, get_engine
+from app.services.extrato_backfill_worker import init_worker, run_month
+from app.services.extrato_core import _record_extrato_run
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Upper bound on worker processes; each one holds its own connection pool
+MAX_BACKFILL_WORKERS = 8
+
+Month = Tuple[int, int]  # (mes, ano)
+
+
+def parse_month(value: str) -> Month:
+    """Parse a ``YYYY-MM`` string into a ``(mes, ano)`` tuple.
+
+    Raises:
+        ValueError: If the value is not a valid year/month.
+    """
+    try:
+        ano_str, mes_str = value.strip().split("-", 1)
+        mes, ano = int(mes_str), int(ano_str)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
+    if mes < 1 or mes > 12 or ano < 2000 or ano > 2100:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
+    return mes, ano
+
+
+def month_range(start: Month, end: Month) -> List[Month]:
+    """Return every ``(mes, ano)`` from start to end, both inclusive."""
+    start_index = start[1] * 12 + (start[0] - 1)
+    end_index = end[1] * 12 + (end[0] - 1)
+    if end_index < start_index:
+        raise ValueError("End month must not be before start month")
+    return [
+        (index % 12 + 1, index // 12) for index in range(start_index, end_index + 1)
+    ]
+
+
+def find_months_to_skip(
+    months: Iterable[Month], force: bool = False, batch_id: Optional[str] = None
+) -> Set[Month]:
+    """Return the months the backfill does not need to (re)generate.
+
+    - Without ``force``, months that already have an extrato are skipped
+      (generation would refuse to overwrite them anyway).
+    - With ``batch_id`` (resume), months that already succeeded in that batch
+      are skipped, so only failed or unprocessed months run again.
+    """
+    months = list(months)
+    if not months:
+        return set()
+
+    years = {ano for _, ano in months}
+    wanted = set(months)
+    skip: Set[Month] = set()
+
+    db = SessionLocal()
+    try:
+        if not force:
+            rows = (
+                db.query(Extrato.mes, Extrato.ano).filter(Extrato.ano.in_(years)).all()
+            )
+            skip.update((mes, ano) for mes, ano in rows if (mes, ano) in wanted)
+
+        if batch_id:
+            rows = (
+                db.query(ExtratoRunLog.mes, ExtratoRunLog.ano)
+                .filter(
+                    ExtratoRunLog.batch_id == batch_id,
+                    ExtratoRunLog.status == "success",
+                    ExtratoRunLog.ano.in_(years),
+                )
+                .all()
+            )
+            skip.update((mes, ano) for mes, ano in rows if (mes, ano) in wanted)
+    finally:
+        db.close()
+
+    return skip
+
+
+def _resolve_workers(requested: Optional[int], month_count: int) -> int:
+    if requested is None:
+        requested = min(os.cpu_count() or 1, 4)
+    workers = max(1, min(requested, MAX_BACKFILL_WORKERS, max(month_count, 1)))
+
+    # SQLite serialises writers; concurrent atomic transactions would only
+    # fail with "database is locked", so run the months one after another.
+    if workers > 1 and get_engine().dialect.name == "sqlite":
+        logger.info(
+            "SQLite detected - running extrato backfill with a single worker",
+            extra={"context": {"requested_workers": requested}},
+        )
+        workers = 1
+    return workers
+
+
+def backfill_extratos(
+    start: Month,
+    end: Month,
+    workers: Optional[int] = None,
+    force: bool = False,
+    resume_batch_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Regenerate extratos for every month between start and end (inclusive).
+
+    Args:
+        start: First month as ``(mes, ano)``
+        end: Last month as ``(mes, ano)``
+        workers: Maximum worker processes (default: min(cpu_count, 4))
+        force: Overwrite extratos that already exist
+        resume_batch_id: Batch id of a previous run to resume; months that
+            already succeeded in that batch are skipped
+
+    Returns:
+        dict with ``batch_id``, ``results`` (one entry per processed month,
+        ordered chronologically), ``skipped`` and ``failed`` month lists and
+        the total ``duration_ms``.
+    """
+    months = month_range(start, end)
+    batch_id = resume_batch_id or str(uuid.uuid4())[:8]
+    skip = find_months_to_skip(months, force=force, batch_id=resume_batch_id)
+    pending = [m for m in months if m not in skip]
+    workers = _resolve_workers(workers, len(pending))
+
+    logger.info(
+        "Starting extrato backfill",
+        extra={
+            "context": {
+                "batch_id": batch_id,
+                "months": len(months),
+                "pending": len(pending),
+                "skipped": len(skip),
+                "workers": workers,
+                "force": force,
+                "resumed": bool(resume_batch_id),
+            }
+        },
+    )
+
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+
+    if workers == 1:
+        for mes, ano in pending:
+            results.append(run_month(mes, ano, force, batch_id))
+    elif pending:
+        # spawn: children must not inherit the parent's threads or pooled
+        # connections. They only import extrato_backfill_worker and what it
+        # needs; importing the app package does not create the application.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=init_worker
+        ) as executor:
+            futures = {
+                executor.submit(run_month, mes, ano, force, batch_id): (mes, ano)
+                for mes, ano in pending
+            }
+            for future in as_completed(futures):
+                mes, ano = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # Worker died before it could record the outcome itself
+                    _record_extrato_run(
+                        mes,
+                        ano,
+                        "error",
+                        f"Backfill {batch_id} failed: {e}",
+                        batch_id=batch_id,
+                    )
+                    results.append(
+                        {
+                            "mes": mes,
+                            "ano": ano,
+                            "success": False,
+                            "duration_ms": None,
+                            "error": str(e),
+                        }
+                    )
+
+    results.sort(key=lambda r: (r["ano"], r["mes"]))
+    failed = [(r["mes"], r["ano"]) for r in results if not r["success"]]
+    duration_ms = int((time.perf_counter() - started) * 1000)
+
+    log = logger.warning if failed else logger.info
+    log(
+        "Extrato backfill finished",
+        extra={
+            "context": {
+                "batch_id": batch_id,
+                "processed": len(results),
+                "failed": len(failed),
+                "duration_ms": duration_ms,
+            }
+        },
+    )
+
+    return {
+        "batch_id": batch_id,
+        "results": results,
+        "skipped": sorted(skip, key=lambda m: (m[1], m[0])),
+        "failed": failed,
+        "duration_ms": duration_ms,
+    }
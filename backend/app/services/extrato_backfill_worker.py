@@ -0,0 +1,66 @@
+"""
+Extrato backfill pool worker.
+
+The unit of work of ``extrato_backfill``'s process pool. Spawned workers
+import this module to unpickle ``run_month``, so it only depends on the
+database layer and the extrato services: no Flask app, scheduler or job
+workers are started in the children.
+"""
+
+import importlib
+import time
+from typing import Any, Dict, Optional
+
+from app.db.session import dispose_engine, get_engine
+from app.services.extrato_core import _record_extrato_run
+
+
+def init_worker() -> None:
+    """Process pool initializer: give the worker its own engine and pool."""
+    dispose_engine(close=False)
+    get_engine()
+
+
+def run_month(
+    mes: int, ano: int, force: bool = False, batch_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Generate one month's extrato and record its outcome and duration.
+
+    This is the unit of work executed inside each pool worker. It never raises:
+    failures are returned (and logged to ExtratoRunLog) so the parent can keep
+    collecting the other months.
+    """
+    start = time.perf_counter()
+    error: Optional[str] = None
+    try:
+        # Resolve at call time so tests patching extrato_atomic are effective
+        extrato_atomic = importlib.import_module("app.services.extrato_atomic")
+        success = bool(
+            extrato_atomic.generate_extrato_with_atomic_transaction(
+                mes, ano, force=force
+            )
+        )
+        if not success:
+            error = extrato_atomic.LAST_RUN_INFO.get("error") or "Generation failed"
+    except Exception as e:
+        success = False
+        error = str(e)
+
+    duration_ms = int((time.perf_counter() - start) * 1000)
+    status = "success" if success else "error"
+    message = (
+        f"Backfill {batch_id} completed"
+        if success
+        else f"Backfill {batch_id} failed: {error}"
+    )
+    _record_extrato_run(
+        mes, ano, status, message, duration_ms=duration_ms, batch_id=batch_id
+    )
+
+    return {
+        "mes": mes,
+        "ano": ano,
+        "success": success,
+        "duration_ms": duration_ms,
+        "error": error,
+    }
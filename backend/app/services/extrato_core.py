@@ -10,7 +10,7 @@ import os
 from pathlib import Path
 from datetime import datetime, timedelta
 from logging.handlers import RotatingFileHandler
-from typing import Any, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from app.core import config
 from app.db.base import (
@@ -250,8 +250,8 @@ def query_data(db, mes, ano):
         pagamentos_query_base,
         joinedload(Pagamento.cliente),
         joinedload(Pagamento.artista),
-        joinedload(Pagamento.sessao),
-        joinedload(Pagamento.comissoes),
+        joinedload(Pagamento.sessao).joinedload(Sessao.cliente),
+        joinedload(Pagamento.comissoes).joinedload(Comissao.artista),
     )
     pagamentos_query = _safe_filter(
         pagamentos_query, Pagamento.data >= start_date, Pagamento.data < end_date
@@ -307,7 +307,12 @@ def query_data(db, mes, ano):
     try:
         extra_comissoes = (
             db.query(Comissao)
-            .options(joinedload(Comissao.artista))
+            .options(
+                joinedload(Comissao.artista),
+                joinedload(Comissao.pagamento)
+                .joinedload(Pagamento.sessao)
+                .joinedload(Sessao.cliente),
+            )
             .filter(Comissao.created_at >= start_date, Comissao.created_at < end_date)
             .all()
         )
@@ -430,6 +435,238 @@ def serialize_data(pagamentos, sessoes, comissoes, gastos):
     return pagamentos_data, sessoes_data, comissoes_data, gastos_data
 
 
+def _to_cents(value: Any) -> int:
+    """Convert a serialized amount (float/Decimal/str) to integer cents."""
+    amount = _safe_float(value, 0.0) or 0.0
+    return int(round(amount * 100))
+
+
+def _debug_enabled() -> bool:
+    return os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+class TotalsAggregator:
+    """
+    Single-pass, mergeable accumulator for the extrato ``totais`` dict.
+
+    Records (the dicts produced by serialize_data) are ingested one at a time
+    or in batches, in any order, and summed as integer cents. Partial
+    aggregators built over chunks or by workers combine with ``merge``;
+    ``totals()`` returns the same structure as calculate_totals.
+
+    Revenue dedup follows calculate_totals: an artist's receita is their
+    payments plus sessions no payment points to (``sessao_id``), and only
+    artists with commissions > 0 who also have a payment or session are
+    listed in ``por_artista``.
+    """
+
+    def __init__(self):
+        self.receita_cents = 0
+        self.comissoes_cents = 0
+        self.despesas_cents = 0
+        self.counts = {"pagamentos": 0, "sessoes": 0, "comissoes": 0, "gastos": 0}
+        self._receita_por_artista: Dict[str, int] = {}
+        self._comissao_por_artista: Dict[str, int] = {}
+        self._artistas_com_sessao: Set[str] = set()
+        # Session revenue stays pending until we know no payment covers it
+        self._sessoes: Dict[Any, List[Tuple[str, int]]] = {}
+        self._sessoes_pagas: Set[Any] = set()
+        self._formas: Dict[str, int] = {}
+        self._gastos_formas: Dict[str, int] = {}
+        self._gastos_categorias: Dict[str, int] = {}
+
+    @staticmethod
+    def _add(target: Dict[str, int], key: str, cents: int) -> None:
+        target[key] = target.get(key, 0) + cents
+
+    def add_pagamento(self, p: Dict[str, Any]) -> None:
+        self.add_batch(pagamentos=(p,))
+
+    def add_sessao(self, s: Dict[str, Any]) -> None:
+        self.add_batch(sessoes=(s,))
+
+    def add_comissao(self, c: Dict[str, Any]) -> None:
+        self.add_batch(comissoes=(c,))
+
+    def add_gasto(self, g: Dict[str, Any]) -> None:
+        self.add_batch(gastos=(g,))
+
+    def add_batch(
+        self,
+        pagamentos: Iterable[Dict[str, Any]] = (),
+        sessoes: Iterable[Dict[str, Any]] = (),
+        comissoes: Iterable[Dict[str, Any]] = (),
+        gastos: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> "TotalsAggregator":
+        # Hot loops: locals and a float fast path instead of per-record calls
+        count = 0
+        total = 0
+        por_artista = self._receita_por_artista
+        formas = self._formas
+        pagas = self._sessoes_pagas
+        for p in pagamentos:
+            valor = p.get("valor")
+            cents = round(valor * 100) if type(valor) is float else _to_cents(valor)
+            count += 1
+            total += cents
+            artista = p.get("artista_name")
+            if artista:
+                por_artista[artista] = por_artista.get(artista, 0) + cents
+            forma = p.get("forma_pagamento")
+            if forma:
+                formas[forma] = formas.get(forma, 0) + cents
+            sessao_id = p.get("sessao_id")
+            if sessao_id:
+                pagas.add(sessao_id)
+        self.counts["pagamentos"] += count
+        self.receita_cents += total
+
+        count = 0
+        pendentes = self._sessoes
+        com_sessao = self._artistas_com_sessao
+        for s in sessoes:
+            count += 1
+            artista = s.get("artista_name")
+            if artista:
+                valor = s.get("valor")
+                cents = round(valor * 100) if type(valor) is float else _to_cents(valor)
+                com_sessao.add(artista)
+                entry = (artista, cents)
+                sessao_id = s.get("id")
+                if sessao_id in pendentes:
+                    pendentes[sessao_id].append(entry)
+                else:
+                    pendentes[sessao_id] = [entry]
+        self.counts["sessoes"] += count
+
+        count = 0
+        total = 0
+        por_artista = self._comissao_por_artista
+        for c in comissoes:
+            valor = c.get("valor")
+            cents = round(valor * 100) if type(valor) is float else _to_cents(valor)
+            count += 1
+            total += cents
+            artista = c.get("artista_name")
+            if artista:
+                por_artista[artista] = por_artista.get(artista, 0) + cents
+        self.counts["comissoes"] += count
+        self.comissoes_cents += total
+
+        count = 0
+        total = 0
+        formas = self._gastos_formas
+        categorias = self._gastos_categorias
+        for g in gastos or ():
+            valor = g.get("valor")
+            cents = round(valor * 100) if type(valor) is float else _to_cents(valor)
+            count += 1
+            total += cents
+            forma = g.get("forma_pagamento")
+            if forma:
+                formas[forma] = formas.get(forma, 0) + cents
+            categoria = g.get("categoria") or "Outros"
+            categorias[categoria] = categorias.get(categoria, 0) + cents
+        self.counts["gastos"] += count
+        self.despesas_cents += total
+        return self
+
+    def merge(self, other: "TotalsAggregator") -> "TotalsAggregator":
+        """Fold another partial aggregate into this one."""
+        self.receita_cents += other.receita_cents
+        self.comissoes_cents += other.comissoes_cents
+        self.despesas_cents += other.despesas_cents
+        for key, count in other.counts.items():
+            self.counts[key] += count
+        for mine, theirs in (
+            (self._receita_por_artista, other._receita_por_artista),
+            (self._comissao_por_artista, other._comissao_por_artista),
+            (self._formas, other._formas),
+            (self._gastos_formas, other._gastos_formas),
+            (self._gastos_categorias, other._gastos_categorias),
+        ):
+            for key, cents in theirs.items():
+                self._add(mine, key, cents)
+        for sessao_id, entries in other._sessoes.items():
+            self._sessoes.setdefault(sessao_id, []).extend(entries)
+        self._artistas_com_sessao |= other._artistas_com_sessao
+        self._sessoes_pagas |= other._sessoes_pagas
+        return self
+
+    def totals(self) -> Dict[str, Any]:
+        receita_por_artista = dict(self._receita_por_artista)
+        for sessao_id, entries in self._sessoes.items():
+            if sessao_id not in self._sessoes_pagas:
+                for artista, cents in entries:
+                    self._add(receita_por_artista, artista, cents)
+
+        # Artists with commission > 0 and actual work (payments or sessions)
+        por_artista = [
+            {
+                "artista": artista,
+                "receita": receita_por_artista.get(artista, 0) / 100,
+                "comissao": cents / 100,
+            }
+            for artista, cents in self._comissao_por_artista.items()
+            if cents > 0
+            and (
+                artista in self._receita_por_artista
+                or artista in self._artistas_com_sessao
+            )
+        ]
+
+        receita_total = self.receita_cents / 100
+        comissoes_total = self.comissoes_cents / 100
+        despesas_total = self.despesas_cents / 100
+        receita_liquida = (
+            self.receita_cents - self.comissoes_cents - self.despesas_cents
+        ) / 100
+
+        if _debug_enabled():
+            logger.info(
+                f"HISTORICO_DEBUG: calculate_totals - counts:{self.counts} "
+                f"receita_total:{receita_total} comissoes_total:{comissoes_total} "
+                f"despesas_total:{despesas_total} receita_liquida:{receita_liquida}"
+            )
+            logger.info(
+                f"HISTORICO_DEBUG: Sessions with payments (IDs): {self._sessoes_pagas}"
+            )
+            excluded_artists = [
+                artista
+                for artista in receita_por_artista
+                if not self._comissao_por_artista.get(artista)
+            ]
+            if excluded_artists:
+                logger.info(
+                    f"HISTORICO_DEBUG: Artists excluded from commission summary (0% commission): {excluded_artists}"
+                )
+            for artist_data in por_artista:
+                logger.info(
+                    f"HISTORICO_DEBUG: Artist {artist_data['artista']}: Receita R${artist_data['receita']}, Comissão R${artist_data['comissao']}"
+                )
+
+        return {
+            "receita_total": receita_total,
+            # Backward-compat: some tests expect 'total_pagamentos' as an alias for receita_total
+            "total_pagamentos": receita_total,
+            "comissoes_total": comissoes_total,
+            "despesas_total": despesas_total,
+            "saldo": (self.receita_cents - self.despesas_cents) / 100,
+            "receita_liquida": receita_liquida,
+            "por_artista": por_artista,
+            "por_forma_pagamento": [
+                {"forma": k, "total": v / 100} for k, v in self._formas.items()
+            ],
+            "gastos_por_forma_pagamento": [
+                {"forma": k, "total": v / 100} for k, v in self._gastos_formas.items()
+            ],
+            "gastos_por_categoria": [
+                {"categoria": k, "total": v / 100}
+                for k, v in self._gastos_categorias.items()
+            ],
+        }
+
+
 def calculate_totals(pagamentos_data, sessoes_data, comissoes_data, gastos_data=None):
     """
     Calculate comprehensive financial totals for extrato generation.
@@ -477,181 +714,15 @@ def calculate_totals(pagamentos_data, sessoes_data, comissoes_data, gastos_data=
         Revenue calculation was fixed to count payments only, avoiding double-counting
         that occurred when both sessions and payments were included. This ensures
         accurate financial reporting based on actual money received.
-    """
-    gastos_data = gastos_data or []
-
-    # FIXED: Calculate revenue from payments only (actual money received)
-    # Previous logic incorrectly double-counted by adding sessions + payments
-    receita_total = sum(float(p.get("valor", 0)) for p in pagamentos_data)
-    comissoes_total = sum(float(c.get("valor", 0)) for c in comissoes_data)
-    despesas_total = sum(float(g.get("valor", 0)) for g in gastos_data)
-
-    # Debug logging if enabled
-    if os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes"):
-        logger.info(
-            f"HISTORICO_DEBUG: calculate_totals - receita_total:{receita_total} comissoes_total:{comissoes_total} despesas_total:{despesas_total}"
-        )
-        logger.info(
-            f"HISTORICO_DEBUG: Input data counts - payments:{len(pagamentos_data)} sessions:{len(sessoes_data)} commissions:{len(comissoes_data)}"
-        )
-        payment_ids = [p.get("id") for p in pagamentos_data]
-        session_ids = [s.get("id") for s in sessoes_data]
-        logger.info(f"HISTORICO_DEBUG: Payment IDs: {payment_ids}")
-        logger.info(f"HISTORICO_DEBUG: Session IDs: {session_ids}")
-
-    # ...existing code...
-
-    # Por artista - Only include artists with actual participation (sessions or commissions)
-    artistas = {}
-
-    # First, collect sessions that have linked payments to avoid double counting
-    sessions_with_payments = set()
-    for p in pagamentos_data:
-        if p.get("sessao_id"):  # Payment is linked to a session
-            sessions_with_payments.add(p["sessao_id"])
-            if os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes"):
-                logger.info(
-                    f"HISTORICO_DEBUG: Payment {p.get('id', 'unknown')} linked to session {p['sessao_id']}"
-                )
-
-    # Collect active artists (those with payments, unpaid sessions, or commissions)
-    active_artists = set()
-
-    # Artists with payments
-    for p in pagamentos_data:
-        if p["artista_name"]:
-            active_artists.add(p["artista_name"])
-
-    # Artists with unpaid sessions (sessions not linked to payments)
-    for s in sessoes_data:
-        if s["artista_name"] and s["id"] not in sessions_with_payments:
-            active_artists.add(s["artista_name"])
-            if os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes"):
-                logger.info(
-                    f"HISTORICO_DEBUG: Session {s['id']} is unpaid, including artist {s['artista_name']}"
-                )
-
-    # Artists with commissions (only if they have actual payments/sessions)
-    payment_artists = {p["artista_name"] for p in pagamentos_data if p["artista_name"]}
-    session_artists = {s["artista_name"] for s in sessoes_data if s["artista_name"]}
-    artists_with_actual_work = payment_artists | session_artists
-
-    for c in comissoes_data:
-        if c["artista_name"] and c["artista_name"] in artists_with_actual_work:
-            active_artists.add(c["artista_name"])
-
-    # Initialize active artists with zero values
-    for artista in active_artists:
-        artistas[artista] = {"receita": 0, "comissao": 0}
-
-    # Calculate receita from payments (actual money received)
-    for p in pagamentos_data:
-        artista = p["artista_name"]
-        if artista and artista in active_artists:
-            artistas[artista]["receita"] += p["valor"]
-
-    # Calculate receita from unpaid sessions only (to avoid double counting)
-    for s in sessoes_data:
-        artista = s["artista_name"]
-        # Only count sessions that don't have a linked payment
-        if (
-            artista
-            and artista in active_artists
-            and s["id"] not in sessions_with_payments
-        ):
-            artistas[artista]["receita"] += s["valor"]
-            if os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes"):
-                logger.info(
-                    f"HISTORICO_DEBUG: Adding unpaid session {s['id']} revenue R${s['valor']} to artist {artista}"
-                )
-
-    # Calculate commissions for active artists
-    for c in comissoes_data:
-        artista = c["artista_name"]
-        if artista and artista in active_artists:
-            artistas[artista]["comissao"] += c["valor"]
-
-    # Filter out artists with zero commissions from the summary
-    # Only include artists who have actual commission earnings (comissao > 0)
-    por_artista = [
-        {"artista": k, "receita": v["receita"], "comissao": v["comissao"]}
-        for k, v in artistas.items()
-        if v["comissao"] > 0
-    ]
-
-    # Debug logging for artist calculations
-    if os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes"):
-        logger.info(f"HISTORICO_DEBUG: Active artists found: {active_artists}")
-        logger.info(
-            f"HISTORICO_DEBUG: Sessions with payments (IDs): {sessions_with_payments}"
-        )
-        logger.info(
-            f"HISTORICO_DEBUG: Total artists in por_artista (with commissions > 0): {len(por_artista)}"
-        )
-        # Also log excluded artists
-        excluded_artists = [k for k, v in artistas.items() if v["comissao"] == 0]
-        if excluded_artists:
-            logger.info(
-                f"HISTORICO_DEBUG: Artists excluded from commission summary (0% commission): {excluded_artists}"
-            )
-        for artist_data in por_artista:
-            logger.info(
-                f"HISTORICO_DEBUG: Artist {artist_data['artista']}: Receita R${artist_data['receita']}, Comissão R${artist_data['comissao']}"
-            )
-
-    # Por forma de pagamento (receitas)
-    formas = {}
-    for p in pagamentos_data:
-        forma = p["forma_pagamento"]
-        if forma:
-            formas[forma] = formas.get(forma, 0) + p["valor"]
-
-    por_forma_pagamento = [{"forma": k, "total": v} for k, v in formas.items()]
-
-    # Gastos por forma de pagamento
-    gastos_por_forma = {}
-    for g in gastos_data:
-        forma = g.get("forma_pagamento")
-        if forma:
-            gastos_por_forma[forma] = gastos_por_forma.get(forma, 0) + g["valor"]
-    gastos_por_forma_pagamento = [
-        {"forma": k, "total": v} for k, v in gastos_por_forma.items()
-    ]
-
-    # Gastos por categoria (optional field)
-    gastos_por_categoria_map = {}
-    for g in gastos_data:
-        categoria = g.get("categoria") or "Outros"
-        gastos_por_categoria_map[categoria] = (
-            gastos_por_categoria_map.get(categoria, 0) + g["valor"]
-        )
-    gastos_por_categoria = [
-        {"categoria": k, "total": v} for k, v in gastos_por_categoria_map.items()
-    ]
 
-    saldo = receita_total - despesas_total  # commissions shown separately
-    # Receita líquida exibida no histórico: bruta - comissões - gastos
-    receita_liquida = receita_total - comissoes_total - despesas_total
-
-    # Debug logging for net revenue calculation
-    if os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes"):
-        logger.info(
-            f"HISTORICO_DEBUG: Net Revenue Calculation -> Receita Bruta: {receita_total}, Comissões: {comissoes_total}, Gastos: {despesas_total}, Receita Líquida: {receita_liquida}"
-        )
-
-    return {
-        "receita_total": receita_total,
-        # Backward-compat: some tests expect 'total_pagamentos' as an alias for receita_total
-        "total_pagamentos": receita_total,
-        "comissoes_total": comissoes_total,
-        "despesas_total": despesas_total,
-        "saldo": saldo,
-        "receita_liquida": receita_liquida,
-        "por_artista": por_artista,
-        "por_forma_pagamento": por_forma_pagamento,
-        "gastos_por_forma_pagamento": gastos_por_forma_pagamento,
-        "gastos_por_categoria": gastos_por_categoria,
-    }
+        Sums are exact (integer cents) via TotalsAggregator; use it directly to
+        accumulate chunks incrementally or merge partial results.
+    """
+    return (
+        TotalsAggregator()
+        .add_batch(pagamentos_data, sessoes_data, comissoes_data, gastos_data)
+        .totals()
+    )
 
 
 def verify_backup_before_transfer(year: int, month: int) -> bool:
@@ -943,6 +1014,57 @@ def _log_extrato_run(mes, ano, status, message=None):
         db.close()
 
 
+def _record_extrato_run(
+    mes, ano, status, message=None, duration_ms=None, batch_id=None
+):
+    """
+    Insert or update the run log row for (mes, ano, status).
+
+    Unlike _log_extrato_run, re-running a month refreshes the existing row
+    (run_at, message, duration_ms, batch_id) instead of tripping the
+    unique_extrato_run_per_month constraint. Used by the backfill command so
+    every regeneration leaves its latest timing behind.
+
+    Args:
+        mes (int): Month of the extrato generation (1-12)
+        ano (int): Year of the extrato generation
+        status (str): Status of the run ('success', 'error', ...)
+        message (str, optional): Additional message or error details
+        duration_ms (int, optional): Wall-clock duration of the run
+        batch_id (str, optional): Identifier of the backfill batch
+    """
+    from app.db.base import ExtratoRunLog
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        run_log = (
+            db.query(ExtratoRunLog)
+            .filter(
+                ExtratoRunLog.mes == mes,
+                ExtratoRunLog.ano == ano,
+                ExtratoRunLog.status == status,
+            )
+            .first()
+        )
+        if run_log is None:
+            run_log = ExtratoRunLog(mes=mes, ano=ano, status=status)
+            db.add(run_log)
+        run_log.run_at = datetime.now(config.APP_TZ)
+        run_log.message = message[:500] if message else message
+        run_log.duration_ms = duration_ms
+        run_log.batch_id = batch_id
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logging.warning(
+            "Could not record extrato run",
+            extra={"context": {"mes": mes, "ano": ano, "error": str(e)}},
+        )
+    finally:
+        db.close()
+
+
 def current_month_range():
     """
     Compute start and end datetime for the current month using application timezone.
@@ -100,9 +100,66 @@ def generate_extrato(mes, ano, force=False):
         db.close()
 
 
+def _current_month_dates():
+    from app.services.extrato_core import current_month_range
+
+    start_date, end_date = current_month_range()
+    # When filtering Date columns, normalize boundaries to dates
+    try:
+        start_date_date = (
+            start_date.date() if hasattr(start_date, "date") else start_date
+        )
+        end_date_date = end_date.date() if hasattr(end_date, "date") else end_date
+    except Exception:
+        start_date_date, end_date_date = start_date, end_date
+    return start_date_date, end_date_date
+
+
 def get_current_month_totals(db):
     """Calculate totals for the current month from the database, including gastos.
 
+    Sums and breakdowns are grouped in the database by SqlTotalsEngine (same
+    de-duplication as calculate_totals). TOTALS_ENGINE=python, or an error in
+    the SQL path, falls back to loading the rows and calling calculate_totals.
+    """
+    import os
+
+    from app.services.extrato_sql_totals import SqlTotalsEngine
+
+    if os.getenv("TOTALS_ENGINE", "sql").lower() == "python":
+        return get_current_month_totals_python(db)
+
+    start_date, end_date = _current_month_dates()
+    debug = os.getenv("HISTORICO_DEBUG", "").lower() in ("1", "true", "yes")
+    if debug:
+        logger.info(
+            f"HISTORICO_DEBUG: Current month window: {start_date} to {end_date}"
+        )
+
+    try:
+        totals = SqlTotalsEngine(db, start_date, end_date).totals()
+    except Exception as e:
+        # Best-effort: never break historico over the fast path
+        logger.warning(
+            "SQL totals failed, falling back to calculate_totals",
+            extra={"context": {"error": str(e)}},
+        )
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        return get_current_month_totals_python(db)
+
+    if debug:
+        logger.info(
+            f"HISTORICO_DEBUG: Final totals - receita_total:{totals['receita_total']} comissoes_total:{totals['comissoes_total']} despesas_total:{totals['despesas_total']} receita_liquida:{totals['receita_liquida']}"
+        )
+    return totals
+
+
+def get_current_month_totals_python(db):
+    """Current month totals from ORM rows and calculate_totals.
+
     Uses centralized current_month_range() and query_data() to ensure all entities
     are filtered by the same date window.
     """
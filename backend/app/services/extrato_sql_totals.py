@@ -0,0 +1,231 @@
+"""
+SQL totals engine - monthly financial totals computed with GROUP BY.
+
+Produces the same ``totais`` dict as extrato_core.calculate_totals without
+loading ORM objects: sums, per-artist and per-method breakdowns are grouped in
+the database and only a handful of rows come back.
+
+Two scopes mirror the two Python paths:
+- ``current``: get_current_month_totals (payments in the window, sessions
+  linked by ``Sessao.payment_id``, commissions of those payments)
+- ``extrato``: query_data (adds sessions referenced by ``Pagamento.sessao_id``
+  and commissions created inside the window)
+
+De-duplication matches calculate_totals: receita counts payments only; a
+session adds to its artist's receita only when no payment in the window
+points at it through ``sessao_id``; ``por_artista`` lists artists with
+commission > 0 who also have a payment or session.
+
+Amounts are summed as rounded integer cents so SQLite (REAL storage) and
+PostgreSQL (NUMERIC) give the same result as the Python aggregator.
+"""
+
+from datetime import date
+from typing import Any, Dict, List
+
+from app.db.base import Comissao, Gasto, Pagamento, Sessao, User
+from sqlalchemy import and_, case, func, literal_column, or_, select, union_all
+
+SCOPES = ("current", "extrato")
+
+
+def _cents(column):
+    return func.round(column * 100)
+
+
+def _sum_cents(column):
+    return func.coalesce(func.sum(_cents(column)), 0)
+
+
+def _named(name_column):
+    return and_(name_column.isnot(None), name_column != "")
+
+
+class SqlTotalsEngine:
+    """Monthly totals for ``[start_date, end_date)`` grouped in the database."""
+
+    def __init__(self, db, start_date: date, end_date: date, scope: str = "current"):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown totals scope: {scope}")
+        self.db = db
+        self.start_date = start_date
+        self.end_date = end_date
+        self.scope = scope
+
+    # -- scoped row sets ------------------------------------------------
+
+    def _pagamentos_filter(self):
+        return and_(Pagamento.data >= self.start_date, Pagamento.data < self.end_date)
+
+    def _pagamento_ids(self):
+        return select(Pagamento.id).where(self._pagamentos_filter())
+
+    def _pagamento_sessao_ids(self):
+        return select(Pagamento.sessao_id).where(
+            self._pagamentos_filter(), Pagamento.sessao_id.isnot(None)
+        )
+
+    def _sessoes_filter(self):
+        linked = Sessao.payment_id.in_(self._pagamento_ids())
+        if self.scope == "extrato":
+            return or_(linked, Sessao.id.in_(self._pagamento_sessao_ids()))
+        return linked
+
+    def _comissoes_filter(self):
+        linked = Comissao.pagamento_id.in_(self._pagamento_ids())
+        if self.scope == "extrato":
+            created = and_(
+                Comissao.created_at >= self.start_date,
+                Comissao.created_at < self.end_date,
+            )
+            return or_(linked, created)
+        return linked
+
+    def _gastos_filter(self):
+        return and_(Gasto.data >= self.start_date, Gasto.data < self.end_date)
+
+    # -- queries ------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Record counts and cent sums for the window in a single round trip."""
+
+        def scalar(*columns, where, table):
+            return select(*columns).select_from(table).where(where).scalar_subquery()
+
+        columns = []
+        for model, where in (
+            (Pagamento, self._pagamentos_filter()),
+            (Comissao, self._comissoes_filter()),
+            (Gasto, self._gastos_filter()),
+        ):
+            columns.append(scalar(func.count(), where=where, table=model))
+            columns.append(scalar(_sum_cents(model.valor), where=where, table=model))
+        columns.append(scalar(func.count(), where=self._sessoes_filter(), table=Sessao))
+
+        row = self.db.execute(select(*columns)).one()
+        return {
+            "counts": {
+                "pagamentos": int(row[0]),
+                "comissoes": int(row[2]),
+                "gastos": int(row[4]),
+                "sessoes": int(row[6]),
+            },
+            "receita_cents": int(row[1]),
+            "comissoes_cents": int(row[3]),
+            "despesas_cents": int(row[5]),
+        }
+
+    def _por_artista(self) -> List[Dict[str, Any]]:
+        """One UNION ALL of every contribution, grouped by artist name."""
+        users = User.__table__
+        pagamento_artista = users.alias("pagamento_artista")
+        sessao_artista = users.alias("sessao_artista")
+        comissao_artista = users.alias("comissao_artista")
+        unpaid = Sessao.id.notin_(self._pagamento_sessao_ids())
+
+        contributions = union_all(
+            select(
+                pagamento_artista.c.name.label("artista"),
+                _cents(Pagamento.valor).label("receita"),
+                literal_column("0").label("comissao"),
+                literal_column("1").label("trabalho"),
+            )
+            .join(pagamento_artista, pagamento_artista.c.id == Pagamento.artista_id)
+            .where(self._pagamentos_filter(), _named(pagamento_artista.c.name)),
+            # Paid sessions mark the artist as working but add no receita
+            select(
+                sessao_artista.c.name,
+                case((unpaid, _cents(Sessao.valor)), else_=0),
+                literal_column("0"),
+                literal_column("1"),
+            )
+            .join(sessao_artista, sessao_artista.c.id == Sessao.artista_id)
+            .where(self._sessoes_filter(), _named(sessao_artista.c.name)),
+            select(
+                comissao_artista.c.name,
+                literal_column("0"),
+                _cents(Comissao.valor),
+                literal_column("0"),
+            )
+            .join(comissao_artista, comissao_artista.c.id == Comissao.artista_id)
+            .where(self._comissoes_filter(), _named(comissao_artista.c.name)),
+        ).subquery()
+
+        comissao = func.sum(contributions.c.comissao)
+        rows = self.db.execute(
+            select(
+                contributions.c.artista,
+                func.sum(contributions.c.receita),
+                comissao,
+            )
+            .group_by(contributions.c.artista)
+            .having(and_(comissao > 0, func.sum(contributions.c.trabalho) > 0))
+            .order_by(contributions.c.artista)
+        ).all()
+        return [
+            {"artista": name, "receita": int(receita) / 100, "comissao": int(com) / 100}
+            for name, receita, com in rows
+        ]
+
+    def _grouped(self, key, value, where) -> List[tuple]:
+        total = _sum_cents(value)
+        return self.db.execute(
+            select(key, total)
+            .where(where, _named(key))
+            .group_by(key)
+            .order_by(total.desc(), key)
+        ).all()
+
+    def totals(self) -> Dict[str, Any]:
+        """The calculate_totals dict for the window."""
+        summary = self.summary()
+        receita = summary["receita_cents"]
+        comissoes = summary["comissoes_cents"]
+        despesas = summary["despesas_cents"]
+
+        formas = self._grouped(
+            Pagamento.forma_pagamento, Pagamento.valor, self._pagamentos_filter()
+        )
+        gastos_formas = self._grouped(
+            Gasto.forma_pagamento, Gasto.valor, self._gastos_filter()
+        )
+        # Gasto has no categoria column yet: everything falls under "Outros"
+        categoria = getattr(Gasto, "categoria", None)
+        if categoria is not None:
+            gastos_categorias = self._grouped(
+                func.coalesce(func.nullif(categoria, ""), "Outros"),
+                Gasto.valor,
+                self._gastos_filter(),
+            )
+        elif summary["counts"]["gastos"]:
+            gastos_categorias = [("Outros", despesas)]
+        else:
+            gastos_categorias = []
+
+        return {
+            "receita_total": receita / 100,
+            "total_pagamentos": receita / 100,
+            "comissoes_total": comissoes / 100,
+            "despesas_total": despesas / 100,
+            "saldo": (receita - despesas) / 100,
+            "receita_liquida": (receita - comissoes - despesas) / 100,
+            "por_artista": self._por_artista(),
+            "por_forma_pagamento": [
+                {"forma": forma, "total": int(cents) / 100} for forma, cents in formas
+            ],
+            "gastos_por_forma_pagamento": [
+                {"forma": forma, "total": int(cents) / 100}
+                for forma, cents in gastos_formas
+            ],
+            "gastos_por_categoria": [
+                {"categoria": name, "total": int(cents) / 100}
+                for name, cents in gastos_categorias
+            ],
+        }
+
+
+def month_window(mes: int, ano: int):
+    """``[first day, first day of next month)`` as dates."""
+    start = date(ano, mes, 1)
+    end = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return start, end
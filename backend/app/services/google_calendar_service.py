@@ -49,57 +49,54 @@ class GoogleCalendarService(ICalendarService):
             List of CalendarEvent domain entities
         """
         try:
-            # DEBUG: Log service call details
-            logger.info(
-                f"DEBUG: GoogleCalendarService.get_user_events called for user {user_id}"
+            # Log service call details
+            logger.debug(
+                f"GoogleCalendarService.get_user_events called for user {user_id}"
             )
-            logger.info(f"DEBUG: Date range: {start_date} to {end_date}")
+            logger.debug(f"Date range: {start_date} to {end_date}")
 
             # Get access token for user
             access_token = self._get_user_access_token(user_id)
             if not access_token:
-                logger.warning(f"DEBUG: No access token found for user {user_id}")
+                logger.warning(f"No access token found for user {user_id}")
                 return []
 
-            # DEBUG: Log token status (safely)
+            # Log token status (safely)
             token_preview = (
                 access_token[:20] + "..."
                 if access_token and len(access_token) > 20
                 else "None"
             )
-            logger.info(f"DEBUG: Access token retrieved: {token_preview}")
+            logger.debug(f"Access token retrieved: {token_preview}")
 
             # Validate token before making API calls
             try:
                 if not self.calendar_repo.validate_token(access_token):
-                    logger.warning(f"DEBUG: Invalid access token for user {user_id}")
+                    logger.warning(f"Invalid access token for user {user_id}")
                     return []
-                logger.info(f"DEBUG: Token validation successful for user {user_id}")
+                logger.debug(f"Token validation successful for user {user_id}")
             except ExpiredAccessTokenError:
                 # Token is expired, trigger immediate refresh
-                logger.info(
-                    f"DEBUG: Token expired for user {user_id}, attempting refresh now"
-                )
+                logger.info(f"Token expired for user {user_id}, attempting refresh now")
                 raise  # Re-raise to trigger the refresh logic in the outer try-catch
 
             # Fetch events from Google Calendar
-            logger.info(f"DEBUG: Making Google Calendar API call for user {user_id}")
+            logger.debug(f"Making Google Calendar API call for user {user_id}")
             events_data = self.calendar_repo.fetch_events(
                 access_token, start_date, end_date
             )
 
-            # DEBUG: Log raw API response
-            logger.info(
-                f"DEBUG: Google API returned {len(events_data) if events_data else 0} events"
+            # Log raw API response
+            logger.debug(
+                f"Google API returned {len(events_data) if events_data else 0} events"
             )
             if events_data and len(events_data) > 0:
-                logger.info(
-                    f"DEBUG: First event sample: {events_data[0] if events_data else 'None'}"
-                )
+                # Lazy %-args: the sample is only rendered when DEBUG is on
+                logger.debug("First event sample: %s", events_data[0])
 
             # Convert to domain entities
             parsed_events = self._parse_events_to_domain(events_data, user_id)
-            logger.info(f"DEBUG: Parsed {len(parsed_events)} events to domain entities")
+            logger.debug(f"Parsed {len(parsed_events)} events to domain entities")
             return parsed_events
 
         except ExpiredAccessTokenError:
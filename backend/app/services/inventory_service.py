@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from app.core.interfaces.repository_interface import InventoryRepositoryInterface
 from app.core.interfaces.service_interface import InventoryServiceInterface
@@ -30,3 +30,20 @@ class InventoryService(InventoryServiceInterface):
 
     def change_quantity(self, item_id: int, delta: int) -> InventoryItem:
         return self.repository.change_quantity(item_id, delta)
+
+    def adjust_quantities(self, adjustments: Dict[int, int]) -> List[InventoryItem]:
+        """Apply several stock deltas atomically (all or nothing)."""
+        return self.repository.adjust_quantities(adjustments)
+
+    def move_item(
+        self,
+        item_id: int,
+        previous_id: Optional[int] = None,
+        next_id: Optional[int] = None,
+    ) -> InventoryItem:
+        """Move one item between its new neighbours (single-row update)."""
+        return self.repository.move_item(item_id, previous_id, next_id)
+
+    def rebalance_ranks(self, force: bool = False) -> int:
+        """Shorten rank keys when they have grown too long."""
+        return self.repository.rebalance_ranks(force)
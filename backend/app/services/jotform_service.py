@@ -10,9 +10,11 @@ This service:
 
 import json
 import logging
+import os
 from typing import List, Optional
 
 import requests
+from app.core.metrics import outbound_timer
 from app.domain.interfaces import IJotFormService
 from app.utils.client_utils import normalize_display_name
 
@@ -25,7 +27,8 @@ class JotFormService(IJotFormService):
     def __init__(self, api_key: str, form_id: str):
         self.api_key = api_key
         self.form_id = form_id
-        self.base_url = "https://api.jotform.com"
+        # JOTFORM_API_URL points the client at a local fake (load tests)
+        self.base_url = os.getenv("JOTFORM_API_URL", "https://api.jotform.com")
 
     def fetch_submissions(self) -> List[dict]:
         """Fetch all relevant submissions from JotForm API with pagination.
@@ -55,7 +58,9 @@ class JotFormService(IJotFormService):
                 params = {"apiKey": self.api_key, "offset": offset, "limit": limit}
 
                 # Fetch batch with timeout
-                response = requests.get(url, params=params, timeout=30)
+                with outbound_timer("jotform", "GET") as call:
+                    response = requests.get(url, params=params, timeout=30)
+                    call.status = response.status_code
                 response.raise_for_status()
 
                 data = response.json()
@@ -139,7 +144,9 @@ class JotFormService(IJotFormService):
             url = f"{self.base_url}/submission/{submission_id}"
             params = {"apiKey": self.api_key}
 
-            response = requests.get(url, params=params, timeout=10)
+            with outbound_timer("jotform", "GET") as call:
+                response = requests.get(url, params=params, timeout=10)
+                call.status = response.status_code
             response.raise_for_status()
 
             data = response.json()
@@ -9,8 +9,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import requests
+from app.core.metrics import outbound_timer
 from app.db.base import OAuth
 from app.db.session import SessionLocal
+from app.repositories.google_calendar_repo import google_calendar_api_url
 from flask import current_app
 from app.config.oauth_provider import PROVIDER_GOOGLE_CALENDAR
 
@@ -396,7 +398,9 @@ class OAuthTokenService:
                 "grant_type": "refresh_token",
             }
 
-            response = requests.post(token_url, data=data, timeout=30)
+            with outbound_timer("google_oauth", "POST") as call:
+                response = requests.post(token_url, data=data, timeout=30)
+                call.status = response.status_code
 
             if response.status_code == 200:
                 new_token_data = response.json()
@@ -487,11 +491,13 @@ class OAuthTokenService:
                 "Content-Type": "application/json",
             }
 
-            response = requests.get(
-                "https://www.googleapis.com/calendar/v3/calendars/primary",
-                headers=headers,
-                timeout=10,
-            )
+            with outbound_timer("google_calendar", "GET") as call:
+                response = requests.get(
+                    f"{google_calendar_api_url()}/calendars/primary",
+                    headers=headers,
+                    timeout=10,
+                )
+                call.status = response.status_code
 
             is_valid = response.status_code == 200
             logger.info(
@@ -525,9 +531,12 @@ class OAuthTokenService:
             # Revoke token with Google
             import requests
 
-            response = requests.post(
-                f"https://oauth2.googleapis.com/revoke?token={access_token}", timeout=10
-            )
+            with outbound_timer("google_oauth", "POST") as call:
+                response = requests.post(
+                    f"https://oauth2.googleapis.com/revoke?token={access_token}",
+                    timeout=10,
+                )
+                call.status = response.status_code
 
             if response.status_code == 200:
                 # Clear token from database
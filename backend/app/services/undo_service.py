@@ -6,19 +6,75 @@ Provides functionality to:
 - Store snapshots for potential rollback
 - Restore data from snapshots
 - Clean up old snapshots
+
+Snapshot payloads are stored compressed in extrato_snapshot_blobs, keyed by
+the SHA-256 of the uncompressed bytes, so identical payloads (e.g. forcing the
+same month twice) share one blob.
 """
 
+import hashlib
 import json
 import logging
 import uuid
+import zlib
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.db.base import Extrato, ExtratoSnapshot
+from app.db.base import Extrato, ExtratoSnapshot, ExtratoSnapshotBlob
 from app.db.session import SessionLocal
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+try:  # Optional dependency: better ratio/speed when installed
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# Extrato columns captured in a snapshot payload
+PAYLOAD_FIELDS = ("pagamentos", "sessoes", "comissoes", "gastos", "totais")
+
+
+class SnapshotIntegrityError(Exception):
+    """Raised when a snapshot payload does not match its content hash."""
+
+
+def encode_payload(extrato: Extrato) -> bytes:
+    """Return the canonical bytes of an extrato's payload columns."""
+    payload = {field: getattr(extrato, field, None) for field in PAYLOAD_FIELDS}
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def compress_payload(raw: bytes) -> Tuple[str, bytes]:
+    """Compress raw payload bytes, preferring zstd when available."""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(raw)
+    return "zlib", zlib.compress(raw, 9)
+
+
+def decompress_payload(codec: str, data: bytes) -> bytes:
+    """Inverse of compress_payload for the given codec."""
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise SnapshotIntegrityError(
+                "Snapshot compressed with zstd but zstandard is not installed"
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise SnapshotIntegrityError(f"Unknown snapshot codec '{codec}'")
+
+
+def _load_json(value: Any) -> Dict[str, Any]:
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    return json.loads(value)
+
 
 class UndoService:
     """Service for managing extrato undo operations."""
@@ -53,16 +109,11 @@ class UndoService:
                 )
                 return snapshot_id
 
-            # Create snapshot data
+            # Snapshot metadata; the payload itself goes to the blob store
             snapshot_data = {
                 "extrato_id": existing_extrato.id,
                 "mes": existing_extrato.mes,
                 "ano": existing_extrato.ano,
-                "pagamentos": existing_extrato.pagamentos,
-                "sessoes": existing_extrato.sessoes,
-                "comissoes": existing_extrato.comissoes,
-                "gastos": existing_extrato.gastos,
-                "totais": existing_extrato.totais,
                 "created_at": getattr(existing_extrato, "created_at", None),
                 "correlation_id": correlation_id,
             }
@@ -70,12 +121,17 @@ class UndoService:
             if snapshot_data["created_at"]:
                 snapshot_data["created_at"] = snapshot_data["created_at"].isoformat()
 
+            raw = encode_payload(existing_extrato)
+            content_hash = hashlib.sha256(raw).hexdigest()
+            reused = self._store_blob(db, content_hash, raw)
+
             # Store snapshot
             snapshot = ExtratoSnapshot(
                 snapshot_id=snapshot_id,
                 mes=mes,
                 ano=ano,
                 data=json.dumps(snapshot_data),
+                content_hash=content_hash,
                 created_at=datetime.now(),
                 correlation_id=correlation_id,
             )
@@ -84,7 +140,14 @@ class UndoService:
             db.commit()
 
             logger.info(
-                f"Created snapshot {snapshot_id} for extrato {mes}/{ano} with correlation {correlation_id}"
+                f"Created snapshot {snapshot_id} for extrato {mes}/{ano} with correlation {correlation_id}",
+                extra={
+                    "context": {
+                        "content_hash": content_hash[:12],
+                        "raw_size": len(raw),
+                        "deduplicated": reused,
+                    }
+                },
             )
             return snapshot_id
 
@@ -119,8 +182,9 @@ class UndoService:
                 logger.error(f"Snapshot {snapshot_id} not found")
                 return False
 
-            # Parse snapshot data
-            snapshot_data = json.loads(getattr(snapshot, "data", "{}"))
+            snapshot_data = _load_json(getattr(snapshot, "data", None))
+            raw = self._load_payload(db, snapshot, snapshot_data)
+            payload = json.loads(raw.decode("utf-8"))
 
             # Find or create extrato record
             extrato = (
@@ -138,19 +202,21 @@ class UndoService:
                 db.add(extrato)
 
             # Restore data
-            extrato.receita_total = snapshot_data.get("receita_total", 0)
-            extrato.comissoes_total = snapshot_data.get("comissoes_total", 0)
-            extrato.gastos_total = snapshot_data.get("gastos_total", 0)
-            extrato.lucro_total = snapshot_data.get("lucro_total", 0)
-            extrato.sessoes_count = snapshot_data.get("sessoes_count", 0)
-            extrato.pagamentos_count = snapshot_data.get("pagamentos_count", 0)
+            for field in PAYLOAD_FIELDS:
+                setattr(extrato, field, payload.get(field))
 
             # Update timestamps
             created_at_str = snapshot_data.get("created_at")
             if created_at_str:
                 setattr(extrato, "created_at", datetime.fromisoformat(created_at_str))
-            if snapshot_data.get("updated_at"):
-                extrato.updated_at = datetime.fromisoformat(snapshot_data["updated_at"])
+
+            # Verify what the database now holds matches the original bytes
+            db.flush()
+            db.refresh(extrato)
+            if encode_payload(extrato) != raw:
+                raise SnapshotIntegrityError(
+                    f"Restored extrato does not match snapshot {snapshot_id}"
+                )
 
             db.commit()
 
@@ -188,10 +254,22 @@ class UndoService:
             if ano is not None:
                 query = query.filter(ExtratoSnapshot.ano == ano)
 
-            snapshots = query.order_by(ExtratoSnapshot.created_at.desc()).all()
+            query = query.outerjoin(
+                ExtratoSnapshotBlob,
+                ExtratoSnapshotBlob.content_hash == ExtratoSnapshot.content_hash,
+            ).add_columns(
+                ExtratoSnapshotBlob.raw_size, func.length(ExtratoSnapshotBlob.payload)
+            )
+
+            rows = query.order_by(ExtratoSnapshot.created_at.desc()).all()
 
             result = []
-            for snapshot in snapshots:
+            for snapshot, raw_size, stored_size in rows:
+                legacy_size = (
+                    len(getattr(snapshot, "data", ""))
+                    if getattr(snapshot, "data", None)
+                    else 0
+                )
                 result.append(
                     {
                         "snapshot_id": snapshot.snapshot_id,
@@ -199,10 +277,10 @@ class UndoService:
                         "ano": snapshot.ano,
                         "created_at": snapshot.created_at.isoformat(),
                         "correlation_id": snapshot.correlation_id,
-                        "data_size": (
-                            len(getattr(snapshot, "data", ""))
-                            if getattr(snapshot, "data", None)
-                            else 0
+                        "content_hash": snapshot.content_hash,
+                        "data_size": raw_size if raw_size is not None else legacy_size,
+                        "stored_size": (
+                            stored_size if stored_size is not None else legacy_size
                         ),
                     }
                 )
@@ -226,12 +304,25 @@ class UndoService:
             deleted_count = (
                 db.query(ExtratoSnapshot)
                 .filter(ExtratoSnapshot.created_at < cutoff_date)
-                .delete()
+                .delete(synchronize_session=False)
+            )
+
+            # Drop payloads no remaining snapshot points to (one statement)
+            referenced = select(ExtratoSnapshot.content_hash).where(
+                ExtratoSnapshot.content_hash.isnot(None)
+            )
+            deleted_blobs = (
+                db.query(ExtratoSnapshotBlob)
+                .filter(ExtratoSnapshotBlob.content_hash.not_in(referenced))
+                .delete(synchronize_session=False)
             )
 
             db.commit()
 
-            logger.info(f"Cleaned up {deleted_count} old snapshots")
+            logger.info(
+                f"Cleaned up {deleted_count} old snapshots",
+                extra={"context": {"deleted_blobs": deleted_blobs}},
+            )
             return deleted_count
 
         except Exception as e:
@@ -262,11 +353,10 @@ class UndoService:
             if not snapshot:
                 return None
 
-            snapshot_data = (
-                json.loads(getattr(snapshot, "data", "{}"))
-                if getattr(snapshot, "data", None)
-                else {}
-            )
+            snapshot_data = _load_json(getattr(snapshot, "data", None))
+            if snapshot.content_hash:
+                raw = self._load_payload(db, snapshot, snapshot_data)
+                snapshot_data.update(json.loads(raw.decode("utf-8")))
 
             return {
                 "snapshot_id": snapshot.snapshot_id,
@@ -279,3 +369,64 @@ class UndoService:
 
         finally:
             db.close()
+
+    def _store_blob(self, db, content_hash: str, raw: bytes) -> bool:
+        """Store the compressed payload unless an identical one exists.
+
+        Returns:
+            True if an existing blob was reused, False if a new one was added
+        """
+        exists = (
+            db.query(ExtratoSnapshotBlob.id)
+            .filter(ExtratoSnapshotBlob.content_hash == content_hash)
+            .first()
+        )
+        if exists:
+            return True
+
+        codec, compressed = compress_payload(raw)
+        try:
+            # Savepoint: a concurrent writer may insert the same hash first
+            with db.begin_nested():
+                db.add(
+                    ExtratoSnapshotBlob(
+                        content_hash=content_hash,
+                        codec=codec,
+                        raw_size=len(raw),
+                        payload=compressed,
+                    )
+                )
+        except IntegrityError:
+            return True
+        return False
+
+    def _load_payload(
+        self, db, snapshot: ExtratoSnapshot, snapshot_data: Dict[str, Any]
+    ) -> bytes:
+        """Return the verified, uncompressed payload bytes of a snapshot."""
+        if not snapshot.content_hash:
+            # Legacy snapshot: payload stored inline in the metadata JSON
+            legacy = {field: snapshot_data.get(field) for field in PAYLOAD_FIELDS}
+            return json.dumps(
+                legacy, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+
+        blob = (
+            db.query(ExtratoSnapshotBlob)
+            .filter(ExtratoSnapshotBlob.content_hash == snapshot.content_hash)
+            .first()
+        )
+        if blob is None:
+            raise SnapshotIntegrityError(
+                f"Payload for snapshot {snapshot.snapshot_id} is missing"
+            )
+
+        raw = decompress_payload(blob.codec, blob.payload)
+        if (
+            len(raw) != blob.raw_size
+            or hashlib.sha256(raw).hexdigest() != snapshot.content_hash
+        ):
+            raise SnapshotIntegrityError(
+                f"Payload for snapshot {snapshot.snapshot_id} failed hash check"
+            )
+        return raw
@@ -1,5 +1,6 @@
 from typing import Dict, List, Optional
 
+from app.core.identity_cache import invalidate_user
 from app.core.security import hash_password
 from app.domain.entities import User as DomainUser
 from app.domain.interfaces import IUserRepository
@@ -47,7 +48,9 @@ class UserService:
             user.email = email
             user.name = name
             user.avatar_url = avatar
-            return self.repo.update(user)
+            updated = self.repo.update(user)
+            invalidate_user(user.id)
+            return updated
 
         # Try finding by email to link accounts created previously
         user = self.repo.get_by_email(email)
@@ -55,7 +58,9 @@ class UserService:
             # Link Google account to existing user
             user.google_id = google_id
             user.avatar_url = avatar
-            return self.repo.update(user)
+            updated = self.repo.update(user)
+            invalidate_user(user.id)
+            return updated
 
         # Create a new user from domain entity
         new_user = DomainUser(
@@ -130,6 +135,7 @@ class UserService:
 
         user.is_active = False
         self.repo.update(user)
+        invalidate_user(user_id)
         return True
 
     def register_artist(self, name: str, email: Optional[str] = None) -> DomainUser:
@@ -226,7 +232,9 @@ class UserService:
         existing_artist.name = name.strip()
         existing_artist.email = email or ""
 
-        return self.repo.update(existing_artist)
+        updated = self.repo.update(existing_artist)
+        invalidate_user(artist_id)
+        return updated
 
     def delete_artist(self, artist_id: int) -> bool:
         """Delete an artist by ID.
@@ -259,4 +267,6 @@ class UserService:
                 "Please reassign or delete these records first."
             )
 
-        return self.repo.delete(artist_id)
+        deleted = self.repo.delete(artist_id)
+        invalidate_user(artist_id)
+        return deleted
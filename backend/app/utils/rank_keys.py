@@ -0,0 +1,82 @@
+"""
+Rank keys - LexoRank-style string ordering for manual (drag & drop) lists.
+
+A rank key is a base-36 fraction written without the leading ``0.``: ``"i"``
+is 0.5, ``"9"`` is 0.25, ``"0i"`` is 0.0138... Keys compare correctly as
+plain strings, so moving one item between two neighbours only needs a key
+strictly between theirs - a single-row UPDATE instead of renumbering the
+whole list.
+
+Keys never end in ``"0"``, which guarantees there is always room below any
+key. Repeated inserts at the same spot make keys longer; ``evenly_spaced``
+produces short, fixed-width keys again for a periodic rebalance.
+
+The alphabet is lowercase digits and letters only, so ordering is the same
+under byte (``C``) and locale-aware collations.
+"""
+
+from typing import List, Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Keys longer than this trigger a rebalance of the whole list
+MAX_KEY_LENGTH = 24
+
+
+def _validate(key: str) -> None:
+    if not key or key[-1] == DIGITS[0] or any(ch not in DIGITS for ch in key):
+        raise ValueError(f"Invalid rank key: {key!r}")
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """A key strictly between ``low`` ("" = 0) and ``high`` (None = 1)."""
+    if high is not None:
+        # Copy the common prefix (``low`` is padded with zeros)
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else DIGITS[0]) == high[n]:
+            n += 1
+        if n:
+            return high[:n] + _midpoint(low[n:], high[n:])
+
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high is not None else BASE
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high + 1) // 2]
+    # Adjacent first digits
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+def key_between(before: Optional[str], after: Optional[str]) -> str:
+    """A key that sorts after ``before`` and before ``after``.
+
+    Either bound may be None (start or end of the list).
+    """
+    if before is not None:
+        _validate(before)
+    if after is not None:
+        _validate(after)
+        if before is not None and before >= after:
+            raise ValueError(f"Rank keys out of order: {before!r} >= {after!r}")
+    return _midpoint(before or "", after)
+
+
+def evenly_spaced(count: int) -> List[str]:
+    """``count`` ascending keys of equal, minimal width spread over (0, 1)."""
+    if count <= 0:
+        return []
+    width = 1
+    while BASE**width <= count:
+        width += 1
+    step = BASE**width // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = i * step
+        chars = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            chars.append(DIGITS[digit])
+        keys.append("".join(reversed(chars)).rstrip(DIGITS[0]))
+    return keys
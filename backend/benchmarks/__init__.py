@@ -0,0 +1,12 @@
+"""
+Micro-benchmarks for the financial hot paths.
+
+Run from the backend directory:
+
+    python -m benchmarks run                        # SQLite, default sizes
+    python -m benchmarks run --postgres             # also a local Postgres
+    python -m benchmarks run --save-baseline        # write baselines/<dialect>.json
+    python -m benchmarks compare results.json       # exit 1 on regressions
+
+See docs/PERFORMANCE.md for details.
+"""
@@ -0,0 +1,183 @@
+"""
+Benchmark cases for the financial hot paths.
+
+Each case's ``prepare(db, size, info)`` does the untimed setup and returns the
+zero-argument callable that gets timed. Cases that hit the database clear the
+session's identity map first, so every round builds its objects from scratch
+like a real request does.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from app.core.config import APP_TZ
+
+from benchmarks.datasets import jotform_submissions
+
+TEMPLATE_FOLDER = Path(__file__).resolve().parents[2] / "frontend" / "templates"
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    prepare: Callable[[Any, int, Dict[str, Any]], Callable[[], Any]]
+
+
+def _current_month():
+    now = datetime.now(APP_TZ)
+    return now.month, now.year
+
+
+def _load_month(db):
+    from app.services.extrato_core import query_data
+
+    mes, ano = _current_month()
+    return query_data(db, mes, ano)
+
+
+def _query_data(db, size, info):
+    from app.services.extrato_core import query_data
+
+    mes, ano = _current_month()
+
+    def run():
+        db.expunge_all()
+        return query_data(db, mes, ano)
+
+    return run
+
+
+def _serialize_data(db, size, info):
+    from app.services.extrato_core import serialize_data
+
+    data = _load_month(db)
+    return lambda: serialize_data(*data)
+
+
+def _calculate_totals(db, size, info):
+    from app.services.extrato_core import calculate_totals, serialize_data
+
+    serialized = serialize_data(*_load_month(db))
+    return lambda: calculate_totals(*serialized)
+
+
+def _current_month_totals(db, size, info):
+    from app.services.extrato_generation import get_current_month_totals
+
+    def run():
+        db.expunge_all()
+        return get_current_month_totals(db)
+
+    return run
+
+
+def _current_month_totals_python(db, size, info):
+    from app.services.extrato_generation import get_current_month_totals_python
+
+    def run():
+        db.expunge_all()
+        return get_current_month_totals_python(db)
+
+    return run
+
+
+def _search(db, size, info):
+    from app.services.search_service import SearchService
+
+    service = SearchService(db)
+    term = info["search_term"]
+
+    def run():
+        db.expunge_all()
+        return service.search(term)
+
+    return run
+
+
+def _format_submissions(db, size, info):
+    from app.services.jotform_service import JotFormService
+
+    service = JotFormService(api_key="benchmark", form_id="benchmark")
+    submissions = jotform_submissions(size)
+    return lambda: [service.format_submission_data(s) for s in submissions]
+
+
+def _serialize_backup(db, size, info):
+    from app.services.backup_service import BackupService
+
+    backup_dir = os.path.join(tempfile.gettempdir(), "tattoo_benchmarks_backups")
+    service = BackupService(backup_base_dir=backup_dir)
+    mes, ano = _current_month()
+    data = service._query_historical_data(db, ano, mes)
+    return lambda: service._serialize_historical_data(*data)
+
+
+def _compress_extrato_json(db, size, info):
+    """gzip of an /extrato/api-sized JSON body (the month's serialized data)."""
+    import json
+
+    from app.core.compression import compress_body
+    from app.services.extrato_core import serialize_data
+
+    body = json.dumps(serialize_data(*_load_month(db))).encode("utf-8")
+    return lambda: compress_body(body, "gzip")
+
+
+def _template_app():
+    from flask import Flask
+
+    from app.core.fragment_cache import cached_fragment
+
+    app = Flask(__name__, template_folder=str(TEMPLATE_FOLDER))
+    app.jinja_env.globals["cached_fragment"] = cached_fragment
+    return app
+
+
+def _render_template_selects(cached: bool):
+    """The client/artist ``<option>`` lists of historico and financeiro."""
+
+    def prepare(db, size, info):
+        from flask import g, render_template
+
+        from app.core.fragment_cache import fragment_cache
+        from app.db.base import Client, User
+
+        clients = db.query(Client).order_by(Client.name).all()
+        artists = db.query(User).filter(User.role == "artist").order_by(User.name)
+        artists = artists.all()
+        app = _template_app()
+        fragment_cache.clear()
+
+        def run():
+            with app.test_request_context("/"):
+                if cached:
+                    g.table_versions = {"clients": 1, "users": 1}
+                return render_template(
+                    "partials/_template_selects.html",
+                    clients=clients,
+                    clients_from_db=True,
+                    artists=artists,
+                )
+
+        return run
+
+    return prepare
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase("extrato_core.query_data", _query_data),
+    BenchmarkCase("extrato_core.serialize_data", _serialize_data),
+    BenchmarkCase("extrato_core.calculate_totals", _calculate_totals),
+    BenchmarkCase("get_current_month_totals", _current_month_totals),
+    BenchmarkCase("get_current_month_totals_python", _current_month_totals_python),
+    BenchmarkCase("SearchService.search", _search),
+    BenchmarkCase("JotFormService.format_submission_data", _format_submissions),
+    BenchmarkCase("BackupService._serialize_historical_data", _serialize_backup),
+    BenchmarkCase("compress extrato json", _compress_extrato_json),
+    BenchmarkCase("render template_selects", _render_template_selects(False)),
+    BenchmarkCase("render template_selects cached", _render_template_selects(True)),
+]
@@ -0,0 +1,185 @@
+"""
+Deterministic synthetic data for the benchmarks.
+
+All rows fall inside the current month (APP_TZ) so the same dataset feeds
+query_data, get_current_month_totals and the search/backup benchmarks.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from app.core.config import APP_TZ
+from app.db.base import (
+    Client,
+    Comissao,
+    Extrato,
+    Gasto,
+    Inventory,
+    OAuth,
+    Pagamento,
+    Sessao,
+    User,
+)
+
+FIRST_NAMES = [
+    "Ana", "João", "Márcia", "José", "Luíza", "Thiago", "Bárbara", "Caio",
+    "Inês", "Sérgio", "Tânia", "Vinícius", "Débora", "Otávio", "Lúcia",
+]
+LAST_NAMES = [
+    "Silva", "Araújo", "Conceição", "Gonçalves", "Simões", "Brandão",
+    "Fonseca", "Magalhães", "Assunção", "Guimarães", "Rebouças", "Pereira",
+]
+FORMAS_PAGAMENTO = ["Pix", "Dinheiro", "Cartão de Crédito", "Cartão de Débito"]
+GASTO_DESCRICOES = ["Tinta preta", "Agulhas", "Luvas", "Aluguel", "Energia"]
+
+
+def month_dates() -> List[date]:
+    """Every day of the current month up to today (at least one day)."""
+    today = datetime.now(APP_TZ).date()
+    first = today.replace(day=1)
+    return [first + timedelta(days=i) for i in range((today - first).days + 1)]
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def clear_dataset(db) -> None:
+    """Delete every table the benchmarks seed (dependents first)."""
+    # Sessions and payments reference each other; break the cycle first
+    db.query(Sessao).update({Sessao.payment_id: None})
+    for model in (Comissao, Pagamento, Sessao, Gasto, Extrato, Inventory, Client):
+        db.query(model).delete()
+    db.query(OAuth).filter(OAuth.provider_user_id.like("bench-%")).delete()
+    db.query(User).filter(User.email.like("bench-%")).delete()
+    db.commit()
+
+
+def seed_dataset(db, size: int, seed: int = 42) -> Dict[str, Any]:
+    """Insert ``size`` sessions with one payment and commission each.
+
+    Also adds size/10 artists, size/5 clients and size/4 expenses. The same
+    seed always produces the same rows.
+    """
+    rng = random.Random(seed)
+    days = month_dates()
+
+    artists = [
+        User(name=_name(rng), email=f"bench-{i}@example.com", role="artist")
+        for i in range(max(2, size // 10))
+    ]
+    clients = [Client(name=_name(rng)) for _ in range(max(2, size // 5))]
+    db.add_all(artists + clients)
+    db.flush()
+
+    sessoes = []
+    for _ in range(size):
+        sessoes.append(
+            Sessao(
+                data=rng.choice(days),
+                valor=Decimal(rng.randrange(10000, 150000)) / 100,
+                cliente_id=rng.choice(clients).id,
+                artista_id=rng.choice(artists).id,
+                status="completed",
+                observacoes=f"Sessão de {rng.choice(['braço', 'costas', 'perna'])}",
+            )
+        )
+    db.add_all(sessoes)
+    db.flush()
+
+    pagamentos = [
+        Pagamento(
+            data=s.data,
+            valor=s.valor,
+            forma_pagamento=rng.choice(FORMAS_PAGAMENTO),
+            cliente_id=s.cliente_id,
+            artista_id=s.artista_id,
+            sessao_id=s.id,
+        )
+        for s in sessoes
+    ]
+    db.add_all(pagamentos)
+    db.flush()
+
+    for sessao, pagamento in zip(sessoes, pagamentos):
+        sessao.payment_id = pagamento.id
+
+    creator = artists[0]
+    db.add_all(
+        [
+            Comissao(
+                pagamento_id=p.id,
+                artista_id=p.artista_id,
+                percentual=Decimal("30.00"),
+                valor=(p.valor * Decimal("0.30")).quantize(Decimal("0.01")),
+            )
+            for p in pagamentos
+        ]
+        + [
+            Gasto(
+                data=rng.choice(days),
+                valor=Decimal(rng.randrange(1000, 50000)) / 100,
+                descricao=rng.choice(GASTO_DESCRICOES),
+                forma_pagamento=rng.choice(FORMAS_PAGAMENTO),
+                created_by=creator.id,
+            )
+            for _ in range(max(1, size // 4))
+        ]
+    )
+    db.commit()
+
+    return {
+        "search_term": clients[0].name.split()[-1],
+        "artists": len(artists),
+        "clients": len(clients),
+        "sessoes": size,
+    }
+
+
+def jotform_submissions(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Synthetic JotForm submissions with the field types the app formats."""
+    rng = random.Random(seed)
+    submissions = []
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        submissions.append(
+            {
+                "id": str(100000 + i),
+                "status": "ACTIVE",
+                "answers": {
+                    "3": {
+                        "text": "Nome completo",
+                        "type": "control_fullname",
+                        "answer": {"first": first, "last": last},
+                    },
+                    "4": {
+                        "text": "Telefone",
+                        "type": "control_phone",
+                        "answer": {"full": f"(11) 9{rng.randrange(10**7, 10**8)}"},
+                    },
+                    "5": {
+                        "text": "Endereço",
+                        "type": "control_address",
+                        "answer": {
+                            "addr_line1": "Rua das Acácias, 120",
+                            "city": "São Paulo",
+                            "state": "SP",
+                            "postal": "01310-000",
+                        },
+                    },
+                    "6": {
+                        "text": "Descrição da tatuagem",
+                        "type": "control_textarea",
+                        "answer": "Rosa com sombreado no antebraço",
+                    },
+                    "7": {
+                        "text": "Possui alergias?",
+                        "type": "control_radio",
+                        "answer": rng.choice(["Sim", "Não"]),
+                    },
+                },
+            }
+        )
+    return submissions
@@ -0,0 +1,135 @@
+"""
+Local fakes for the external APIs the app calls during page renders.
+
+One threaded HTTP server answers both Google Calendar (under ``/calendar/v3``)
+and JotForm (under ``/jotform``) so load tests never leave the machine. Point
+the app at it with the environment from ``FakeBackends.env()``.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.datasets import FIRST_NAMES, LAST_NAMES, jotform_submissions
+
+
+def calendar_events(count: int) -> List[Dict[str, Any]]:
+    """Google Calendar API items spread over the next week."""
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    events = []
+    for i in range(count):
+        begins = start + timedelta(hours=3 * i)
+        events.append(
+            {
+                "id": f"bench-event-{i}",
+                "summary": f"Sessão - {FIRST_NAMES[i % len(FIRST_NAMES)]} "
+                f"{LAST_NAMES[i % len(LAST_NAMES)]}",
+                "description": "Tatuagem fineline",
+                "location": "Estúdio",
+                "start": {"dateTime": begins.isoformat()},
+                "end": {"dateTime": (begins + timedelta(hours=2)).isoformat()},
+                "attendees": [{"email": f"cliente{i}@example.com"}],
+            }
+        )
+    return events
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_FakeServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence access log
+        pass
+
+    def _send_json(self, payload: Any, status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.server.latency_s:
+            time.sleep(self.server.latency_s)
+        url = urlparse(self.path)
+        path = url.path
+
+        if path == "/calendar/v3/calendars/primary":
+            self._send_json({"id": "primary", "summary": "Estúdio"})
+        elif path == "/calendar/v3/calendars/primary/events":
+            self._send_json({"items": self.server.events})
+        elif path.startswith("/jotform/form/") and path.endswith("/submissions"):
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["20"])[0])
+            page = self.server.submissions[offset : offset + limit]
+            self._send_json({"responseCode": 200, "content": page})
+        elif path.startswith("/jotform/submission/"):
+            submission_id = path.rsplit("/", 1)[-1]
+            match = next(
+                (s for s in self.server.submissions if s["id"] == submission_id),
+                None,
+            )
+            if match is None:
+                self._send_json({"responseCode": 404, "content": None}, status=404)
+            else:
+                self._send_json({"responseCode": 200, "content": match})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+
+class _FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    events: List[Dict[str, Any]]
+    submissions: List[Dict[str, Any]]
+    latency_s: float
+
+
+class FakeBackends:
+    """Fake Google Calendar + JotForm server running on a background thread."""
+
+    def __init__(
+        self,
+        submissions: int = 200,
+        events: int = 30,
+        latency_ms: float = 0.0,
+        host: str = "127.0.0.1",
+    ):
+        self._server = _FakeServer((host, 0), _Handler)
+        self._server.submissions = jotform_submissions(submissions)
+        self._server.events = calendar_events(events)
+        self._server.latency_s = latency_ms / 1000
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-backends", daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        return {
+            "GOOGLE_CALENDAR_API_URL": f"{self.url}/calendar/v3",
+            "JOTFORM_API_URL": f"{self.url}/jotform",
+            "JOTFORM_API_KEY": "bench-api-key",
+            "JOTFORM_FORM_ID": "bench-form",
+        }
+
+    def start(self) -> "FakeBackends":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeBackends":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,663 @@
+"""
+Production-scale synthetic studio data, written with bulk inserts.
+
+Rows are generated month by month from a seeded ``random.Random`` and
+streamed to the database in chunks: ``COPY ... FROM STDIN`` on PostgreSQL
+(psycopg 3 or psycopg2) and batched executemany inserts elsewhere. Primary
+keys are assigned up front so sessions, payments and commissions can be
+linked without round trips.
+
+Distributions aim for a believable studio rather than uniform noise:
+- artists follow a Zipf curve (a few artists do most of the work) and keep
+  a fixed commission percentage
+- clients repeat (quadratic bias towards early clients), ~4% of payments
+  are walk-ins with neither client nor session
+- values are log-normal around R$ 600, rounded to R$ 10
+- each month has a seasonal weight; the current month stops at today and
+  also holds unpaid ("active") sessions
+- archived months become Extrato snapshots only, built with the real
+  serialize_data/calculate_totals, like the monthly job leaves them
+"""
+
+import csv
+import io
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import func, select, text
+
+from app.core.config import APP_TZ
+from app.db.base import (
+    Base,
+    Client,
+    Comissao,
+    Extrato,
+    Gasto,
+    Inventory,
+    Pagamento,
+    Sessao,
+    User,
+)
+
+from benchmarks.datasets import FIRST_NAMES, LAST_NAMES
+
+MIDDLE_NAMES = ["de", "da", "dos", "do", ""]
+EXTRA_LAST_NAMES = [
+    "Conceição",
+    "Câmara",
+    "Falcão",
+    "Gusmão",
+    "Lôbo",
+    "Mourão",
+    "Peçanha",
+    "Sampaio",
+    "Teixeira",
+    "Valadão",
+    "Xavier",
+    "Sá",
+]
+FORMAS_PAGAMENTO = (
+    ("Pix", 55),
+    ("Cartão de Crédito", 25),
+    ("Cartão de Débito", 10),
+    ("Dinheiro", 10),
+)
+OBSERVACOES = [
+    None,
+    None,
+    None,
+    "Fechamento de braço",
+    "Retoque",
+    "Fineline no pulso",
+    "Old school nas costas",
+    "Realismo na perna",
+    "Blackwork no antebraço",
+    "Lettering na costela",
+    "Cobertura de tatuagem antiga",
+    "Aquarela no ombro",
+]
+GASTOS = [
+    ("Tinta preta", 80, 400),
+    ("Agulhas e cartuchos", 120, 900),
+    ("Luvas nitrílicas", 40, 250),
+    ("Aluguel", 3500, 3500),
+    ("Energia", 300, 900),
+    ("Material de limpeza", 30, 200),
+    ("Filme PVC e papel hectográfico", 40, 180),
+    ("Manutenção de máquinas", 150, 1200),
+    ("Marketing Instagram", 100, 800),
+]
+INVENTORY_ITEMS = [
+    ("Tinta", "Tintas", ["preta", "branca", "vermelha", "azul", "verde", "âmbar"]),
+    ("Cartucho", "Agulhas", ["RL 3", "RL 5", "RL 9", "RS 7", "MG 11", "MG 13"]),
+    ("Luva nitrílica", "Descartáveis", ["P", "M", "G"]),
+    ("Batoque", "Descartáveis", ["pequeno", "médio", "grande"]),
+    ("Pomada cicatrizante", "Cuidados", ["30 g", "60 g"]),
+    ("Grip", "Acessórios", ["25 mm", "30 mm"]),
+]
+FORNECEDORES = ["Eletric Ink", "Tattoo Shop SP", "Cheyenne Brasil", "Dermo Supply"]
+
+# Month weights, January first: busier before summer and the holidays
+SEASONALITY = [0.9, 0.95, 0.9, 0.95, 1.0, 0.9, 0.95, 1.0, 1.0, 1.05, 1.15, 1.3]
+
+CHUNK_SIZE = 10_000
+
+
+@dataclass
+class GeneratorConfig:
+    payments: int = 100_000
+    months: int = 12
+    archived_months: int = 12
+    archive_payments_per_month: int = 2_000
+    artists: Optional[int] = None
+    clients: Optional[int] = None
+    inventory: int = 500
+    seed: int = 42
+    # Last day to generate; defaults to today in APP_TZ
+    today: Optional[date] = None
+    # Add unpaid "active" sessions to the last month
+    upcoming_sessions: bool = True
+
+    def artist_count(self) -> int:
+        if self.artists:
+            return self.artists
+        per_month = self.payments / max(1, self.months)
+        return max(3, min(200, round(per_month / 100)))
+
+    def client_count(self) -> int:
+        return self.clients or max(10, self.payments // 3)
+
+
+@dataclass
+class GeneratorStats:
+    rows: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, table: str, count: int) -> None:
+        self.rows[table] = self.rows.get(table, 0) + count
+
+
+def person_name(rng: random.Random) -> str:
+    middle = rng.choice(MIDDLE_NAMES)
+    last = rng.choice(LAST_NAMES + EXTRA_LAST_NAMES)
+    first = rng.choice(FIRST_NAMES)
+    if middle and rng.random() < 0.4:
+        return f"{first} {middle} {rng.choice(LAST_NAMES)} {last}"
+    return f"{first} {last}"
+
+
+def month_window(today: date, months: int) -> List[date]:
+    """First day of each of the ``months`` months ending with today's month."""
+    firsts = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        firsts.append(date(year, month, 1))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return list(reversed(firsts))
+
+
+def _month_days(first: date, today: date) -> List[date]:
+    nxt = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    last = min(nxt - timedelta(days=1), today)
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _split(total: int, weights: Sequence[float]) -> List[int]:
+    """Split ``total`` proportionally to ``weights`` (exact sum)."""
+    scale = sum(weights)
+    counts = [int(total * w / scale) for w in weights]
+    for i in range(total - sum(counts)):
+        counts[i % len(counts)] += 1
+    return counts
+
+
+def _valor(rng: random.Random) -> Decimal:
+    value = min(8000.0, max(100.0, rng.lognormvariate(6.4, 0.6)))
+    return Decimal(int(round(value / 10)) * 10).quantize(Decimal("0.01"))
+
+
+class BulkWriter:
+    """Append rows to a table through the fastest path of the connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.dialect = connection.dialect.name
+        self.driver = connection.dialect.driver
+
+    def write(self, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        total = 0
+        for chunk in _chunks(rows, CHUNK_SIZE):
+            if self.dialect == "postgresql" and self.driver == "psycopg":
+                self._copy_rows(table, columns, chunk)
+            elif self.dialect == "postgresql" and self.driver == "psycopg2":
+                self._copy_csv(table, columns, chunk)
+            else:
+                self._executemany(table, columns, chunk)
+            total += len(chunk)
+        return total
+
+    def _column_list(self, columns: Sequence[str]) -> str:
+        quote = self.connection.dialect.identifier_preparer.quote
+        return ", ".join(quote(c) for c in columns)
+
+    def _copy_rows(self, table, columns, chunk) -> None:
+        dbapi_conn = self.connection.connection.driver_connection
+        statement = f"COPY {table} ({self._column_list(columns)}) FROM STDIN"
+        with dbapi_conn.cursor() as cursor:
+            with cursor.copy(statement) as copy:
+                for row in chunk:
+                    copy.write_row(row)
+
+    def _copy_csv(self, table, columns, chunk) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            # Unquoted empty fields are NULL in COPY's CSV format
+            writer.writerow(["" if v is None else v for v in row])
+        buffer.seek(0)
+        dbapi_conn = self.connection.connection.driver_connection
+        statement = (
+            f"COPY {table} ({self._column_list(columns)}) FROM STDIN WITH (FORMAT csv)"
+        )
+        with dbapi_conn.cursor() as cursor:
+            cursor.copy_expert(statement, buffer)
+
+    def _executemany(self, table, columns, chunk) -> None:
+        self.connection.execute(
+            Base.metadata.tables[table].insert(),
+            [dict(zip(columns, row)) for row in chunk],
+        )
+
+    def reset_sequence(self, table: str) -> None:
+        if self.dialect == "postgresql":
+            self.connection.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                )
+            )
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk: List[tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _next_id(connection, model) -> int:
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+class StudioGenerator:
+    """Generate a studio's history into the database behind ``session``."""
+
+    def __init__(
+        self,
+        session,
+        config: GeneratorConfig,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.db = session
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.today = config.today or datetime.now(APP_TZ).date()
+        self.progress = progress or (lambda message: None)
+        self.stats = GeneratorStats()
+
+    # -- people -----------------------------------------------------------
+
+    def _create_people(self) -> None:
+        rng = self.rng
+        # Reuse bench users from an earlier run so --no-reset can append months
+        existing = {
+            u.email: u
+            for u in self.db.query(User).filter(User.email.like("bench-%")).all()
+        }
+        wanted = [
+            (f"bench-artist-{i}@example.com", person_name(rng), "artist")
+            for i in range(self.config.artist_count())
+        ] + [("bench-admin@example.com", "Administração", "admin")]
+        users = []
+        for email, name, role in wanted:
+            if email not in existing:
+                existing[email] = User(name=name, email=email, role=role)
+                self.db.add(existing[email])
+                self.stats.add("users", 1)
+            users.append(existing[email])
+        artists, self.admin = users[:-1], users[-1]
+
+        clients = [
+            Client(name=person_name(rng)) for _ in range(self.config.client_count())
+        ]
+        for chunk in _chunks(clients, CHUNK_SIZE):
+            self.db.add_all(chunk)
+            self.db.flush()
+        self.db.flush()
+        self.stats.add("clients", len(clients))
+
+        self.artists = [(a.id, a.name) for a in artists]
+        self.clients = [(c.id, c.name) for c in clients]
+        # Zipf: artist k gets weight 1/k (order shuffled by the seed)
+        self.artist_weights = [1 / (k + 1) for k in range(len(artists))]
+        rng.shuffle(self.artist_weights)
+        self.percentuais = {
+            a.id: Decimal(rng.choice([30, 35, 40, 45, 50])) for a in artists
+        }
+
+    def _pick_client(self):
+        if self.rng.random() < 0.04:
+            return None
+        # Quadratic bias: early clients come back more often
+        index = int(len(self.clients) * self.rng.random() ** 2)
+        return self.clients[index]
+
+    def _pick_forma(self) -> str:
+        return self.rng.choices(
+            [f for f, _ in FORMAS_PAGAMENTO], [w for _, w in FORMAS_PAGAMENTO]
+        )[0]
+
+    # -- monthly rows -----------------------------------------------------
+
+    def _month_rows(self, first: date, payments: int) -> Dict[str, List[Any]]:
+        """Generate one month as plain tuples keyed by table (ids unassigned)."""
+        rng = self.rng
+        days = _month_days(first, self.today)
+        artist_ids = [a for a, _ in self.artists]
+        picked_artists = rng.choices(artist_ids, self.artist_weights, k=payments)
+        month_rows: Dict[str, List[Any]] = {"visits": [], "gastos": []}
+
+        for artista_id in picked_artists:
+            client = self._pick_client()
+            month_rows["visits"].append(
+                (
+                    rng.choice(days),
+                    _valor(rng),
+                    artista_id,
+                    client,
+                    self._pick_forma(),
+                    rng.choice(OBSERVACOES),
+                )
+            )
+        month_rows["visits"].sort(key=lambda v: v[0])
+
+        for _ in range(max(5, payments // 20)):
+            descricao, low, high = rng.choice(GASTOS)
+            valor = Decimal(rng.randint(low, high)).quantize(Decimal("0.01"))
+            month_rows["gastos"].append(
+                (rng.choice(days), valor, descricao, self._pick_forma())
+            )
+        return month_rows
+
+    def _write_live_month(
+        self, writer: BulkWriter, first: date, payments: int, ids: Dict[str, int]
+    ) -> None:
+        rows = self._month_rows(first, payments)
+        is_current = (first.year, first.month) == (self.today.year, self.today.month)
+        sessoes, pagamentos, comissoes = [], [], []
+
+        for day, valor, artista_id, client, forma, obs in rows["visits"]:
+            pagamento_id = ids["pagamentos"]
+            ids["pagamentos"] += 1
+            cliente_id = client[0] if client else None
+            sessao_id = None
+            if client:
+                # Walk-ins pay at the counter without a registered session
+                sessao_id = ids["sessoes"]
+                ids["sessoes"] += 1
+                sessoes.append(
+                    (
+                        sessao_id,
+                        day,
+                        valor,
+                        obs,
+                        cliente_id,
+                        artista_id,
+                        "completed",
+                        pagamento_id,
+                    )
+                )
+            pagamentos.append(
+                (
+                    pagamento_id,
+                    day,
+                    valor,
+                    forma,
+                    obs,
+                    cliente_id,
+                    artista_id,
+                    sessao_id,
+                )
+            )
+            percentual = self.percentuais[artista_id]
+            comissoes.append(
+                (
+                    ids["comissoes"],
+                    pagamento_id,
+                    artista_id,
+                    percentual,
+                    (valor * percentual / 100).quantize(Decimal("0.01")),
+                    datetime.combine(day, time(12), tzinfo=APP_TZ),
+                )
+            )
+            ids["comissoes"] += 1
+
+        if is_current and self.config.upcoming_sessions:
+            # Booked but not yet paid: upcoming sessions for the rest of the month
+            for _ in range(max(1, payments // 10)):
+                client = self._pick_client() or self.clients[0]
+                sessoes.append(
+                    (
+                        ids["sessoes"],
+                        self.today + timedelta(days=self.rng.randint(0, 20)),
+                        _valor(self.rng),
+                        "Agendamento",
+                        client[0],
+                        self.rng.choices(
+                            [a for a, _ in self.artists], self.artist_weights
+                        )[0],
+                        "active",
+                        None,
+                    )
+                )
+                ids["sessoes"] += 1
+
+        gastos = []
+        for day, valor, descricao, forma in rows["gastos"]:
+            gastos.append((ids["gastos"], day, valor, descricao, forma, self.admin.id))
+            ids["gastos"] += 1
+
+        # Sessions first without payment_id: PostgreSQL checks FKs per row
+        self.stats.add(
+            "sessoes",
+            writer.write(
+                "sessoes",
+                [
+                    "id",
+                    "data",
+                    "valor",
+                    "observacoes",
+                    "cliente_id",
+                    "artista_id",
+                    "status",
+                ],
+                (s[:7] for s in sessoes),
+            ),
+        )
+        self.stats.add(
+            "pagamentos",
+            writer.write(
+                "pagamentos",
+                [
+                    "id",
+                    "data",
+                    "valor",
+                    "forma_pagamento",
+                    "observacoes",
+                    "cliente_id",
+                    "artista_id",
+                    "sessao_id",
+                ],
+                pagamentos,
+            ),
+        )
+        self.stats.add(
+            "comissoes",
+            writer.write(
+                "comissoes",
+                [
+                    "id",
+                    "pagamento_id",
+                    "artista_id",
+                    "percentual",
+                    "valor",
+                    "created_at",
+                ],
+                comissoes,
+            ),
+        )
+        self.stats.add(
+            "gastos",
+            writer.write(
+                "gastos",
+                ["id", "data", "valor", "descricao", "forma_pagamento", "created_by"],
+                gastos,
+            ),
+        )
+
+    def _link_sessions_to_payments(self, first_sessao_id: int) -> None:
+        self.db.execute(
+            text(
+                "UPDATE sessoes SET payment_id = ("
+                " SELECT p.id FROM pagamentos p WHERE p.sessao_id = sessoes.id"
+                ") WHERE sessoes.id >= :first AND sessoes.status = 'completed'"
+            ),
+            {"first": first_sessao_id},
+        )
+
+    # -- inventory and archives ---------------------------------------------
+
+    def _write_inventory(self, writer: BulkWriter, first_id: int) -> None:
+        rng = self.rng
+        now = datetime.now(APP_TZ)
+        rows = []
+        for i in range(self.config.inventory):
+            nome, categoria, variantes = rng.choice(INVENTORY_ITEMS)
+            rows.append(
+                (
+                    first_id + i,
+                    f"{nome} {rng.choice(variantes)} #{i + 1}",
+                    rng.randint(0, 200),
+                    rng.choice([None, "Repor em breve", "Lote novo"]),
+                    None if rng.random() < 0.1 else i + 1,
+                    categoria,
+                    Decimal(rng.randint(500, 25000)) / 100,
+                    rng.choice(FORNECEDORES),
+                    now,
+                )
+            )
+        self.stats.add(
+            "inventory",
+            writer.write(
+                "inventory",
+                [
+                    "id",
+                    "nome",
+                    "quantidade",
+                    "observacoes",
+                    "order",
+                    "category",
+                    "unit_price",
+                    "supplier",
+                    "updated_at",
+                ],
+                rows,
+            ),
+        )
+
+    def _archive_month(self, first: date) -> Extrato:
+        """Build an Extrato snapshot from in-memory rows (nothing else stored)."""
+        from app.services.extrato_core import calculate_totals, serialize_data
+
+        names = dict(self.artists)
+        rows = self._month_rows(first, self.config.archive_payments_per_month)
+        pagamentos, sessoes, comissoes = [], [], []
+        for index, (day, valor, artista_id, client, forma, obs) in enumerate(
+            rows["visits"]
+        ):
+            artista = SimpleNamespace(name=names[artista_id])
+            cliente = SimpleNamespace(name=client[1]) if client else None
+            sessao = None
+            if cliente:
+                sessao = SimpleNamespace(
+                    id=index + 1,
+                    data=day,
+                    valor=valor,
+                    status="completed",
+                    observacoes=obs,
+                    cliente=cliente,
+                    artista=artista,
+                )
+                sessoes.append(sessao)
+            pagamento = SimpleNamespace(
+                id=index + 1,
+                data=day,
+                valor=valor,
+                forma_pagamento=forma,
+                observacoes=obs,
+                sessao_id=sessao.id if sessao else None,
+                sessao=sessao,
+                cliente=cliente,
+                artista=artista,
+            )
+            percentual = self.percentuais[artista_id]
+            comissoes.append(
+                SimpleNamespace(
+                    artista=artista,
+                    pagamento=pagamento,
+                    percentual=percentual,
+                    valor=(valor * percentual / 100).quantize(Decimal("0.01")),
+                    observacoes=None,
+                )
+            )
+            pagamentos.append(pagamento)
+        gastos = [
+            SimpleNamespace(
+                data=day,
+                valor=valor,
+                descricao=descricao,
+                forma_pagamento=forma,
+                created_by=self.admin.id,
+            )
+            for day, valor, descricao, forma in rows["gastos"]
+        ]
+
+        data = serialize_data(pagamentos, sessoes, comissoes, gastos)
+        totais = calculate_totals(*data)
+        return Extrato(
+            mes=first.month,
+            ano=first.year,
+            pagamentos=json.dumps(data[0]),
+            sessoes=json.dumps(data[1]),
+            comissoes=json.dumps(data[2]),
+            gastos=json.dumps(data[3]),
+            totais=json.dumps(totais),
+        )
+
+    # -- driver -------------------------------------------------------------
+
+    def run(self) -> GeneratorStats:
+        config = self.config
+        self.progress(
+            f"Creating {config.artist_count()} artists and "
+            f"{config.client_count()} clients"
+        )
+        self._create_people()
+
+        connection = self.db.connection()
+        writer = BulkWriter(connection)
+        ids = {
+            "sessoes": _next_id(connection, Sessao),
+            "pagamentos": _next_id(connection, Pagamento),
+            "comissoes": _next_id(connection, Comissao),
+            "gastos": _next_id(connection, Gasto),
+        }
+        first_sessao_id = ids["sessoes"]
+
+        live = month_window(self.today, config.months)
+        weights = [SEASONALITY[m.month - 1] for m in live]
+        # The current month is only partly over
+        days_in_current = len(_month_days(live[-1], self.today))
+        weights[-1] *= days_in_current / 30
+        for first, count in zip(live, _split(config.payments, weights)):
+            self.progress(f"{first:%m/%Y}: {count} payments")
+            self._write_live_month(writer, first, count, ids)
+
+        self.progress("Linking sessions to payments")
+        self._link_sessions_to_payments(first_sessao_id)
+
+        self._write_inventory(writer, _next_id(connection, Inventory))
+
+        archived = (
+            month_window(live[0] - timedelta(days=1), config.archived_months)
+            if config.archived_months
+            else []
+        )
+        for first in archived:
+            self.progress(f"{first:%m/%Y}: archived extrato")
+            self.db.add(self._archive_month(first))
+        self.stats.add("extratos", len(archived))
+        self.db.flush()
+
+        for table in ("sessoes", "pagamentos", "comissoes", "gastos", "inventory"):
+            writer.reset_sequence(table)
+        self.db.commit()
+        return self.stats
@@ -0,0 +1,240 @@
+"""
+Benchmark harness: timing, suite execution and baseline comparison.
+
+Results are plain JSON so they can be committed as baselines:
+
+    {
+      "meta": {"dialect": "sqlite", "metric": "median_ms", ...},
+      "benchmarks": {
+        "calculate_totals[1000]": {"median_ms": 1.92, "min_ms": 1.85, ...}
+      }
+    }
+"""
+
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_SIZES = (100, 1000, 5000)
+DEFAULT_THRESHOLD = 0.25  # fail when the median is 25% slower than baseline
+DEFAULT_MIN_DELTA_MS = 0.5  # ignore differences below timer noise
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_ms: Optional[float]
+    current_ms: Optional[float]
+    regressed: bool
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline_ms or self.current_ms is None:
+            return None
+        return (self.current_ms - self.baseline_ms) / self.baseline_ms
+
+
+def measure(
+    func: Callable[[], Any], repeat: int = 5, warmup: int = 1
+) -> Dict[str, float]:
+    """Time ``func`` ``repeat`` times after ``warmup`` untimed calls.
+
+    GC is disabled while timing so collections do not land on random rounds.
+    """
+    for _ in range(warmup):
+        func()
+
+    timings: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(min(timings), 4),
+        "max_ms": round(max(timings), 4),
+        "stdev_ms": round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        "rounds": repeat,
+    }
+
+
+def quiet_logging() -> None:
+    """Silence app logging, SQL echo and slow-query alerts during timing."""
+    os.environ["ALERT_SLOW_QUERY_ENABLED"] = "false"
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("app", "sqlalchemy.engine"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def default_database_url() -> str:
+    return f"sqlite:///{Path(tempfile.gettempdir()) / 'tattoo_benchmarks.db'}"
+
+
+def check_dedicated_database(url: str) -> None:
+    """Refuse to seed a database that does not look like a scratch database.
+
+    The benchmarks delete and re-create business rows; only SQLite files or
+    databases whose name contains "bench" or "test" are accepted.
+
+    Raises:
+        ValueError: If the database name is not clearly disposable.
+    """
+    from sqlalchemy.engine.url import make_url
+
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return
+    name = (parsed.database or "").lower()
+    if "bench" not in name and "test" not in name:
+        raise ValueError(
+            f"Refusing to benchmark against '{parsed.database}': use a dedicated "
+            "database whose name contains 'bench' or 'test'"
+        )
+
+
+def use_database(url: str) -> str:
+    """Point the app's lazy engine at ``url`` and create the schema.
+
+    Migrations run too: the default scratch file outlives the run, and
+    ``create_tables`` does not add new columns to existing tables.
+
+    Returns:
+        The dialect name of the new engine.
+    """
+    from app.db.migrations import run_migrations
+    from app.db.session import create_tables, dispose_engine, get_engine
+
+    check_dedicated_database(url)
+    os.environ["DATABASE_URL"] = url
+    dispose_engine()
+    engine = get_engine()
+    create_tables()
+    run_migrations()
+    return engine.dialect.name
+
+
+def database_available(url: str) -> bool:
+    from sqlalchemy import create_engine, text
+
+    try:
+        engine = create_engine(url, connect_args={"connect_timeout": 3})
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        engine.dispose()
+        return True
+    except Exception:
+        return False
+
+
+def run_suite(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    repeat: int = 5,
+    only: Optional[str] = None,
+    progress: Optional[Callable[[str, Dict[str, float]], None]] = None,
+) -> Dict[str, Any]:
+    """Seed each size and run every benchmark case against the current DB."""
+    from app.db.session import SessionLocal, get_engine
+
+    from benchmarks.cases import CASES
+    from benchmarks.datasets import clear_dataset, seed_dataset
+
+    sizes = list(sizes)
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        db = SessionLocal()
+        try:
+            clear_dataset(db)
+            info = seed_dataset(db, size)
+            for case in CASES:
+                name = f"{case.name}[{size}]"
+                if only and only not in name:
+                    continue
+                func = case.prepare(db, size, info)
+                stats = measure(func, repeat=repeat)
+                results[name] = stats
+                if progress:
+                    progress(name, stats)
+                db.expunge_all()
+        finally:
+            db.rollback()
+            clear_dataset(db)
+            db.close()
+
+    return {
+        "meta": {
+            "kind": "micro",
+            "metric": "median_ms",
+            "dialect": get_engine().dialect.name,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "benchmarks": results,
+    }
+
+
+def save_results(path: Path, results: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def baseline_path(dialect: str, kind: str = "micro") -> Path:
+    """``baselines/<dialect>.json`` (micro) or ``baselines/<kind>-<dialect>.json``."""
+    if kind == "micro":
+        return BASELINE_DIR / f"{dialect}.json"
+    return BASELINE_DIR / f"{kind}-{dialect}.json"
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+    metric: Optional[str] = None,
+) -> List[Comparison]:
+    """Compare one timing metric of two result sets.
+
+    ``metric`` defaults to the results' ``meta.metric`` (``median_ms`` for
+    micro-benchmarks, ``p95_ms`` for load tests). A benchmark regresses when
+    it is more than ``threshold`` (a fraction) slower than the baseline *and*
+    the absolute difference exceeds ``min_delta_ms``. Benchmarks present in
+    only one set are reported but never fail the comparison.
+    """
+    metric = metric or current.get("meta", {}).get("metric", "median_ms")
+    base = baseline.get("benchmarks", {})
+    cur = current.get("benchmarks", {})
+    comparisons = []
+    for name in sorted(set(base) | set(cur)):
+        base_ms = base.get(name, {}).get(metric)
+        cur_ms = cur.get(name, {}).get(metric)
+        regressed = (
+            base_ms is not None
+            and cur_ms is not None
+            and cur_ms - base_ms > min_delta_ms
+            and cur_ms > base_ms * (1 + threshold)
+        )
+        comparisons.append(Comparison(name, base_ms, cur_ms, regressed))
+    return comparisons
@@ -0,0 +1,447 @@
+"""
+End-to-end HTTP load test against a locally booted app.
+
+The app runs in its own process (gunicorn with the production config, or the
+werkzeug dev server) against a seeded scratch database, with JotForm and
+Google Calendar answered by ``benchmarks.fakes``. Virtual users pick routes
+from a weighted mix and the latencies are summarised per route.
+"""
+
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+LOAD_USER_EMAIL = "bench-load@example.com"
+
+# (route, latency_ms, ok)
+Sample = Tuple[str, float, bool]
+
+
+@dataclass
+class Route:
+    name: str
+    path: str
+    weight: float
+
+
+def previous_month(today=None) -> Tuple[int, int]:
+    from app.core.config import APP_TZ
+
+    today = today or datetime.now(APP_TZ).date()
+    last = today.replace(day=1) - timedelta(days=1)
+    return last.month, last.year
+
+
+def seed_load_dataset(db, size: int, seed: int = 42) -> Dict[str, Any]:
+    """Seed the micro-benchmark dataset plus what the pages need to render.
+
+    Adds an admin user with a (fake) Google Calendar token and a stored extrato
+    for the previous month, and returns a bearer token for that user.
+    """
+    from app.config.oauth_provider import PROVIDER_GOOGLE_CALENDAR
+    from app.core.config import APP_TZ
+    from app.core.security import create_access_token
+    from app.db.base import Extrato, OAuth, User
+    from app.services.extrato_core import calculate_totals, query_data, serialize_data
+
+    from benchmarks.datasets import seed_dataset
+
+    info = seed_dataset(db, size, seed=seed)
+
+    user = User(name="Usuário de Carga", email=LOAD_USER_EMAIL, role="admin")
+    db.add(user)
+    db.flush()
+    db.add(
+        OAuth(
+            provider=PROVIDER_GOOGLE_CALENDAR,
+            provider_user_id="bench-load",
+            user_id=user.id,
+            token={
+                "access_token": "bench-access-token",
+                "refresh_token": "bench-refresh-token",
+                "expires_at": (
+                    datetime.now(timezone.utc) + timedelta(days=1)
+                ).isoformat(),
+            },
+        )
+    )
+
+    # Archive the current month's rows as last month's extrato
+    now = datetime.now(APP_TZ)
+    pagamentos, sessoes, comissoes, gastos = serialize_data(
+        *query_data(db, now.month, now.year)
+    )
+    totais = calculate_totals(pagamentos, sessoes, comissoes, gastos)
+    mes, ano = previous_month(now.date())
+    db.add(
+        Extrato(
+            mes=mes,
+            ano=ano,
+            pagamentos=json.dumps(pagamentos),
+            sessoes=json.dumps(sessoes),
+            comissoes=json.dumps(comissoes),
+            gastos=json.dumps(gastos),
+            totais=json.dumps(totais),
+        )
+    )
+    db.commit()
+
+    info.update(
+        token=create_access_token({"user_id": user.id, "email": user.email}),
+        extrato_mes=mes,
+        extrato_ano=ano,
+    )
+    return info
+
+
+def default_routes(info: Dict[str, Any]) -> List[Route]:
+    """The default weighted mix: page renders dominate, APIs follow."""
+    return [
+        Route("historico", "/historico/", 3),
+        Route("financeiro", "/financeiro/", 3),
+        Route("search", f"/search?q={info['search_term']}", 2),
+        Route(
+            "extrato_api",
+            f"/extrato/api?mes={info['extrato_mes']}&ano={info['extrato_ano']}",
+            2,
+        ),
+        Route("calendar_events", "/calendar/api/events", 1),
+    ]
+
+
+def apply_mix(routes: List[Route], spec: Optional[str]) -> List[Route]:
+    """Override weights with ``name=weight`` pairs; weight 0 drops a route.
+
+    Raises:
+        ValueError: If the spec names an unknown route or is malformed.
+    """
+    if not spec:
+        return routes
+    weights = {}
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid mix entry '{part}', expected name=weight")
+        weights[name.strip()] = float(value)
+    known = {r.name for r in routes}
+    unknown = set(weights) - known
+    if unknown:
+        raise ValueError(f"Unknown routes in mix: {', '.join(sorted(unknown))}")
+    mixed = [Route(r.name, r.path, weights.get(r.name, r.weight)) for r in routes]
+    return [r for r in mixed if r.weight > 0]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def gunicorn_available() -> bool:
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def server_env(database_url: str, extra: Dict[str, str]) -> Dict[str, str]:
+    env = dict(os.environ)
+    for name in ("TESTING", "PYTEST_CURRENT_TEST"):
+        env.pop(name, None)
+    env.update(
+        {
+            "DATABASE_URL": database_url,
+            "FLASK_ENV": "development",
+            "RATE_LIMIT_ENABLED": "0",
+            "LOG_LEVEL": "WARNING",
+            "SQL_ECHO": "0",
+            "LOG_TO_FILE": "0",
+            "ALERT_SLOW_QUERY_ENABLED": "false",
+            "ALERT_QUERY_BUDGET_ENABLED": "false",
+        }
+    )
+    env.update(extra)
+    return env
+
+
+class AppServer:
+    """The app under test, running in a child process."""
+
+    def __init__(
+        self,
+        database_url: str,
+        env: Dict[str, str],
+        server: str = "gunicorn",
+        workers: int = 4,
+        threads: int = 1,
+    ):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.server = server
+        self.log_path = Path(tempfile.gettempdir()) / "tattoo_load_server.log"
+        self._env = server_env(database_url, env)
+        if server == "gunicorn":
+            self._env["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(
+                prefix="load_prom_"
+            )
+            self._command = [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "app:app",
+                "--config",
+                "gunicorn.conf.py",
+                "--bind",
+                f"127.0.0.1:{self.port}",
+                "--workers",
+                str(workers),
+                "--threads",
+                str(threads),
+            ]
+        else:
+            self._command = [
+                sys.executable,
+                "-m",
+                "benchmarks",
+                "serve",
+                "--port",
+                str(self.port),
+            ]
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = 120.0) -> "AppServer":
+        import requests
+
+        with self.log_path.open("w") as log:
+            self._process = subprocess.Popen(
+                self._command,
+                cwd=BACKEND_ROOT,
+                env=self._env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(
+                    f"App server exited with {self._process.returncode}; "
+                    f"see {self.log_path}"
+                )
+            try:
+                if requests.get(f"{self.url}/api/health", timeout=2).ok:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise RuntimeError(f"App server did not become ready; see {self.log_path}")
+
+    def stop(self) -> None:
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        multiproc_dir = self._env.get("PROMETHEUS_MULTIPROC_DIR")
+        if self.server == "gunicorn" and multiproc_dir:
+            shutil.rmtree(multiproc_dir, ignore_errors=True)
+
+    def __enter__(self) -> "AppServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _virtual_user(
+    base_url: str,
+    routes: Sequence[Route],
+    token: str,
+    warmup_until: float,
+    stop_at: float,
+    seed: int,
+    samples: List[Sample],
+) -> None:
+    import requests
+
+    rng = random.Random(seed)
+    weights = [r.weight for r in routes]
+    session = requests.Session()
+    session.trust_env = False  # never route local traffic through a proxy
+    session.headers["Authorization"] = f"Bearer {token}"
+    local: List[Sample] = []
+    while True:
+        route = rng.choices(routes, weights)[0]
+        started = time.monotonic()
+        if started >= stop_at:
+            break
+        try:
+            response = session.get(base_url + route.path, timeout=60)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        finished = time.monotonic()
+        if started >= warmup_until:
+            local.append((route.name, (finished - started) * 1000, ok))
+    session.close()
+    samples.extend(local)
+
+
+def _run_users(
+    base_url: str,
+    routes: Sequence[Route],
+    token: str,
+    users: int,
+    warmup_until: float,
+    stop_at: float,
+    seed: int,
+) -> List[Sample]:
+    samples: List[Sample] = []
+    threads = [
+        threading.Thread(
+            target=_virtual_user,
+            args=(base_url, routes, token, warmup_until, stop_at, seed + i, samples),
+        )
+        for i in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def _run_users_in_process(args) -> List[Sample]:
+    base_url, routes, token, users, warmup_s, duration_s, seed = args
+    # monotonic clocks are per process: rebuild the window locally
+    start = time.monotonic()
+    routes = [Route(**r) for r in routes]
+    return _run_users(
+        base_url,
+        routes,
+        token,
+        users,
+        start + warmup_s,
+        start + warmup_s + duration_s,
+        seed,
+    )
+
+
+def run_load(
+    base_url: str,
+    routes: Sequence[Route],
+    token: str,
+    users: int = 8,
+    processes: int = 1,
+    duration_s: float = 30.0,
+    warmup_s: float = 5.0,
+    seed: int = 42,
+) -> List[Sample]:
+    """Drive ``users`` virtual users (split across ``processes``)."""
+    if processes <= 1:
+        start = time.monotonic()
+        return _run_users(
+            base_url,
+            routes,
+            token,
+            users,
+            start + warmup_s,
+            start + warmup_s + duration_s,
+            seed,
+        )
+
+    per_process = [
+        users // processes + (i < users % processes) for i in range(processes)
+    ]
+    jobs = [
+        (
+            base_url,
+            [asdict(r) for r in routes],
+            token,
+            count,
+            warmup_s,
+            duration_s,
+            seed + 1000 * i,
+        )
+        for i, count in enumerate(per_process)
+        if count
+    ]
+    samples: List[Sample] = []
+    with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+        for result in pool.map(_run_users_in_process, jobs):
+            samples.extend(result)
+    return samples
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: Sequence[Sample], duration_s: float) -> Dict[str, Dict]:
+    """Per-route (and ``all``) throughput, error count and latency percentiles."""
+    grouped: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        grouped.setdefault(sample[0], []).append(sample)
+    grouped["all"] = list(samples)
+
+    summary = {}
+    for name, group in sorted(grouped.items()):
+        latencies = sorted(s[1] for s in group)
+        summary[name] = {
+            "requests": len(group),
+            "errors": sum(1 for s in group if not s[2]),
+            "rps": round(len(group) / duration_s, 2) if duration_s else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+    return summary
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_results(summary: Dict[str, Dict], meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a summary in the shared results format (see harness.compare)."""
+    return {
+        "meta": {
+            "kind": "load",
+            "metric": "p95_ms",
+            "git_revision": git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **meta,
+        },
+        "benchmarks": summary,
+    }
@@ -0,0 +1,47 @@
+"""Gunicorn configuration for the production container.
+
+Enables Prometheus multiprocess mode so /metrics aggregates every worker:
+PROMETHEUS_MULTIPROC_DIR must be set before the app (and prometheus_client)
+is imported, and is wiped on master start so stale samples from a previous
+run are not reported.
+
+Background job workers and the scheduler leader election are started here,
+in each worker once the app is loaded, rather than by ``create_app``:
+management commands and scripts build the app too and must neither claim jobs
+they could abandon nor join the election when they exit.
+"""
+
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+timeout = 120
+
+
+def on_starting(server):
+    multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_flask_exporter.multiprocess import (
+        GunicornInternalPrometheusMetrics,
+    )
+
+    GunicornInternalPrometheusMetrics.mark_process_dead_on_child_exit(worker.pid)
+
+
+def post_worker_init(worker):
+    from app.core.job_queue import start_job_workers
+
+    app = worker.wsgi
+    start_job_workers(app)
+    scheduler = app.config.get("SCHEDULER")
+    if scheduler is not None:
+        from app.core.scheduler_leader import start_scheduler_leader
+
+        start_scheduler_leader(app, scheduler)